@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+import asyncio
+import concurrent.futures
+import re
+import threading
+import time
+
+_EQUALS_PARAM = re.compile(r"(\w+)\s*=\s*%s")
+
+def to_batch_sql(lookup_sql):
+    # "WHERE id = %s" -> "WHERE id = ANY(%s)"; tek parametreli nokta sorgulari icin
+    matches = _EQUALS_PARAM.findall(lookup_sql)
+    if len(matches) != 1 or lookup_sql.count('%s') != 1:
+        raise ValueError(f"Toplu sorguya cevrilemiyor (tek '<kolon> = %s' bekleniyor): {lookup_sql}")
+    return _EQUALS_PARAM.sub(r"\1 = ANY(%s)", lookup_sql), matches[0]
+
+def new_batch_stats():
+    return {'requests': 0, 'batches': 0, 'rows': 0, 'max_batch': 0, 'query_time': 0.0, 'errors': 0}
+
+def summarize_batch_stats(stats):
+    return dict(stats, mean_batch=stats['requests'] / stats['batches'] if stats['batches'] else 0.0)
+
+class ThreadedBatchLoader:
+    def __init__(self, connections, lookup_sql, max_batch_size=100, max_wait=0.002, max_in_flight=4):
+        self.connections = connections
+        self.batch_sql, self.key_column = to_batch_sql(lookup_sql)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.pending = []
+        self.first_pending_at = None
+        self.condition = threading.Condition()
+        self.stats = new_batch_stats()
+        self.stats_lock = threading.Lock()
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_in_flight)
+        self.closed = False
+        self.dispatcher = threading.Thread(target=self.dispatch_loop, name='batch-dispatcher', daemon=True)
+        self.dispatcher.start()
+
+    def load(self, key):
+        return self.load_async(key).result()
+
+    def load_async(self, key):
+        future = concurrent.futures.Future()
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("Batch loader kapatildi")
+            if not self.pending:
+                self.first_pending_at = time.perf_counter()
+            self.pending.append((key, future))
+            if len(self.pending) == 1 or len(self.pending) >= self.max_batch_size:
+                self.condition.notify()
+        return future
+
+    def dispatch_loop(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending and self.closed:
+                    return
+                # Ilk istekten itibaren en fazla max_wait beklenir ya da batch dolunca hemen gonderilir
+                while len(self.pending) < self.max_batch_size and not self.closed:
+                    remaining = self.first_pending_at + self.max_wait - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                batch = self.pending[:self.max_batch_size]
+                self.pending = self.pending[self.max_batch_size:]
+                self.first_pending_at = time.perf_counter() if self.pending else None
+            self.executor.submit(self.execute_batch, batch)
+
+    def execute_batch(self, batch):
+        keys = list({key for key, _ in batch})
+        try:
+            with self.connections.connection() as conn:
+                cur = conn.cursor()
+                start_time = time.perf_counter()
+                cur.execute(self.batch_sql, (keys,))
+                rows = cur.fetchall()
+                query_time = time.perf_counter() - start_time
+                key_index = [column.name for column in cur.description].index(self.key_column)
+                cur.close()
+                conn.rollback()
+        except Exception as e:
+            with self.stats_lock:
+                self.stats['errors'] += 1
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        # ANY sorgusu anahtar basina tek satir dondurur; gelmeyen anahtarlar None olur
+        by_key = {row[key_index]: row for row in rows}
+        for key, future in batch:
+            future.set_result(by_key.get(key))
+        with self.stats_lock:
+            self.stats['requests'] += len(batch)
+            self.stats['batches'] += 1
+            self.stats['rows'] += len(rows)
+            self.stats['max_batch'] = max(self.stats['max_batch'], len(batch))
+            self.stats['query_time'] += query_time
+
+    def batch_stats(self):
+        with self.stats_lock:
+            return summarize_batch_stats(dict(self.stats))
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.dispatcher.join()
+        self.executor.shutdown(wait=True)
+
+class AsyncBatchLoader:
+    def __init__(self, pool, lookup_sql, max_batch_size=100, max_wait=0.002):
+        batch_sql, self.key_column = to_batch_sql(lookup_sql)
+        # asyncpg sorgulari statement cache ile hazirlanmis (prepared) olarak calistirir
+        self.batch_sql = batch_sql.replace('%s', '$1')
+        self.pool = pool
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.pending = []
+        self.timer = None
+        self.tasks = set()
+        self.stats = new_batch_stats()
+
+    async def load(self, key):
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((key, future))
+        if len(self.pending) >= self.max_batch_size:
+            self.flush()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.max_wait, self.flush)
+        return await future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        while self.pending:
+            batch = self.pending[:self.max_batch_size]
+            self.pending = self.pending[self.max_batch_size:]
+            task = asyncio.ensure_future(self.execute_batch(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def execute_batch(self, batch):
+        keys = list({key for key, _ in batch})
+        try:
+            async with self.pool.acquire() as conn:
+                start_time = time.perf_counter()
+                rows = await conn.fetch(self.batch_sql, keys)
+                query_time = time.perf_counter() - start_time
+        except Exception as e:
+            self.stats['errors'] += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        by_key = {row[self.key_column]: row for row in rows}
+        for key, future in batch:
+            if not future.done():
+                future.set_result(by_key.get(key))
+        self.stats['requests'] += len(batch)
+        self.stats['batches'] += 1
+        self.stats['rows'] += len(rows)
+        self.stats['max_batch'] = max(self.stats['max_batch'], len(batch))
+        self.stats['query_time'] += query_time
+
+    def batch_stats(self):
+        return summarize_batch_stats(dict(self.stats))
+
+    async def close(self):
+        self.flush()
+        if self.tasks:
+            await asyncio.gather(*self.tasks)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+import random
+import statistics
+
+def bootstrap_ci(samples, statistic=statistics.median, confidence=0.95, resamples=2000, seed=None):
+    if len(samples) < 2:
+        value = statistic(samples) if samples else 0.0
+        return value, value
+    rng = random.Random(seed)
+    n = len(samples)
+    estimates = sorted(statistic(rng.choices(samples, k=n)) for _ in range(resamples))
+    alpha = (1 - confidence) / 2
+    low = estimates[int(alpha * (resamples - 1))]
+    high = estimates[int((1 - alpha) * (resamples - 1))]
+    return low, high
+
+def summarize(samples, confidence=0.95, resamples=2000, seed=None):
+    if not samples:
+        return {'n': 0}
+    ci_low, ci_high = bootstrap_ci(samples, confidence=confidence, resamples=resamples, seed=seed)
+    return {
+        'n': len(samples),
+        'mean': statistics.mean(samples),
+        'median': statistics.median(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'min': min(samples),
+        'max': max(samples),
+        'confidence': confidence,
+        'median_ci_low': ci_low,
+        'median_ci_high': ci_high
+    }
+
+def compare_samples(baseline, candidate, confidence=0.95, resamples=2000, seed=None):
+    # Medyan farkinin bootstrap guven araligi sifiri iceriyorsa fark anlamli sayilmaz
+    rng = random.Random(seed)
+    if len(baseline) < 2 or len(candidate) < 2:
+        return {'significant': False, 'reason': 'yetersiz ornek'}
+    differences = sorted(
+        statistics.median(rng.choices(candidate, k=len(candidate))) -
+        statistics.median(rng.choices(baseline, k=len(baseline)))
+        for _ in range(resamples)
+    )
+    alpha = (1 - confidence) / 2
+    low = differences[int(alpha * (resamples - 1))]
+    high = differences[int((1 - alpha) * (resamples - 1))]
+    baseline_median = statistics.median(baseline)
+    candidate_median = statistics.median(candidate)
+    return {
+        'baseline_median': baseline_median,
+        'candidate_median': candidate_median,
+        'difference': candidate_median - baseline_median,
+        'ratio': candidate_median / baseline_median if baseline_median > 0 else 0.0,
+        'difference_ci_low': low,
+        'difference_ci_high': high,
+        'confidence': confidence,
+        'significant': low > 0 or high < 0
+    }
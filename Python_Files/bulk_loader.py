@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+import io
+
+TABLE_NAME = 'kullanicilar'
+COLUMNS = ('name', 'surname', 'eposta', 'dogum_tarihi')
+
+INSERT_SQL = f"INSERT INTO {TABLE_NAME} ({', '.join(COLUMNS)}) VALUES (%s, %s, %s, %s)"
+COPY_SQL = f"COPY {TABLE_NAME} ({', '.join(COLUMNS)}) FROM STDIN"
+
+_COPY_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    '\t': '\\t',
+    '\n': '\\n',
+    '\r': '\\r'
+})
+
+def copy_field(value):
+    if value is None:
+        return '\\N'
+    return str(value).translate(_COPY_ESCAPES)
+
+def rows_to_copy_buffer(rows):
+    buffer = io.StringIO()
+    buffer.writelines(
+        '\t'.join(copy_field(value) for value in row) + '\n'
+        for row in rows
+    )
+    buffer.seek(0)
+    return buffer
+
+def insert_rows(cur, rows):
+    cur.executemany(INSERT_SQL, rows)
+
+def copy_rows(cur, rows):
+    cur.copy_expert(COPY_SQL, rows_to_copy_buffer(rows))
+
+LOAD_MODES = {
+    'insert': insert_rows,
+    'copy': copy_rows
+}
+
+def get_loader(load_mode):
+    try:
+        return LOAD_MODES[load_mode]
+    except KeyError:
+        raise ValueError(f"Bilinmeyen yukleme modu: {load_mode} (secenekler: {', '.join(LOAD_MODES)})")
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+import argparse
+import itertools
+import json
+import math
+import subprocess
+import time
+from datetime import datetime
+import psycopg2
+from psycopg2 import sql
+from pg_config import fetch_settings
+from performance_tester import PerformanceTester
+from results_store import DEFAULT_STORE_PATH, optional_store
+from workload_catalog import WorkloadCatalog, server_connection_kwargs, results_filename
+
+def parse_grid(items):
+    grid = {}
+    for item in items or []:
+        name, _, values = item.partition('=')
+        if not name or not values:
+            raise ValueError(f"Gecersiz grid tanimi: {item} (ornek: work_mem=4MB,64MB)")
+        grid[name.strip()] = [value.strip() for value in values.split(',') if value.strip()]
+    return grid
+
+def geometric_mean(values):
+    values = [value for value in values if value > 0]
+    if not values:
+        return 0.0
+    return math.exp(sum(math.log(value) for value in values) / len(values))
+
+def run_restart_command(command):
+    def restart():
+        subprocess.run(command, shell=True, check=True)
+    return restart
+
+class ConfigSweep:
+    def __init__(self, catalog, server, grid, restart=None, connection_mode='pool',
+                 warmup=None, repetitions=None, seed=None):
+        self.catalog = catalog
+        self.server = server
+        self.server_name = server['name']
+        self.connection_params = server_connection_kwargs(server)
+        self.grid = grid
+        self.restart = restart
+        self.connection_mode = connection_mode
+        self.warmup = warmup if warmup is not None else catalog.sweep['warmup']
+        self.repetitions = repetitions if repetitions is not None else catalog.sweep['repetitions']
+        self.seed = seed
+        self.contexts = {}
+        self.points = []
+
+    def admin_connection(self, timeout=60.0):
+        deadline = time.perf_counter() + timeout
+        while True:
+            try:
+                conn = psycopg2.connect(**self.connection_params)
+                conn.autocommit = True
+                return conn
+            except psycopg2.OperationalError:
+                if time.perf_counter() > deadline:
+                    raise
+                time.sleep(0.5)
+
+    def load_contexts(self):
+        conn = self.admin_connection()
+        cur = conn.cursor()
+        cur.execute("SELECT name, context FROM pg_settings WHERE name = ANY(%s)", (list(self.grid),))
+        self.contexts = dict(cur.fetchall())
+        cur.close()
+        conn.close()
+        unknown = [name for name in self.grid if name not in self.contexts]
+        if unknown:
+            raise ValueError(f"Bilinmeyen ayar(lar): {', '.join(unknown)}")
+
+    def grid_points(self):
+        # Yeniden baslatma gerektiren ayarlar en dis dongude tutulur ki restart sayisi az olsun
+        names = sorted(self.grid, key=lambda name: self.contexts.get(name) != 'postmaster')
+        for values in itertools.product(*(self.grid[name] for name in names)):
+            yield dict(zip(names, values))
+
+    def apply_settings(self, point, previous=None):
+        changed = [name for name in point if previous is None or previous.get(name) != point[name]]
+        conn = self.admin_connection()
+        cur = conn.cursor()
+        for name in changed:
+            cur.execute(sql.SQL("ALTER SYSTEM SET {} = {}").format(sql.Identifier(name), sql.Literal(point[name])))
+        cur.execute("SELECT pg_reload_conf()")
+        cur.close()
+        conn.close()
+
+        needs_restart = [name for name in changed if self.contexts[name] == 'postmaster']
+        if needs_restart:
+            if self.restart is None:
+                raise RuntimeError(f"{', '.join(needs_restart)} icin yeniden baslatma gerekli (--restart-cmd verilmedi)")
+            print(f"  Yeniden baslatiliyor ({', '.join(needs_restart)})...")
+            self.restart()
+        else:
+            time.sleep(0.5)
+
+        conn = self.admin_connection()
+        cur = conn.cursor()
+        cur.execute("SELECT name FROM pg_settings WHERE name = ANY(%s) AND pending_restart", (list(point),))
+        pending = [row[0] for row in cur.fetchall()]
+        cur.close()
+        applied = fetch_settings(conn, list(point))
+        conn.close()
+        if pending:
+            raise RuntimeError(f"Ayarlar henuz etkin degil (pending_restart): {', '.join(pending)}")
+        return applied
+
+    def reset_settings(self):
+        try:
+            conn = self.admin_connection()
+            cur = conn.cursor()
+            for name in self.grid:
+                cur.execute(sql.SQL("ALTER SYSTEM RESET {}").format(sql.Identifier(name)))
+            cur.execute("SELECT pg_reload_conf()")
+            cur.close()
+            conn.close()
+            if self.restart and any(self.contexts.get(name) == 'postmaster' for name in self.grid):
+                self.restart()
+            print("ALTER SYSTEM ayarlari sifirlandi")
+        except Exception as e:
+            print(f"HATA - {self.server_name} - ayarlar sifirlanamadi: {e}")
+
+    def benchmark_point(self):
+        tester = PerformanceTester(
+            server_name=self.server_name,
+            connection_mode=self.connection_mode,
+            queries=self.catalog.benchmark_queries(self.seed),
+            **self.connection_params
+        )
+        tester.run_benchmark_suite(warmup=self.warmup, repetitions=self.repetitions)
+        tester.connections.close_all()
+        return tester.results
+
+    def run(self, store=None):
+        self.load_contexts()
+        points = list(self.grid_points())
+        print(f"\n=== {self.server_name} Konfigurasyon Taramasi ({len(points)} nokta) ===")
+        previous = None
+        try:
+            for index, point in enumerate(points, 1):
+                label = ', '.join(f"{name}={value}" for name, value in point.items())
+                print(f"\n[{index}/{len(points)}] {label}")
+                record = {'settings': point, 'timestamp': datetime.now().isoformat()}
+                try:
+                    record['applied'] = self.apply_settings(point, previous)
+                    previous = point
+                    results = self.benchmark_point()
+                    record['queries'] = {result['query']: result['execution_time'] for result in results}
+                    record['samples'] = {result['query']: result['samples'] for result in results}
+                    # Hata veren ya da zaman asimina ugrayan sorgu skoru dusurmemeli; bu nokta skorlanmaz
+                    missing = [query.description for query in self.catalog.queries
+                               if query.description not in record['queries']]
+                    if missing:
+                        record['error'] = f"Basarisiz sorgu(lar): {', '.join(missing)}"
+                        print(f"HATA - {self.server_name} - {label}: {record['error']}")
+                    else:
+                        if store is not None:
+                            # Ayarlar hala uygulanmisken kaydedilir; config hash bu noktanin ayarlarini yansitir
+                            record['run_id'] = store.record_run('sweep', self.server_name, results, self.connection_params,
+                                                                workload=self.catalog.name, connection_mode=self.connection_mode)
+                        record['score'] = geometric_mean(list(record['queries'].values()))
+                        print(f"  Skor (medyanlarin geometrik ortalamasi): {record['score'] * 1000:.3f} ms")
+                except Exception as e:
+                    previous = None
+                    record['error'] = str(e)
+                    print(f"HATA - {self.server_name} - {label}: {e}")
+                self.points.append(record)
+        finally:
+            self.reset_settings()
+        return self.points
+
+    def marginal_effects(self):
+        effects = {}
+        scored = [point for point in self.points if point.get('score')]
+        for name, values in self.grid.items():
+            by_value = {}
+            for value in values:
+                scores = [point['score'] for point in scored if point['settings'][name] == value]
+                if scores:
+                    by_value[value] = sum(scores) / len(scores)
+            if by_value:
+                effects[name] = {
+                    'mean_score_by_value': by_value,
+                    'best_value': min(by_value, key=by_value.get),
+                    'spread': max(by_value.values()) - min(by_value.values())
+                }
+        return dict(sorted(effects.items(), key=lambda item: item[1]['spread'], reverse=True))
+
+    def report(self):
+        scored = [point for point in self.points if point.get('score')]
+        if not scored:
+            print("Basarili tarama noktasi yok")
+            return {'points': self.points}
+        names = list(self.grid)
+        queries = [query.description for query in self.catalog.queries]
+
+        print(f"\n=== {self.server_name} Yanit Yuzeyi ===")
+        header = " | ".join(f"{name[:18]:>18}" for name in names)
+        print(f"{header} | {'Skor (ms)':>10} | " + " | ".join(f"{query[:14]:>14}" for query in queries))
+        print("-" * (21 * len(names) + 13 + 17 * len(queries)))
+        for point in sorted(scored, key=lambda point: point['score']):
+            values = " | ".join(f"{point['settings'][name]:>18}" for name in names)
+            timings = " | ".join(f"{point['queries'].get(query, 0) * 1000:>14.3f}" for query in queries)
+            print(f"{values} | {point['score'] * 1000:>10.3f} | {timings}")
+
+        best = min(scored, key=lambda point: point['score'])
+        worst = max(scored, key=lambda point: point['score'])
+        print(f"\nEn iyi nokta: {best['settings']} ({best['score'] * 1000:.3f} ms, "
+              f"en kotuye gore {worst['score'] / best['score']:.2f}x)")
+
+        effects = self.marginal_effects()
+        print("\nMarjinal etkiler (deger basina ortalama skor, ms):")
+        for name, effect in effects.items():
+            values = ", ".join(f"{value}={score * 1000:.3f}" for value, score in effect['mean_score_by_value'].items())
+            print(f"  {name:<32} fark {effect['spread'] * 1000:>8.3f} | {values} | en iyi: {effect['best_value']}")
+
+        return {
+            'catalog': self.catalog.name,
+            'server': self.server_name,
+            'grid': self.grid,
+            'warmup': self.warmup,
+            'repetitions': self.repetitions,
+            'points': self.points,
+            'best': best,
+            'marginal_effects': effects
+        }
+
+    def save_results(self, report):
+        filename = results_filename(f'config_sweep_{self.catalog.name}', self.server_name)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Tarama sonuclari kaydedildi: {filename}")
+        return filename
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="PostgreSQL konfigurasyon taramasi (ALTER SYSTEM + benchmark)")
+    parser.add_argument('--catalog', default=None, help="Is yuku katalog dosyasi (JSON/TOML/YAML)")
+    parser.add_argument('--server', default=None, help="Sunucu adi (varsayilan: katalogdaki ilk sunucu)")
+    parser.add_argument('--grid', action='append', default=None,
+                        help="Ayar ve degerleri, ornek: --grid shared_buffers=128MB,2GB (katalogdaki sweep.grid yerine)")
+    parser.add_argument('--restart-cmd', default=None,
+                        help="postmaster seviyesindeki ayarlar icin yeniden baslatma komutu, ornek: 'pg_ctl -D /data restart -w'")
+    parser.add_argument('--connection-mode', choices=['pool', 'per_call'], default='pool')
+    parser.add_argument('--warmup', type=int, default=None)
+    parser.add_argument('--repetitions', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help="Kosularin eklendigi SQLite sonuc gecmisi")
+    parser.add_argument('--no-store', action='store_true', help="Sonuclari gecmise ekleme")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    catalog = WorkloadCatalog.load(args.catalog)
+    server = catalog.server(args.server) if args.server else catalog.servers[0]
+    grid = parse_grid(args.grid) if args.grid else catalog.sweep['grid']
+    if not grid:
+        print("HATA - tarama grid'i bos (katalogda sweep.grid veya --grid gerekli)")
+        return
+
+    sweep = ConfigSweep(
+        catalog, server, grid,
+        restart=run_restart_command(args.restart_cmd) if args.restart_cmd else None,
+        connection_mode=args.connection_mode,
+        warmup=args.warmup,
+        repetitions=args.repetitions,
+        seed=args.seed
+    )
+    with optional_store(args.store, not args.no_store) as store:
+        sweep.run(store)
+    sweep.save_results(sweep.report())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+import psycopg2
+import psycopg2.extensions
+import threading
+import time
+from contextlib import contextmanager
+
+CONNECTION_MODES = ('pool', 'per_call')
+
+class ConnectionManager:
+    def __init__(self, connection_params, mode='pool', max_size=10, health_check_interval=30.0):
+        if mode not in CONNECTION_MODES:
+            raise ValueError(f"Bilinmeyen baglanti modu: {mode} (secenekler: {', '.join(CONNECTION_MODES)})")
+        self.connection_params = connection_params
+        self.mode = mode
+        self.max_size = max_size
+        self.health_check_interval = health_check_interval
+        self.slots = threading.BoundedSemaphore(max_size)
+        self.idle = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.counters = {
+            'connects': 0,
+            'connect_time': 0.0,
+            'checkouts': 0,
+            'reused': 0,
+            'wait_time': 0.0,
+            'health_check_failures': 0
+        }
+
+    def _count(self, key, value=1):
+        with self.lock:
+            self.counters[key] += value
+
+    def _connect(self):
+        start_time = time.perf_counter()
+        conn = psycopg2.connect(**self.connection_params)
+        self._count('connects')
+        self._count('connect_time', time.perf_counter() - start_time)
+        return conn
+
+    def _is_healthy(self, conn, last_used):
+        # Her checkout'ta yalnizca istemci tarafi durum kontrol edilir (ag trafigi yok); sunucu tarafinda
+        # kopmus ama istemcinin henuz fark etmedigi baglanti ancak health_check_interval sonrasi ping ile yakalanir
+        if conn.closed or conn.status != psycopg2.extensions.STATUS_READY:
+            return False
+        if conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.fetchone()
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _take_idle(self):
+        while True:
+            with self.lock:
+                if not self.idle:
+                    return None
+                conn, last_used = self.idle.pop()
+            if self._is_healthy(conn, last_used):
+                return conn
+            self._count('health_check_failures')
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def acquire(self):
+        start_time = time.perf_counter()
+        self.slots.acquire()
+        acquired_time = time.perf_counter()
+        try:
+            conn = self._take_idle() if self.mode == 'pool' else None
+            if conn is None:
+                conn = self._connect()
+            else:
+                self._count('reused')
+        except Exception:
+            self.slots.release()
+            raise
+        self._count('checkouts')
+        self._count('wait_time', acquired_time - start_time)
+        self.local.setup_time = time.perf_counter() - start_time
+        return conn
+
+    def release(self, conn, discard=False):
+        try:
+            if self.mode == 'per_call' or discard or conn.closed:
+                conn.close()
+                return
+            if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            with self.lock:
+                self.idle.append((conn, time.monotonic()))
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        finally:
+            self.slots.release()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        except psycopg2.OperationalError:
+            self.release(conn, discard=True)
+            raise
+        except Exception:
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    @property
+    def last_setup_time(self):
+        return getattr(self.local, 'setup_time', 0.0)
+
+    def stats(self):
+        with self.lock:
+            snapshot = dict(self.counters)
+            snapshot['idle'] = len(self.idle)
+        snapshot['mode'] = self.mode
+        snapshot['max_size'] = self.max_size
+        return snapshot
+
+    def stats_since(self, before):
+        after = self.stats()
+        return {
+            'mode': self.mode,
+            'connects': after['connects'] - before['connects'],
+            'connect_time': after['connect_time'] - before['connect_time'],
+            'checkouts': after['checkouts'] - before['checkouts'],
+            'reused': after['reused'] - before['reused'],
+            'wait_time': after['wait_time'] - before['wait_time'],
+            'health_check_failures': after['health_check_failures'] - before['health_check_failures']
+        }
+
+    def close_all(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for conn, _ in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
@@ -1,57 +1,62 @@
 #!/usr/bin/env python3
-import psycopg2
-from faker import Faker
+import argparse
 import threading
+import concurrent.futures
+import queue
+import os
 import time
-import sys
-
-fake = Faker('tr_TR')
+from bulk_loader import get_loader
+from row_generator import create_row_generator
+from connection_pool import ConnectionManager
+from workload_catalog import WorkloadCatalog
 
 class DataGenerator:
-    def __init__(self, host, database, user, password, server_name):
+    def __init__(self, host, database, user, password, server_name, load_mode='insert',
+                 row_mode='faker', seed=None, connection_mode='pool', pool_size=8, port=5432):
         self.connection_params = {
             'host': host,
+            'port': port,
             'database': database,
             'user': user,
             'password': password
         }
         self.server_name = server_name
+        self.connection_mode = connection_mode
+        self.connections = ConnectionManager(self.connection_params, mode=connection_mode, max_size=pool_size)
+        self.load_mode = load_mode
+        self.load_rows = get_loader(load_mode)
+        self.row_mode = row_mode
+        self.seed = seed
+        self.row_generator = create_row_generator(row_mode, seed=seed)
+        self.loaded_rows = 0
+        self.counter_lock = threading.Lock()
     
     def test_connection(self):
         try:
-            conn = psycopg2.connect(**self.connection_params)
-            cur = conn.cursor()
-            cur.execute("SELECT 1")
-            cur.close()
-            conn.close()
+            with self.connections.connection() as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT 1")
+                cur.close()
             print(f"{self.server_name} bağlantısı başarılı")
             return True
         except Exception as e:
             print(f"{self.server_name} bağlantı hatası: {e}")
             return False
     
+    def write_batch(self, conn, batch_size, batch_number):
+        cur = conn.cursor()
+        data = self.row_generator.generate_rows(batch_size, batch_number)
+        self.load_rows(cur, data)
+        conn.commit()
+        cur.close()
+    
     def generate_batch(self, batch_size, batch_number):
         try:
-            conn = psycopg2.connect(**self.connection_params)
-            cur = conn.cursor()
+            with self.connections.connection() as conn:
+                self.write_batch(conn, batch_size, batch_number)
             
-            data = []
-            for i in range(batch_size):
-                name = fake.first_name()
-                surname = fake.last_name()
-                eposta = f"{name.lower()}.{surname.lower()}.{batch_number}.{i}@{fake.domain_name()}"
-                dogum_tarihi = fake.date_between(start_date='-80y', end_date='-18y')
-                
-                data.append((name, surname, eposta, dogum_tarihi))
-            
-            cur.executemany(
-                "INSERT INTO kullanicilar (name, surname, eposta, dogum_tarihi) VALUES (%s, %s, %s, %s)",
-                data
-            )
-            
-            conn.commit()
-            cur.close()
-            conn.close()
+            with self.counter_lock:
+                self.loaded_rows += batch_size
             
             print(f"{self.server_name} - Batch {batch_number}: {batch_size} kayıt eklendi")
             return True
@@ -62,10 +67,12 @@ class DataGenerator:
     
     def generate_data_threaded(self, total_records=1000000, batch_size=5000, num_threads=4):
         print(f"\n{self.server_name} - {total_records:,} kayıt üretimi başlatılıyor...")
-        print(f"Batch boyutu: {batch_size}, Thread sayısı: {num_threads}")
+        print(f"Batch boyutu: {batch_size}, Thread sayısı: {num_threads}, Yükleme modu: {self.load_mode}, Üretim modu: {self.row_mode}")
         
+        self.loaded_rows = 0
         batches_per_thread = (total_records // batch_size) // num_threads
         threads = []
+        stats_before = self.connections.stats()
         start_time = time.time()
         
         for thread_id in range(num_threads):
@@ -80,54 +87,273 @@ class DataGenerator:
             thread.join()
         
         end_time = time.time()
-        print(f"{self.server_name} - Tamamlandı! Süre: {end_time - start_time:.2f} saniye")
+        elapsed = end_time - start_time
+        rows_per_sec = self.loaded_rows / elapsed if elapsed > 0 else 0
+        print(f"{self.server_name} - Tamamlandı! Süre: {elapsed:.2f} saniye")
+        print(f"{self.server_name} - {self.load_mode} modu: {self.loaded_rows:,} kayıt, {rows_per_sec:,.0f} kayıt/sn")
+        self.print_connection_stats(stats_before)
         
         self.check_record_count()
+        return rows_per_sec
     
     def generate_batches_for_thread(self, thread_id, num_batches, batch_size):
         for batch_num in range(num_batches):
             batch_number = (thread_id * num_batches) + batch_num
             self.generate_batch(batch_size, batch_number)
     
+    def generate_data_pipelined(self, total_records=1000000, batch_size=5000, num_producers=2,
+                                num_writers=4, queue_depth=8, report_interval=2.0):
+        total_batches = total_records // batch_size
+        base_seed = self.seed if self.seed is not None else int.from_bytes(os.urandom(4), 'little')
+        
+        print(f"\n{self.server_name} - {total_records:,} kayıt üretimi başlatılıyor (pipeline)...")
+        print(f"Batch boyutu: {batch_size}, Üretici: {num_producers}, Yazıcı: {num_writers}, "
+              f"Kuyruk derinliği: {queue_depth}, Yükleme modu: {self.load_mode}, Üretim modu: {self.row_mode}")
+        
+        batch_queue = queue.Queue(maxsize=queue_depth)
+        stop_event = threading.Event()
+        counters = {'produced_batches': 0, 'written_batches': 0, 'failed_batches': 0,
+                    'written_rows': 0, 'max_queue': 0}
+        self.loaded_rows = 0
+        
+        def producer(producer_id):
+            row_generator = create_row_generator(self.row_mode, seed=base_seed + producer_id)
+            for batch_number in range(producer_id, total_batches, num_producers):
+                data = row_generator.generate_rows(batch_size, batch_number)
+                batch_queue.put((batch_number, data))
+                with self.counter_lock:
+                    counters['produced_batches'] += 1
+                    counters['max_queue'] = max(counters['max_queue'], batch_queue.qsize())
+        
+        def writer(writer_id):
+            try:
+                with self.connections.connection() as conn:
+                    while True:
+                        item = batch_queue.get()
+                        if item is None:
+                            break
+                        batch_number, data = item
+                        try:
+                            cur = conn.cursor()
+                            self.load_rows(cur, data)
+                            conn.commit()
+                            cur.close()
+                            with self.counter_lock:
+                                counters['written_batches'] += 1
+                                counters['written_rows'] += len(data)
+                        except Exception as e:
+                            conn.rollback()
+                            with self.counter_lock:
+                                counters['failed_batches'] += 1
+                            print(f"HATA - {self.server_name} Yazıcı {writer_id} Batch {batch_number}: {e}")
+            except Exception as e:
+                print(f"HATA - {self.server_name} Yazıcı {writer_id}: {e}")
+                # Baglantisi kopan yazici kuyrugu bosaltmaya devam eder ki ureticiler kilitlenmesin
+                while batch_queue.get() is not None:
+                    with self.counter_lock:
+                        counters['failed_batches'] += 1
+        
+        def monitor():
+            last_rows = 0
+            last_time = time.time()
+            while not stop_event.wait(report_interval):
+                now = time.time()
+                with self.counter_lock:
+                    written_rows = counters['written_rows']
+                    produced = counters['produced_batches']
+                interval_rate = (written_rows - last_rows) / (now - last_time)
+                average_rate = written_rows / (now - start_time)
+                print(f"{self.server_name} - Kuyruk: {batch_queue.qsize()}/{queue_depth} | "
+                      f"Üretilen batch: {produced}/{total_batches} | Yazılan: {written_rows:,} kayıt | "
+                      f"Anlık: {interval_rate:,.0f} kayıt/sn | Ortalama: {average_rate:,.0f} kayıt/sn")
+                last_rows = written_rows
+                last_time = now
+        
+        stats_before = self.connections.stats()
+        start_time = time.time()
+        producers = [threading.Thread(target=producer, args=(i,)) for i in range(num_producers)]
+        writers = [threading.Thread(target=writer, args=(i,)) for i in range(num_writers)]
+        monitor_thread = threading.Thread(target=monitor, daemon=True)
+        
+        for thread in producers + writers:
+            thread.start()
+        monitor_thread.start()
+        
+        for thread in producers:
+            thread.join()
+        for _ in writers:
+            batch_queue.put(None)
+        for thread in writers:
+            thread.join()
+        
+        stop_event.set()
+        monitor_thread.join()
+        
+        elapsed = time.time() - start_time
+        self.loaded_rows = counters['written_rows']
+        rows_per_sec = self.loaded_rows / elapsed if elapsed > 0 else 0
+        print(f"{self.server_name} - Tamamlandı! Süre: {elapsed:.2f} saniye")
+        print(f"{self.server_name} - {self.load_mode} modu: {self.loaded_rows:,} kayıt, {rows_per_sec:,.0f} kayıt/sn "
+              f"(hatalı batch: {counters['failed_batches']}, en yüksek kuyruk: {counters['max_queue']}/{queue_depth})")
+        self.print_connection_stats(stats_before)
+        
+        self.check_record_count()
+        return rows_per_sec
+    
+    def worker_config(self):
+        return {
+            'host': self.connection_params['host'],
+            'port': self.connection_params['port'],
+            'database': self.connection_params['database'],
+            'user': self.connection_params['user'],
+            'password': self.connection_params['password'],
+            'server_name': self.server_name,
+            'load_mode': self.load_mode,
+            'row_mode': self.row_mode,
+            'connection_mode': self.connection_mode
+        }
+    
+    def generate_data_multiprocess(self, total_records=1000000, batch_size=5000, num_workers=None):
+        # Son batch eksik olabilir; batch_size'dan az kayit icin de en az bir shard olusur
+        total_batches = -(-total_records // batch_size)
+        num_workers = max(1, min(num_workers or os.cpu_count(), total_batches))
+        base_seed = self.seed if self.seed is not None else int.from_bytes(os.urandom(4), 'little')
+        
+        print(f"\n{self.server_name} - {total_records:,} kayıt üretimi başlatılıyor (multiprocessing)...")
+        print(f"Batch boyutu: {batch_size}, Process sayısı: {num_workers}, Yükleme modu: {self.load_mode}, Üretim modu: {self.row_mode}")
+        
+        shards = []
+        for worker_id in range(num_workers):
+            first_batch = total_batches * worker_id // num_workers
+            last_batch = total_batches * (worker_id + 1) // num_workers
+            if last_batch > first_batch:
+                shards.append((worker_id, first_batch, last_batch))
+        
+        start_time = time.time()
+        worker_stats = []
+        
+        with concurrent.futures.ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            futures = [
+                executor.submit(generate_shard, self.worker_config(), worker_id,
+                                first_batch, last_batch, batch_size, base_seed + worker_id, total_records)
+                for worker_id, first_batch, last_batch in shards
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    worker_stats.append(future.result())
+                except Exception as exc:
+                    print(f"HATA - {self.server_name} worker: {exc}")
+        
+        elapsed = time.time() - start_time
+        self.loaded_rows = sum(stats['rows'] for stats in worker_stats)
+        rows_per_sec = self.loaded_rows / elapsed if elapsed > 0 else 0
+        
+        print(f"\n{self.server_name} - Worker Sonuçları:")
+        print("Worker | Batch aralığı   | Kayıt      | Süre (s) | Kayıt/sn")
+        print("-" * 60)
+        for stats in sorted(worker_stats, key=lambda s: s['worker_id']):
+            batch_range = f"{stats['first_batch']}-{stats['last_batch'] - 1}"
+            print(f"{stats['worker_id']:>6} | {batch_range:<15} | {stats['rows']:>10,} | "
+                  f"{stats['elapsed']:>8.2f} | {stats['rows_per_sec']:>10,.0f}")
+        
+        print(f"{self.server_name} - Tamamlandı! Süre: {elapsed:.2f} saniye")
+        print(f"{self.server_name} - {self.load_mode} modu: {self.loaded_rows:,} kayıt, {rows_per_sec:,.0f} kayıt/sn")
+        
+        self.check_record_count()
+        return worker_stats
+    
+    def print_connection_stats(self, stats_before):
+        stats = self.connections.stats_since(stats_before)
+        print(f"{self.server_name} - Bağlantı ({stats['mode']}): {stats['connects']} yeni bağlantı, "
+              f"kurulum {stats['connect_time']:.2f}s, {stats['reused']}/{stats['checkouts']} yeniden kullanım, "
+              f"bekleme {stats['wait_time']:.2f}s")
+    
     def check_record_count(self):
         try:
-            conn = psycopg2.connect(**self.connection_params)
-            cur = conn.cursor()
-            cur.execute("SELECT COUNT(*) FROM kullanicilar")
-            count = cur.fetchone()[0]
-            cur.close()
-            conn.close()
+            with self.connections.connection() as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT COUNT(*) FROM kullanicilar")
+                count = cur.fetchone()[0]
+                cur.close()
             print(f"{self.server_name} - Toplam kayıt sayısı: {count:,}")
         except Exception as e:
             print(f"Kayıt sayısı kontrolü hatası: {e}")
 
+def generate_shard(config, worker_id, first_batch, last_batch, batch_size, seed, total_records):
+    generator = DataGenerator(seed=seed, pool_size=1, **config)
+    failed_batches = 0
+    start_time = time.time()
+    
+    with generator.connections.connection() as conn:
+        for batch_number in range(first_batch, last_batch):
+            rows = min(batch_size, total_records - batch_number * batch_size)
+            try:
+                generator.write_batch(conn, rows, batch_number)
+                generator.loaded_rows += rows
+            except Exception as e:
+                conn.rollback()
+                failed_batches += 1
+                print(f"HATA - {generator.server_name} Worker {worker_id} Batch {batch_number}: {e}")
+    generator.connections.close_all()
+    
+    elapsed = time.time() - start_time
+    return {
+        'worker_id': worker_id,
+        'pid': os.getpid(),
+        'first_batch': first_batch,
+        'last_batch': last_batch,
+        'rows': generator.loaded_rows,
+        'failed_batches': failed_batches,
+        'elapsed': elapsed,
+        'rows_per_sec': generator.loaded_rows / elapsed if elapsed > 0 else 0
+    }
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="PostgreSQL veri uretici")
+    parser.add_argument('load_mode', nargs='?', default='insert')
+    parser.add_argument('row_mode', nargs='?', default='faker')
+    parser.add_argument('execution_mode', nargs='?', choices=['thread', 'pipeline', 'process'], default='thread')
+    parser.add_argument('connection_mode', nargs='?', choices=['pool', 'per_call'], default='pool')
+    parser.add_argument('--catalog', default=None, help="Is yuku katalog dosyasi (JSON/TOML/YAML)")
+    parser.add_argument('--server', nargs='+', default=['Server_A'], help="Veri yuklenecek katalog sunucu adlari")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     print("PostgreSQL Veri Üretici")
     print("=" * 50)
     
-    servers = [
-        {
-            'host': 'localhost', 
-            'name': 'Server A (Optimum)'
-        }
-
-    ]
+    load_mode = args.load_mode
+    row_mode = args.row_mode
+    execution_mode = args.execution_mode
+    connection_mode = args.connection_mode
+    
+    catalog = WorkloadCatalog.load(args.catalog)
+    try:
+        servers = [catalog.server(name) for name in args.server]
+    except KeyError as e:
+        print(f"HATA - {e}")
+        return
     
     generators = []
     
     for server in servers:
         generator = DataGenerator(
             host=server['host'],
-            database='testdb',
-            user='pgtest',
-            password='pgtest123',
-            server_name=server['name']
+            port=server['port'],
+            database=server['database'],
+            user=server['user'],
+            password=server['password'],
+            server_name=server.get('label', server['name']),
+            load_mode=load_mode,
+            row_mode=row_mode,
+            connection_mode=connection_mode
         )
         
         if generator.test_connection():
             generators.append(generator)
         else:
-            print(f"{server['name']} atlanıyor...")
+            print(f"{server.get('label', server['name'])} atlanıyor...")
     
     if not generators:
         print("Hiçbir sunucuya bağlanılamadı!")
@@ -139,11 +365,25 @@ def main():
     
     for generator in generators:
         print(f"\n{'='*60}")
-        generator.generate_data_threaded(
-            total_records=record_count,
-            batch_size=5000,
-            num_threads=4
-        )
+        if execution_mode == 'pipeline':
+            generator.generate_data_pipelined(
+                total_records=record_count,
+                batch_size=5000,
+                num_producers=2,
+                num_writers=4,
+                queue_depth=8
+            )
+        elif execution_mode == 'process':
+            generator.generate_data_multiprocess(
+                total_records=record_count,
+                batch_size=5000
+            )
+        else:
+            generator.generate_data_threaded(
+                total_records=record_count,
+                batch_size=5000,
+                num_threads=4
+            )
     
     print(f"\nTÜM SUNUCULARA VERİ ÜRETİMİ TAMAMLANDI!")
     print("=" * 60)
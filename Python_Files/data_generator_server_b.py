@@ -1,78 +1,96 @@
 #!/usr/bin/env python3
-import psycopg2
-from faker import Faker
+import argparse
 import threading
 import time
+from bulk_loader import get_loader
+from row_generator import create_row_generator
+from connection_pool import ConnectionManager
+from workload_catalog import WorkloadCatalog, server_connection_kwargs
 
-fake = Faker('tr_TR')
-
-def generate_data_to_server_b():
-    server_b_ip = "10.0.2.15"
-    
-    connection_params = {
-        'host': server_b_ip,
-        'database': 'testdb',
-        'user': 'pgtest',
-        'password': 'pgtest123'
-    }
-    
-    print("Server B'ye veri yükleme başlıyor...")
+def load_server_b(connections, server_name, load_rows, row_generator, load_mode, row_mode, connection_mode):
+    print(f"{server_name}'ye veri yükleme başlıyor... (Yükleme modu: {load_mode}, Üretim modu: {row_mode})")
     
     try:
-        conn = psycopg2.connect(**connection_params)
-        cur = conn.cursor()
-        cur.execute("SELECT 1")
-        cur.close()
-        conn.close()
-        print("Server B bağlantısı başarılı")
+        with connections.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+        print(f"{server_name} bağlantısı başarılı")
     except Exception as e:
-        print(f"Server B bağlantı hatası: {e}")
+        print(f"{server_name} bağlantı hatası: {e}")
         return
     
 
     start_time = time.time()
+    loaded_rows = 0
     
     for batch in range(10000):
         try:
-            conn = psycopg2.connect(**connection_params)
-            cur = conn.cursor()
-            
-            data = []
-            for i in range(1000):
-                name = fake.first_name()
-                surname = fake.last_name()
-                eposta = f"{name.lower()}.{surname.lower()}.{batch}.{i}@{fake.domain_name()}"
-                dogum_tarihi = fake.date_between(start_date='-80y', end_date='-18y')
-                data.append((name, surname, eposta, dogum_tarihi))
-            
-            cur.executemany(
-                "INSERT INTO kullanicilar (name, surname, eposta, dogum_tarihi) VALUES (%s, %s, %s, %s)",
-                data
-            )
-            
-            conn.commit()
-            cur.close()
-            conn.close()
+            with connections.connection() as conn:
+                cur = conn.cursor()
+                
+                data = row_generator.generate_rows(1000, batch)
+                
+                load_rows(cur, data)
+                
+                conn.commit()
+                cur.close()
+            loaded_rows += len(data)
             
             if batch % 500 == 0:
-                print(f"Server B - Batch {batch}/10000 tamamlandı ({batch * 1000:,} kayıt)")
+                print(f"{server_name} - Batch {batch}/10000 tamamlandı ({batch * 1000:,} kayıt)")
                 
         except Exception as e:
             print(f"Hata batch {batch}: {e}")
     
     end_time = time.time()
-    print(f"Server B veri yükleme tamamlandı! Süre: {end_time - start_time:.2f} saniye")
+    elapsed = end_time - start_time
+    rows_per_sec = loaded_rows / elapsed if elapsed > 0 else 0
+    print(f"{server_name} veri yükleme tamamlandı! Süre: {elapsed:.2f} saniye")
+    print(f"{server_name} - {load_mode} modu: {loaded_rows:,} kayıt, {rows_per_sec:,.0f} kayıt/sn")
+    stats = connections.stats()
+    print(f"{server_name} - Bağlantı ({connection_mode}): {stats['connects']} yeni bağlantı, "
+          f"kurulum {stats['connect_time']:.2f}s, {stats['reused']}/{stats['checkouts']} yeniden kullanım")
     
     try:
-        conn = psycopg2.connect(**connection_params)
-        cur = conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM kullanicilar")
-        count = cur.fetchone()[0]
-        cur.close()
-        conn.close()
-        print(f"Server B toplam kayıt: {count:,}")
+        with connections.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT COUNT(*) FROM kullanicilar")
+            count = cur.fetchone()[0]
+            cur.close()
+        print(f"{server_name} toplam kayıt: {count:,}")
     except Exception as e:
         print(f"Kayıt kontrolü hatası: {e}")
 
+def generate_data_to_server_b(load_mode='insert', row_mode='faker', connection_mode='pool', server=None):
+    server = server or WorkloadCatalog.load().server('Server_B')
+    server_name = server.get('label', server['name'])
+    load_rows = get_loader(load_mode)
+    row_generator = create_row_generator(row_mode)
+    connection_params = server_connection_kwargs(server)
+    connections = ConnectionManager(connection_params, mode=connection_mode, max_size=1)
+    try:
+        load_server_b(connections, server_name, load_rows, row_generator, load_mode, row_mode, connection_mode)
+    finally:
+        connections.close_all()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Tek sunucuya veri yukleme")
+    parser.add_argument('load_mode', nargs='?', default='insert')
+    parser.add_argument('row_mode', nargs='?', default='faker')
+    parser.add_argument('connection_mode', nargs='?', choices=['pool', 'per_call'], default='pool')
+    parser.add_argument('--catalog', default=None, help="Is yuku katalog dosyasi (JSON/TOML/YAML)")
+    parser.add_argument('--server', default='Server_B', help="Veri yuklenecek katalog sunucu adi")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    try:
+        server = WorkloadCatalog.load(args.catalog).server(args.server)
+    except KeyError as e:
+        print(f"HATA - {e}")
+        return
+    generate_data_to_server_b(args.load_mode, args.row_mode, args.connection_mode, server)
+
 if __name__ == "__main__":
-    generate_data_to_server_b()
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+import math
+import numpy as np
+
+ID_DISTRIBUTIONS = ('uniform', 'zipf', 'hotspot')
+
+class IdSampler:
+    def __init__(self, distribution='uniform', max_id=10000000, seed=None,
+                 zipf_s=1.1, hot_fraction=0.01, hot_probability=0.9):
+        if distribution not in ID_DISTRIBUTIONS:
+            raise ValueError(f"Bilinmeyen ID dagilimi: {distribution} (secenekler: {', '.join(ID_DISTRIBUTIONS)})")
+        self.distribution = distribution
+        self.max_id = max_id
+        self.zipf_s = zipf_s
+        self.hot_fraction = hot_fraction
+        self.hot_probability = hot_probability
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence)
+        self.scatter = self._scatter_multiplier(max_id)
+
+    @staticmethod
+    def _scatter_multiplier(max_id):
+        # Populer siralamalari tabloya dagitmak icin max_id ile aralarinda asal bir carpan
+        multiplier = 2654435761 % max_id or 1
+        while math.gcd(multiplier, max_id) != 1:
+            multiplier += 1
+        return multiplier
+
+    def spawn(self, count):
+        return [
+            IdSampler(self.distribution, self.max_id, child, self.zipf_s,
+                      self.hot_fraction, self.hot_probability)
+            for child in self.seed_sequence.spawn(count)
+        ]
+
+    def _zipf_ranks(self, n):
+        # Sinirli (1..max_id) Zipf dagilimi icin ters CDF yaklasimi
+        u = self.rng.random(n)
+        s = self.zipf_s
+        if abs(s - 1.0) < 1e-9:
+            ranks = np.exp(u * math.log(self.max_id))
+        else:
+            ranks = ((self.max_id ** (1 - s) - 1) * u + 1) ** (1 / (1 - s))
+        return np.clip(ranks.astype(np.int64), 1, self.max_id)
+
+    def sample(self, n):
+        if self.distribution == 'uniform':
+            return self.rng.integers(1, self.max_id + 1, n)
+        if self.distribution == 'zipf':
+            ranks = self._zipf_ranks(n)
+            return (ranks - 1) * self.scatter % self.max_id + 1
+        hot_count = max(1, int(self.max_id * self.hot_fraction))
+        hot = self.rng.random(n) < self.hot_probability
+        ids = self.rng.integers(hot_count + 1, self.max_id + 1, n) if hot_count < self.max_id \
+            else self.rng.integers(1, self.max_id + 1, n)
+        ids[hot] = self.rng.integers(1, hot_count + 1, int(hot.sum()))
+        return ids
+
+    def describe(self):
+        if self.distribution == 'zipf':
+            return f"zipf(s={self.zipf_s})"
+        if self.distribution == 'hotspot':
+            return f"hotspot(%{self.hot_probability * 100:.0f} istek -> %{self.hot_fraction * 100:g} ID)"
+        return 'uniform'
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime
+import psycopg2
+from psycopg2 import sql
+from benchmark_stats import compare_samples
+from bulk_loader import TABLE_NAME, INSERT_SQL
+from performance_tester import PerformanceTester
+from row_generator import VectorizedRowGenerator
+from workload_catalog import WorkloadCatalog, server_connection_kwargs, results_filename
+
+class IndexAdvisor:
+    def __init__(self, catalog, server, candidates, warmup=None, repetitions=None, write_samples=500,
+                 keep=False, seed=None):
+        self.catalog = catalog
+        self.server_name = server['name']
+        self.connection_params = server_connection_kwargs(server)
+        self.candidates = candidates
+        self.warmup = warmup if warmup is not None else catalog.benchmark['warmup']
+        self.repetitions = repetitions if repetitions is not None else catalog.benchmark['repetitions']
+        self.write_samples = write_samples
+        self.keep = keep
+        self.seed = seed
+        self.rows = VectorizedRowGenerator(seed=seed, pool_size=2000).generate_rows(write_samples, 0)
+        self.baseline = None
+        self.evaluations = []
+
+    def admin_connection(self):
+        # CREATE/DROP INDEX CONCURRENTLY transaction blogu icinde calismaz
+        conn = psycopg2.connect(**self.connection_params)
+        conn.autocommit = True
+        return conn
+
+    def admin_query(self, query, params=None):
+        conn = self.admin_connection()
+        cur = conn.cursor()
+        cur.execute(query, params)
+        rows = cur.fetchall() if cur.description else []
+        cur.close()
+        conn.close()
+        return rows
+
+    def index_exists(self, name):
+        return bool(self.admin_query("SELECT 1 FROM pg_indexes WHERE tablename = %s AND indexname = %s",
+                                     (TABLE_NAME, name)))
+
+    def vacuum(self):
+        # Visibility map guncellenmezse kapsayan indeksler index-only scan'e donusemez
+        self.admin_query(sql.SQL("VACUUM (ANALYZE) {}").format(sql.Identifier(TABLE_NAME)))
+
+    def ensure_extension(self, extension):
+        if not extension:
+            return
+        self.admin_query(sql.SQL("CREATE EXTENSION IF NOT EXISTS {}").format(sql.Identifier(extension)))
+
+    def build_index(self, candidate):
+        statement = sql.SQL("CREATE INDEX CONCURRENTLY {} ON {} {}").format(
+            sql.Identifier(candidate['name']), sql.Identifier(TABLE_NAME), sql.SQL(candidate['definition']))
+        start_time = time.perf_counter()
+        try:
+            self.admin_query(statement)
+        except Exception:
+            # Basarisiz CONCURRENTLY derlemesi INVALID bir indeks birakir; temizlenmezse yazmalari yavaslatir
+            self.drop_index(candidate['name'])
+            raise
+        build_time = time.perf_counter() - start_time
+        size = self.admin_query("SELECT pg_relation_size(%s::regclass)", (candidate['name'],))[0][0]
+        return build_time, size
+
+    def drop_index(self, name):
+        try:
+            self.admin_query(sql.SQL("DROP INDEX CONCURRENTLY IF EXISTS {}").format(sql.Identifier(name)))
+        except Exception as e:
+            print(f"HATA - {self.server_name} - {name} silinemedi: {e}")
+
+    def benchmark(self):
+        tester = PerformanceTester(
+            server_name=self.server_name,
+            queries=self.catalog.benchmark_queries(self.seed),
+            **self.connection_params
+        )
+        tester.run_benchmark_suite(warmup=self.warmup, repetitions=self.repetitions)
+        tester.connections.close_all()
+        return {result['query']: result for result in tester.results}
+
+    def measure_write_cost(self):
+        # Her satir ayri bir transaction'da eklenir; fark indeks bakim maliyetini (yazma amplifikasyonu) gosterir.
+        # Her olcum ayni baslangic durumundan (VACUUM + CHECKPOINT) yapilir ki full-page write'lar karsilastirilabilir olsun
+        self.vacuum()
+        try:
+            self.admin_query("CHECKPOINT")
+        except Exception:
+            pass
+        conn = psycopg2.connect(**self.connection_params)
+        cur = conn.cursor()
+        cur.execute(f"SELECT coalesce(max(id), 0), pg_current_wal_lsn() FROM {TABLE_NAME}")
+        max_id, lsn_before = cur.fetchone()
+        conn.commit()
+        latencies = []
+        for row in self.rows:
+            start_time = time.perf_counter()
+            cur.execute(INSERT_SQL, row)
+            conn.commit()
+            latencies.append(time.perf_counter() - start_time)
+        cur.execute("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), %s)", (lsn_before,))
+        wal_bytes = int(cur.fetchone()[0])
+        cur.execute(f"DELETE FROM {TABLE_NAME} WHERE id > %s", (max_id,))
+        conn.commit()
+        cur.close()
+        conn.close()
+        return {
+            'rows': len(self.rows),
+            'insert_latency': statistics.median(latencies),
+            'wal_bytes_per_row': wal_bytes / len(self.rows)
+        }
+
+    def query_description(self, candidate):
+        return self.catalog.query(candidate['query']).description
+
+    def evaluate(self, candidate):
+        name = candidate['name']
+        print(f"\n--- {name} ({candidate['query']}) ---")
+        if self.index_exists(name):
+            print(f"{name} zaten mevcut, atlandi (temel olcum indeksi iceriyor)")
+            return {'index': name, 'query': candidate['query'], 'skipped': 'zaten mevcut'}
+        try:
+            self.ensure_extension(candidate.get('extension'))
+        except Exception as e:
+            reason = str(e).splitlines()[0]
+            print(f"HATA - {self.server_name} - {candidate.get('extension')} eklentisi yuklenemedi, {name} atlandi: {reason}")
+            return {'index': name, 'query': candidate['query'], 'skipped': f"eklenti yok: {reason}"}
+
+        try:
+            build_time, size = self.build_index(candidate)
+            print(f"Olusturma: {build_time:.2f}s, boyut {size / 1024 / 1024:.1f}MB")
+            self.vacuum()
+            results = self.benchmark()
+            write_cost = self.measure_write_cost()
+        except Exception as e:
+            print(f"HATA - {self.server_name} - {name}: {e}")
+            self.drop_index(name)
+            return {'index': name, 'query': candidate['query'], 'error': str(e)}
+
+        # Her aday temel olcumle ayni kosulda olculsun diye indeks hemen silinir; --keep ile istenenler
+        # tum adaylar olculdukten sonra run() icinde yeniden olusturulur
+        self.drop_index(name)
+
+        description = self.query_description(candidate)
+        baseline = self.baseline['queries'].get(description)
+        current = results.get(description)
+        comparison = compare_samples(baseline['samples'], current['samples']) if baseline and current else {}
+        base_write = self.baseline['write_cost']
+        return {
+            'index': name,
+            'query': candidate['query'],
+            'definition': candidate['definition'],
+            'build_time': build_time,
+            'size_bytes': size,
+            'baseline_median': baseline['execution_time'] if baseline else None,
+            'indexed_median': current['execution_time'] if current else None,
+            'comparison': comparison,
+            'query_medians': {query: result['execution_time'] for query, result in results.items()},
+            'write_cost': write_cost,
+            'insert_overhead': write_cost['insert_latency'] - base_write['insert_latency'],
+            'wal_overhead_per_row': write_cost['wal_bytes_per_row'] - base_write['wal_bytes_per_row'],
+            'kept': self.keep
+        }
+
+    def run(self):
+        print(f"\n=== {self.server_name} Indeks Danismani ({len(self.candidates)} aday) ===")
+        self.vacuum()
+        print("\nTemel olcum (aday indeksler olmadan)")
+        self.baseline = {'queries': self.benchmark(), 'write_cost': self.measure_write_cost()}
+        for candidate in self.candidates:
+            self.evaluations.append(self.evaluate(candidate))
+        if self.keep:
+            self.rebuild_kept()
+        return self.evaluations
+
+    def rebuild_kept(self):
+        for candidate, evaluation in zip(self.candidates, self.evaluations):
+            if 'build_time' not in evaluation:
+                continue
+            try:
+                self.build_index(candidate)
+                print(f"{candidate['name']} korundu (yeniden olusturuldu)")
+            except Exception as e:
+                evaluation['kept'] = False
+                print(f"HATA - {self.server_name} - {candidate['name']} yeniden olusturulamadi: {e}")
+
+    def report(self):
+        print(f"\n=== {self.server_name} Indeks Adaylari ===")
+        print(f"{'Indeks':<32} | {'Sorgu':<20} | Once (ms) | Sonra (ms) | Hizlanma | Anlamli | "
+              f"Olusturma | Boyut (MB) | +Insert (us) | +WAL/satir")
+        print("-" * 160)
+        for evaluation in self.evaluations:
+            if 'build_time' not in evaluation:
+                reason = evaluation.get('skipped') or evaluation.get('error')
+                print(f"{evaluation['index']:<32} | {evaluation['query']:<20} | {reason}")
+                continue
+            comparison = evaluation['comparison']
+            speedup = 1 / comparison['ratio'] if comparison.get('ratio') else 0.0
+            verdict = "EVET" if comparison.get('significant') else "HAYIR"
+            before = f"{evaluation['baseline_median'] * 1000:>9.2f}" if evaluation['baseline_median'] is not None else f"{'-':>9}"
+            after = f"{evaluation['indexed_median'] * 1000:>10.2f}" if evaluation['indexed_median'] is not None else f"{'-':>10}"
+            print(f"{evaluation['index']:<32} | {evaluation['query']:<20} | {before} | "
+                  f"{after} | {speedup:>7.1f}x | {verdict:<7} | "
+                  f"{evaluation['build_time']:>8.2f}s | {evaluation['size_bytes'] / 1024 / 1024:>10.1f} | "
+                  f"{evaluation['insert_overhead'] * 1e6:>+12.1f} | {evaluation['wal_overhead_per_row']:>+8.0f} B")
+
+        base_write = self.baseline['write_cost']
+        print(f"\nTemel yazma maliyeti: insert+commit medyan {base_write['insert_latency'] * 1e6:.1f}us, "
+              f"{base_write['wal_bytes_per_row']:.0f} B WAL/satir ({base_write['rows']} satir)")
+        return {
+            'catalog': self.catalog.name,
+            'server': self.server_name,
+            'warmup': self.warmup,
+            'repetitions': self.repetitions,
+            'baseline': {
+                'query_medians': {query: result['execution_time'] for query, result in self.baseline['queries'].items()},
+                'write_cost': base_write
+            },
+            'candidates': self.evaluations,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def save_results(self, report):
+        filename = results_filename('index_advisor', self.server_name)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Indeks danismani sonuclari kaydedildi: {filename}")
+        return filename
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Aday indeksleri olusturup benchmark ile degerlendir")
+    parser.add_argument('--catalog', default=None, help="Is yuku katalog dosyasi (JSON/TOML/YAML)")
+    parser.add_argument('--server', default=None, help="Sunucu adi (varsayilan: katalogdaki ilk sunucu)")
+    parser.add_argument('--only', nargs='+', default=None, help="Yalnizca bu adlardaki aday indeksler")
+    parser.add_argument('--warmup', type=int, default=None)
+    parser.add_argument('--repetitions', type=int, default=None)
+    parser.add_argument('--write-samples', type=int, default=500, help="Yazma maliyeti icin eklenecek satir sayisi")
+    parser.add_argument('--keep', action='store_true', help="Olusturulan indeksleri silme")
+    parser.add_argument('--seed', type=int, default=None)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    catalog = WorkloadCatalog.load(args.catalog)
+    server = catalog.server(args.server) if args.server else catalog.servers[0]
+    candidates = [candidate for candidate in catalog.index_candidates
+                  if args.only is None or candidate['name'] in args.only]
+    if not candidates:
+        print("HATA - aday indeks yok (katalogda index_candidates gerekli)")
+        return
+
+    advisor = IndexAdvisor(
+        catalog, server, candidates,
+        warmup=args.warmup,
+        repetitions=args.repetitions,
+        write_samples=args.write_samples,
+        keep=args.keep,
+        seed=args.seed
+    )
+    advisor.run()
+    advisor.save_results(advisor.report())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+import math
+import threading
+from array import array
+
+class LatencyHistogram:
+    # HDR tarzi log-lineer kovalar: degerler mikrosaniye olarak tutulur,
+    # her ikinin kuvveti araliginda sabit sayida alt kova bulunur.
+    def __init__(self, highest_value=3600.0, significant_digits=2):
+        self.highest_value_us = max(2, int(highest_value * 1e6))
+        self.significant_digits = significant_digits
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self.sub_bucket_half = self.sub_bucket_count // 2
+        self.counts = array('Q', bytes(8 * (self._index_of(self.highest_value_us) + 1)))
+        self.total_count = 0
+        self.total_sum_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def _index_of(self, value_us):
+        if value_us < self.sub_bucket_count:
+            return value_us
+        exponent = value_us.bit_length() - self.sub_bucket_bits
+        sub_bucket = value_us >> exponent
+        return self.sub_bucket_count + (exponent - 1) * self.sub_bucket_half + (sub_bucket - self.sub_bucket_half)
+
+    def _highest_equivalent_us(self, index):
+        if index < self.sub_bucket_count:
+            return index
+        offset = index - self.sub_bucket_count
+        exponent = offset // self.sub_bucket_half + 1
+        sub_bucket = offset % self.sub_bucket_half + self.sub_bucket_half
+        return (sub_bucket << exponent) + (1 << exponent) - 1
+
+    def record(self, seconds, count=1):
+        value_us = min(max(0, int(seconds * 1e6)), self.highest_value_us)
+        self.counts[self._index_of(value_us)] += count
+        self.total_count += count
+        self.total_sum_us += value_us * count
+        if self.min_us is None or value_us < self.min_us:
+            self.min_us = value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    @property
+    def count(self):
+        return self.total_count
+
+    @property
+    def mean(self):
+        return self.total_sum_us / self.total_count / 1e6 if self.total_count else 0.0
+
+    @property
+    def min(self):
+        return (self.min_us or 0) / 1e6
+
+    @property
+    def max(self):
+        return self.max_us / 1e6
+
+    def percentile(self, percent):
+        if not self.total_count:
+            return 0.0
+        target = max(1, math.ceil(percent / 100.0 * self.total_count))
+        running = 0
+        for index, bucket_count in enumerate(self.counts):
+            running += bucket_count
+            if running >= target:
+                return min(self._highest_equivalent_us(index), self.max_us) / 1e6
+        return self.max
+
+    def percentiles(self):
+        return {
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'p99_9': self.percentile(99.9),
+            'max': self.max
+        }
+
+    def summary(self):
+        summary = {'count': self.count, 'mean': self.mean, 'min': self.min}
+        summary.update(self.percentiles())
+        return summary
+
+    def merge(self, other):
+        if (other.sub_bucket_bits != self.sub_bucket_bits or
+                other.highest_value_us != self.highest_value_us):
+            raise ValueError("Farkli yapilandirmali histogramlar birlestirilemez")
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                self.counts[index] += bucket_count
+        self.total_count += other.total_count
+        self.total_sum_us += other.total_sum_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        self.max_us = max(self.max_us, other.max_us)
+        return self
+
+    @classmethod
+    def merged(cls, histograms, **kwargs):
+        result = cls(**kwargs)
+        for histogram in histograms:
+            result.merge(histogram)
+        return result
+
+    def to_dict(self):
+        return {
+            'unit': 'us',
+            'highest_value_us': self.highest_value_us,
+            'significant_digits': self.significant_digits,
+            'count': self.total_count,
+            'sum_us': self.total_sum_us,
+            'min_us': self.min_us or 0,
+            'max_us': self.max_us,
+            'buckets': [[index, bucket_count] for index, bucket_count in enumerate(self.counts) if bucket_count]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(highest_value=data['highest_value_us'] / 1e6,
+                        significant_digits=data['significant_digits'])
+        for index, bucket_count in data['buckets']:
+            histogram.counts[index] = bucket_count
+        histogram.total_count = data['count']
+        histogram.total_sum_us = data['sum_us']
+        histogram.min_us = data['min_us'] if data['count'] else None
+        histogram.max_us = data['max_us']
+        return histogram
+
+    def bucket_values(self):
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count:
+                yield min(self._highest_equivalent_us(index), self.max_us) / 1e6, bucket_count
+
+class ThreadLocalHistograms:
+    # Her thread kendi histogramina kilitsiz yazar; sonunda tek seferde birlestirilir.
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.local = threading.local()
+        self.histograms = []
+        self.lock = threading.Lock()
+
+    def get(self):
+        histogram = getattr(self.local, 'histogram', None)
+        if histogram is None:
+            histogram = LatencyHistogram(**self.kwargs)
+            self.local.histogram = histogram
+            with self.lock:
+                self.histograms.append(histogram)
+        return histogram
+
+    def record(self, seconds, count=1):
+        self.get().record(seconds, count)
+
+    def merged(self):
+        with self.lock:
+            return LatencyHistogram.merged(self.histograms, **self.kwargs)
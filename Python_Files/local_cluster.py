@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import pwd
+import shutil
+import socket
+import subprocess
+import tempfile
+import psycopg2
+from pg_config import read_conf
+from workload_catalog import WorkloadCatalog, server_connection_kwargs
+
+# Sunucuya ozgu yollar, soket/SSL ayarlari ve yerel makinede olmayabilecek locale'ler gecici kumeye tasinmaz
+EXCLUDED_SETTINGS = {
+    'data_directory', 'hba_file', 'ident_file', 'external_pid_file', 'port', 'listen_addresses',
+    'unix_socket_directories', 'ssl', 'ssl_cert_file', 'ssl_key_file', 'include_dir', 'include',
+    'include_if_exists', 'cluster_name', 'lc_messages', 'lc_monetary', 'lc_numeric', 'lc_time'
+}
+
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS kullanicilar (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(100),
+        surname VARCHAR(100),
+        eposta VARCHAR(255),
+        dogum_tarihi DATE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+BENCH_CONF = 'bench.conf'
+
+def find_bin_dir(bin_dir=None):
+    if bin_dir:
+        return bin_dir
+    if os.environ.get('PG_BIN'):
+        return os.environ['PG_BIN']
+    pg_ctl = shutil.which('pg_ctl')
+    if pg_ctl:
+        return os.path.dirname(pg_ctl)
+    pg_config = shutil.which('pg_config')
+    if pg_config:
+        return subprocess.run([pg_config, '--bindir'], capture_output=True, text=True, check=True).stdout.strip()
+    raise FileNotFoundError("PostgreSQL binary dizini bulunamadi (PG_BIN veya --bin-dir verin)")
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def quote_setting(value):
+    if value.replace('.', '', 1).isdigit():
+        return value
+    return "'" + value.replace("'", "''") + "'"
+
+def split_cpus(count):
+    cpus = sorted(os.sched_getaffinity(0))
+    if len(cpus) < count:
+        return None
+    size = len(cpus) // count
+    return [cpus[i * size:(i + 1) * size] for i in range(count)]
+
+class LocalCluster:
+    def __init__(self, name, config_file=None, port=None, cpus=None, overrides=None,
+                 bin_dir=None, base_dir=None, run_as=None, database='testdb', user='pgtest', password='pgtest123'):
+        self.name = name
+        self.config_file = config_file
+        self.port = port or free_port()
+        self.cpus = cpus
+        self.overrides = overrides or {}
+        self.bin_dir = find_bin_dir(bin_dir)
+        self.base_dir = base_dir
+        self.run_as = run_as
+        self.database = database
+        self.user = user
+        self.password = password
+        self.data_dir = None
+        self.log_file = None
+        self.running = False
+
+        if self.run_as is None and os.geteuid() == 0:
+            raise RuntimeError("initdb root olarak calistirilamaz; run_as ile yetkisiz bir kullanici verin")
+
+    def command(self, *args, check=True):
+        def pin():
+            if self.cpus:
+                os.sched_setaffinity(0, self.cpus)
+        identity = {}
+        if self.run_as:
+            account = pwd.getpwnam(self.run_as)
+            identity = {'user': account.pw_uid, 'group': account.pw_gid, 'extra_groups': []}
+        return subprocess.run(
+            [os.path.join(self.bin_dir, args[0]), *args[1:]],
+            capture_output=True, text=True, check=check, preexec_fn=pin, **identity
+        )
+
+    def settings(self):
+        settings = {}
+        if self.config_file:
+            settings = {name: value for name, value in read_conf(self.config_file).items()
+                        if name not in EXCLUDED_SETTINGS}
+        settings.update(self.overrides)
+        settings.update({
+            'port': str(self.port),
+            'listen_addresses': 'localhost',
+            'unix_socket_directories': self.data_dir
+        })
+        return settings
+
+    def init(self):
+        self.base_dir = self.base_dir or tempfile.mkdtemp(prefix=f'pg_{self.name.lower()}_')
+        self.data_dir = os.path.join(self.base_dir, 'data')
+        self.log_file = os.path.join(self.base_dir, 'postgres.log')
+        if self.run_as:
+            account = pwd.getpwnam(self.run_as)
+            os.chown(self.base_dir, account.pw_uid, account.pw_gid)
+
+        self.command('initdb', '-D', self.data_dir, '-U', 'postgres', '-A', 'trust', '-E', 'UTF8', '--locale=C')
+
+        with open(os.path.join(self.data_dir, BENCH_CONF), 'w', encoding='utf-8') as f:
+            f.write(f"# {self.config_file or 'varsayilan'} dosyasindan uretildi\n")
+            for name, value in self.settings().items():
+                f.write(f"{name} = {quote_setting(value)}\n")
+        with open(os.path.join(self.data_dir, 'postgresql.conf'), 'a', encoding='utf-8') as f:
+            f.write(f"\ninclude = '{BENCH_CONF}'\n")
+        if self.run_as:
+            account = pwd.getpwnam(self.run_as)
+            os.chown(os.path.join(self.data_dir, BENCH_CONF), account.pw_uid, account.pw_gid)
+        return self
+
+    def start(self):
+        result = self.command('pg_ctl', '-D', self.data_dir, '-l', self.log_file, '-w', '-t', '60', 'start', check=False)
+        if result.returncode != 0:
+            raise RuntimeError(f"{self.name} baslatilamadi: {result.stderr.strip()} (log: {self.log_file})")
+        self.running = True
+        cpus = f", CPU {self.cpus}" if self.cpus else ""
+        print(f"{self.name} yerel kume basladi: port {self.port}{cpus}")
+        return self
+
+    def stop(self):
+        if self.running:
+            self.command('pg_ctl', '-D', self.data_dir, '-w', '-m', 'fast', 'stop', check=False)
+            self.running = False
+
+    def restart(self):
+        self.stop()
+        self.start()
+
+    def destroy(self):
+        self.stop()
+        if self.base_dir and os.path.isdir(self.base_dir):
+            shutil.rmtree(self.base_dir, ignore_errors=True)
+
+    def bootstrap(self):
+        conn = psycopg2.connect(host='localhost', port=self.port, user='postgres', dbname='postgres')
+        conn.autocommit = True
+        cur = conn.cursor()
+        cur.execute("SELECT 1 FROM pg_roles WHERE rolname = %s", (self.user,))
+        if not cur.fetchone():
+            # config_sweep ALTER SYSTEM kullandigi icin test kullanicisi superuser olarak acilir
+            cur.execute(f'CREATE ROLE "{self.user}" LOGIN SUPERUSER PASSWORD %s', (self.password,))
+        cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (self.database,))
+        if not cur.fetchone():
+            cur.execute(f'CREATE DATABASE "{self.database}" OWNER "{self.user}"')
+        cur.close()
+        conn.close()
+
+        conn = psycopg2.connect(**self.connection_params())
+        cur = conn.cursor()
+        cur.execute(SCHEMA_SQL)
+        conn.commit()
+        cur.close()
+        conn.close()
+        return self
+
+    def load_data(self, total_records, batch_size=5000, load_mode='copy', row_mode='vectorized', num_threads=4, seed=None):
+        from data_generator_server_a import DataGenerator
+        generator = DataGenerator(
+            server_name=self.name, load_mode=load_mode, row_mode=row_mode, seed=seed,
+            **server_connection_kwargs(self.server())
+        )
+        generator.generate_data_threaded(total_records, batch_size, num_threads)
+        generator.connections.close_all()
+
+        conn = psycopg2.connect(**self.connection_params())
+        conn.autocommit = True
+        cur = conn.cursor()
+        cur.execute("VACUUM ANALYZE kullanicilar")
+        cur.close()
+        conn.close()
+
+    def connection_params(self):
+        return server_connection_kwargs(self.server())
+
+    def server(self):
+        return {
+            'name': self.name,
+            'label': f"{self.name} (yerel, port {self.port})",
+            'host': 'localhost',
+            'port': self.port,
+            'database': self.database,
+            'user': self.user,
+            'password': self.password,
+            'config_file': self.config_file
+        }
+
+    def __enter__(self):
+        self.init().start().bootstrap()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.destroy()
+        return False
+
+def local_catalog(catalog, clusters):
+    data = dict(catalog.data, servers=[cluster.server() for cluster in clusters])
+    return WorkloadCatalog(data, catalog.path)
+
+def parse_overrides(items):
+    overrides = {}
+    for item in items or []:
+        name, _, value = item.partition('=')
+        if not name or not value:
+            raise ValueError(f"Gecersiz ayar: {item} (ornek: shared_buffers=256MB)")
+        overrides[name.strip()] = value.strip()
+    return overrides
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Gecici yerel PostgreSQL kumeleriyle tekrarlanabilir A/B testleri")
+    parser.add_argument('--catalog', default=None, help="Is yuku katalog dosyasi (JSON/TOML/YAML)")
+    parser.add_argument('--server', action='append', default=None,
+                        help="Kurulacak katalog sunucusu (varsayilan: config_file tanimli tum sunucular)")
+    parser.add_argument('--records', type=int, default=1000000)
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--set', action='append', default=None, dest='overrides',
+                        help="Tum kumelerde conf degerini ez, ornek: --set shared_buffers=256MB")
+    parser.add_argument('--pin', action='store_true', help="Her kumeyi ve istemciyi ayri CPU'lara sabitle")
+    parser.add_argument('--bin-dir', default=None)
+    parser.add_argument('--run-as', default=None, help="root olarak calisirken initdb/pg_ctl icin kullanici")
+    parser.add_argument('--tests', nargs='+', choices=['performance', 'parallel', 'sweep'], default=['performance', 'parallel'])
+    parser.add_argument('--keep', action='store_true', help="Testlerden sonra kumeleri silme")
+    return parser.parse_args()
+
+def run_tests(args, catalog, clusters):
+    from performance_tester import PerformanceTester, compare_benchmarks
+    from parallel_tests import create_tester
+    from config_sweep import ConfigSweep
+
+    testers = []
+    for cluster in clusters:
+        server = cluster.server()
+        if 'performance' in args.tests:
+            tester = PerformanceTester(server_name=cluster.name, queries=catalog.benchmark_queries(),
+                                       **server_connection_kwargs(server))
+            tester.run_benchmark_suite(warmup=catalog.benchmark['warmup'], repetitions=catalog.benchmark['repetitions'])
+            tester.save_results()
+            tester.connections.close_all()
+            testers.append(tester)
+        if 'parallel' in args.tests:
+            tester = create_tester(catalog, server, 'pool')
+            tester.run_all_tests([100000, 200000, 300000, 400000, 500000,
+                                  600000, 700000, 800000, 900000, 150000])
+            tester.save_results()
+        if 'sweep' in args.tests and catalog.sweep['grid']:
+            sweep = ConfigSweep(catalog, server, catalog.sweep['grid'], restart=cluster.restart)
+            sweep.run()
+            sweep.save_results(sweep.report())
+
+    if len(testers) >= 2:
+        baseline, candidate = testers[0], testers[1]
+        print(f"\nIstatistiksel Karsilastirma: {candidate.server_name} vs {baseline.server_name}")
+        compare_benchmarks(candidate.results, baseline.results, name_a=candidate.server_name, name_b=baseline.server_name)
+
+def main():
+    args = parse_args()
+    catalog = WorkloadCatalog.load(args.catalog)
+    if args.server:
+        servers = [catalog.server(name) for name in args.server]
+    else:
+        servers = [server for server in catalog.servers if server.get('config_file')]
+    overrides = parse_overrides(args.overrides)
+
+    cpu_sets = [None] * len(servers)
+    if args.pin:
+        groups = split_cpus(len(servers) + 1)
+        if groups:
+            os.sched_setaffinity(0, groups[-1])
+            cpu_sets = groups[:-1]
+            print(f"Istemci CPU: {groups[-1]}")
+        else:
+            print("Uyari: CPU sayisi sabitleme icin yetersiz, sabitleme yapilmadi")
+
+    print("Yerel PostgreSQL Kumeleri")
+    print("=" * 50)
+    clusters = []
+    try:
+        for server, cpus in zip(servers, cpu_sets):
+            cluster = LocalCluster(
+                server['name'], config_file=server.get('config_file'), cpus=cpus, overrides=overrides,
+                bin_dir=args.bin_dir, run_as=args.run_as,
+                database=server['database'], user=server['user'], password=server['password']
+            )
+            clusters.append(cluster)
+            cluster.init().start().bootstrap()
+            cluster.load_data(args.records, args.batch_size)
+        run_tests(args, local_catalog(catalog, clusters), clusters)
+    except Exception as e:
+        print(f"HATA - yerel kume: {e}")
+    finally:
+        for cluster in clusters:
+            if args.keep:
+                print(f"{cluster.name} korunuyor: {cluster.data_dir} (port {cluster.port})")
+            else:
+                cluster.destroy()
+                print(f"{cluster.name} kaldirildi")
+
+if __name__ == "__main__":
+    main()
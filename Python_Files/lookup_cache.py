@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+import asyncio
+import concurrent.futures
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+def encode_row(row):
+    # Satirlar tek bir bytes nesnesi olarak tutulur: psycopg2 tuple'i ya da asyncpg Record'u
+    # onlarca ayri Python nesnesi yerine tek bir kompakt blok olur ve bellek kullanimi olculebilir
+    return pickle.dumps(None if row is None else tuple(row), protocol=pickle.HIGHEST_PROTOCOL)
+
+def decode_row(data):
+    return pickle.loads(data)
+
+class LookupCache:
+    def __init__(self, capacity=10000, ttl=None):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.async_in_flight = {}
+        self.stats = {'hits': 0, 'misses': 0, 'loads': 0, 'coalesced': 0, 'evictions': 0, 'expirations': 0,
+                      'load_errors': 0}
+
+    def _fresh_data(self, key):
+        # self.lock tutulurken cagrilir
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        data, stored_at = entry
+        if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+            self.entries.move_to_end(key)
+            return data
+        del self.entries[key]
+        self.stats['expirations'] += 1
+        return None
+
+    def get(self, key):
+        with self.lock:
+            data = self._fresh_data(key)
+            if data is not None:
+                self.stats['hits'] += 1
+            else:
+                self.stats['misses'] += 1
+        return (False, None) if data is None else (True, decode_row(data))
+
+    def put(self, key, row):
+        data = encode_row(row)
+        with self.lock:
+            self.entries[key] = (data, time.monotonic())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def get_or_load(self, key, loader):
+        hit, row = self.get(key)
+        if hit:
+            return row
+        # Single-flight: ayni anahtar icin eszamanli kayiplarda yalnizca ilk thread veritabanina gider.
+        # get() ile buradaki kilit arasinda baska bir thread yuklemeyi bitirmis olabilir; girdi tekrar kontrol edilir
+        with self.lock:
+            data = self._fresh_data(key)
+            future = self.in_flight.get(key)
+            owner = data is None and future is None
+            if data is not None:
+                # Gec gelen isabet: yukleme beklenmedi, get()'in saydigi kayip geri alinir
+                self.stats['hits'] += 1
+                self.stats['misses'] -= 1
+            elif future is not None:
+                self.stats['coalesced'] += 1
+            else:
+                future = concurrent.futures.Future()
+                self.in_flight[key] = future
+        if data is not None:
+            return decode_row(data)
+        if not owner:
+            return future.result()
+        try:
+            row = loader(key)
+            self.stats_add('loads')
+            self.put(key, row)
+            future.set_result(row)
+            return row
+        except Exception as e:
+            self.stats_add('load_errors')
+            future.set_exception(e)
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            with self.lock:
+                self.in_flight.pop(key, None)
+
+    async def get_or_load_async(self, key, loader):
+        hit, row = self.get(key)
+        if hit:
+            return row
+        future = self.async_in_flight.get(key)
+        if future is not None:
+            self.stats_add('coalesced')
+            try:
+                # shield: bekleyenin iptali paylasilan future'i (ve diger bekleyenleri) iptal etmesin
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+            # Sahip gorev iptal edildi; yukleme bu gorevle yeniden denenir
+            return await self.get_or_load_async(key, loader)
+        future = asyncio.get_running_loop().create_future()
+        self.async_in_flight[key] = future
+        try:
+            row = await loader(key)
+            self.stats_add('loads')
+            self.put(key, row)
+            future.set_result(row)
+            return row
+        except Exception as e:
+            self.stats_add('load_errors')
+            future.set_exception(e)
+            # Bekleyen yoksa "exception never retrieved" uyarisini engelle
+            future.exception()
+            raise
+        finally:
+            # CancelledError Exception degildir; sahip iptal edilirse bekleyenler sonsuza dek asili kalmasin
+            if not future.done():
+                future.cancel()
+            self.async_in_flight.pop(key, None)
+
+    def stats_add(self, name, value=1):
+        with self.lock:
+            self.stats[name] += value
+
+    def memory_bytes(self):
+        # Yaklasik ayak izi: satir blogu + anahtar + girdi tuple'i + OrderedDict dugumu
+        with self.lock:
+            payload = sum(sys.getsizeof(data) + sys.getsizeof(key) + sys.getsizeof((data, 0.0))
+                          for key, (data, _) in self.entries.items())
+            return payload + sys.getsizeof(self.entries)
+
+    def summary(self):
+        with self.lock:
+            stats = dict(self.stats)
+            entries = len(self.entries)
+        lookups = stats['hits'] + stats['misses']
+        stats.update({
+            'capacity': self.capacity,
+            'ttl': self.ttl,
+            'entries': entries,
+            'hit_ratio': stats['hits'] / lookups if lookups else 0.0,
+            'memory_bytes': self.memory_bytes(),
+            'db_load_removed': 1 - stats['loads'] / lookups if lookups else 0.0
+        })
+        return stats
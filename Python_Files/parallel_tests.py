@@ -1,79 +1,177 @@
 #!/usr/bin/env python3
-import psycopg2
 import asyncpg
 import asyncio
 import threading
 import concurrent.futures
 import time
 import json
+import argparse
+import multiprocessing
+import os
+import numpy as np
+import psycopg2
+from array import array
 from datetime import datetime
+from batch_lookup import ThreadedBatchLoader, AsyncBatchLoader, to_batch_sql, summarize_batch_stats, new_batch_stats
+from connection_pool import ConnectionManager
+from plan_inspector import capture_plan
+from prepared_lookup import PreparedLookup, AsyncPreparedLookup
+from results_store import DEFAULT_STORE_PATH, optional_store
+from id_distributions import IdSampler, ID_DISTRIBUTIONS
+from lookup_cache import LookupCache
+from latency_histogram import LatencyHistogram, ThreadLocalHistograms
+from server_metrics import sample_metrics
+from workload_catalog import WorkloadCatalog, server_connection_kwargs, results_filename, to_asyncpg_sql
+
+ARRIVAL_PROCESSES = ('constant', 'poisson')
+
+DEFAULT_CONCURRENCY_LEVELS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512]
+DEFAULT_LOOKUP_SQL = "SELECT * FROM kullanicilar WHERE id = %s"
+
+# asyncpg: varsayilan ortuk statement cache, cache kapali (her sorguda parse/plan) ve acik conn.prepare
+ASYNC_STATEMENT_MODES = {
+    'implicit': 'Paralel_Asyncio',
+    'no_cache': 'Paralel_Asyncio_Onbelleksiz',
+    'prepared': 'Paralel_Asyncio_Hazir'
+}
+
+# Her worker process'i kendi kalici baglantisini initializer'da acar
+_process_connection = None
+_process_lookup_sql = None
+_process_barrier = None
+
+def init_process_worker(connection_params, lookup_sql, barrier=None):
+    global _process_connection, _process_lookup_sql, _process_barrier
+    _process_connection = psycopg2.connect(**connection_params)
+    _process_lookup_sql = lookup_sql
+    _process_barrier = barrier
+
+def process_worker_ready(timeout):
+    # max_workers gorevin hepsi bariyerde bekler; hicbir process ikinci gorevi alamaz,
+    # bu yuzden bariyer ancak tum process'ler baslayip baglandiginda acilir
+    _process_barrier.wait(timeout)
+    return os.getpid()
+
+def process_query(user_id):
+    try:
+        cur = _process_connection.cursor()
+        start_time = time.perf_counter()
+        cur.execute(_process_lookup_sql, (user_id,))
+        result = cur.fetchone()
+        end_time = time.perf_counter()
+        cur.close()
+        _process_connection.rollback()
+        return end_time - start_time, result is not None, os.getpid()
+    except Exception as e:
+        print(f"Process sorgu hatasi (ID: {user_id}): {e}")
+        return 0, False, os.getpid()
 
 class ParallelTester:
-    def __init__(self, host, server_name):
+    def __init__(self, host, server_name, connection_mode='pool', pool_size=10, port=5432,
+                 database='testdb', user='pgtest', password='pgtest123', lookup_sql=DEFAULT_LOOKUP_SQL):
         self.connection_params = {
             'host': host,
-            'database': 'testdb',
-            'user': 'pgtest',
-            'password': 'pgtest123'
+            'port': port,
+            'database': database,
+            'user': user,
+            'password': password
         }
         self.server_name = server_name
+        self.connections = ConnectionManager(self.connection_params, mode=connection_mode, max_size=pool_size)
+        self.lookup_sql = lookup_sql
+        self.async_lookup_sql = to_asyncpg_sql(lookup_sql)
         self.results = []
+        self.verbose = True
+        self.prepared_lookup = PreparedLookup(lookup_sql)
+    
+    async def create_async_pool(self, min_size, max_size, **kwargs):
+        return await asyncpg.create_pool(
+            host=self.connection_params['host'],
+            port=self.connection_params['port'],
+            database=self.connection_params['database'],
+            user=self.connection_params['user'],
+            password=self.connection_params['password'],
+            min_size=min_size,
+            max_size=max_size,
+            **kwargs
+        )
     
     def single_query(self, user_id):
         try:
-            conn = psycopg2.connect(**self.connection_params)
-            cur = conn.cursor()
-            
-            start_time = time.perf_counter()
-            cur.execute("SELECT * FROM kullanicilar WHERE id = %s", (user_id,))
-            result = cur.fetchone()
-            end_time = time.perf_counter()
-            
-            cur.close()
-            conn.close()
+            with self.connections.connection() as conn:
+                cur = conn.cursor()
+                
+                start_time = time.perf_counter()
+                cur.execute(self.lookup_sql, (user_id,))
+                result = cur.fetchone()
+                end_time = time.perf_counter()
+                
+                cur.close()
             
             return end_time - start_time, result
         except Exception as e:
             print(f"Sorgu hatasi (ID: {user_id}): {e}")
             return 0, None
     
-    def sequential_test(self, user_ids):
-        print(f"\n{self.server_name} - Sirali Test")
+    def prepared_query(self, user_id):
+        try:
+            with self.connections.connection() as conn:
+                return self.prepared_lookup.fetchone(conn, (user_id,))
+        except Exception as e:
+            print(f"Hazir sorgu hatasi (ID: {user_id}): {e}")
+            return 0, None
+    
+    def sequential_test(self, user_ids, prepared=False):
+        print(f"\n{self.server_name} - Sirali Test{' (PREPARE)' if prepared else ''}")
         print("-" * 40)
         
+        query = self.prepared_query if prepared else self.single_query
+        stats_before = self.connections.stats()
         start_time = time.perf_counter()
-        individual_times = []
+        histogram = LatencyHistogram()
         
         for i, user_id in enumerate(user_ids):
-            exec_time, result = self.single_query(user_id)
-            individual_times.append(exec_time)
-            print(f"Sorgu {i+1:2d}/10: {exec_time:.3f}s (ID: {user_id})")
+            exec_time, result = query(user_id)
+            histogram.record(exec_time)
+            if self.verbose:
+                print(f"Sorgu {i+1:2d}/{len(user_ids)}: {exec_time:.3f}s (ID: {user_id})")
         
         total_time = time.perf_counter() - start_time
-        avg_time = sum(individual_times) / len(individual_times)
         
         result_data = {
             'server': self.server_name,
-            'test_type': 'Sirali',
+            'test_type': 'Sirali_Hazir' if prepared else 'Sirali',
             'total_time': total_time,
-            'avg_query_time': avg_time,
+            'avg_query_time': histogram.mean,
             'query_count': len(user_ids),
-            'individual_times': individual_times
+            'connection_stats': self.connections.stats_since(stats_before),
+            'latency': histogram.summary(),
+            'latency_histogram': histogram.to_dict()
         }
         
+        if prepared:
+            result_data['prepare_stats'] = self.prepared_lookup.prepare_stats()
+        
         self.results.append(result_data)
         print(f"Sirali test toplam suresi: {total_time:.3f}s")
         return result_data
     
-    def parallel_threading_test(self, user_ids, max_workers=5):
-        print(f"\n{self.server_name} - Paralel Test (Threading)")
+    def parallel_threading_test(self, user_ids, max_workers=5, prepared=False):
+        print(f"\n{self.server_name} - Paralel Test (Threading{', PREPARE' if prepared else ''})")
         print("-" * 40)
         
+        query = self.prepared_query if prepared else self.single_query
+        stats_before = self.connections.stats()
         start_time = time.perf_counter()
-        individual_times = []
+        thread_histograms = ThreadLocalHistograms()
+        
+        def timed_query(user_id):
+            exec_time, result = query(user_id)
+            thread_histograms.record(exec_time)
+            return exec_time, result
         
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_id = {executor.submit(self.single_query, user_id): user_id for user_id in user_ids}
+            future_to_id = {executor.submit(timed_query, user_id): user_id for user_id in user_ids}
             
             completed = 0
             for future in concurrent.futures.as_completed(future_to_id):
@@ -81,23 +179,27 @@ class ParallelTester:
                 completed += 1
                 try:
                     exec_time, result = future.result()
-                    individual_times.append(exec_time)
-                    print(f"Thread {completed:2d}/10: {exec_time:.3f}s (ID: {user_id})")
+                    if self.verbose:
+                        print(f"Thread {completed:2d}/{len(user_ids)}: {exec_time:.3f}s (ID: {user_id})")
                 except Exception as exc:
                     print(f"Thread hatasi (ID: {user_id}): {exc}")
         
         total_time = time.perf_counter() - start_time
-        avg_time = sum(individual_times) / len(individual_times) if individual_times else 0
+        histogram = thread_histograms.merged()
         
         result_data = {
             'server': self.server_name,
-            'test_type': 'Paralel_Threading',
+            'test_type': 'Paralel_Threading_Hazir' if prepared else 'Paralel_Threading',
             'total_time': total_time,
-            'avg_query_time': avg_time,
+            'avg_query_time': histogram.mean,
             'query_count': len(user_ids),
             'max_workers': max_workers,
-            'individual_times': individual_times
+            'connection_stats': self.connections.stats_since(stats_before),
+            'latency': histogram.summary(),
+            'latency_histogram': histogram.to_dict()
         }
+        if prepared:
+            result_data['prepare_stats'] = self.prepared_lookup.prepare_stats()
         
         self.results.append(result_data)
         print(f"Paralel test toplam suresi: {total_time:.3f}s")
@@ -107,51 +209,78 @@ class ParallelTester:
         try:
             async with pool.acquire() as conn:
                 start_time = time.perf_counter()
-                result = await conn.fetchrow("SELECT * FROM kullanicilar WHERE id = $1", user_id)
+                result = await conn.fetchrow(self.async_lookup_sql, user_id)
                 end_time = time.perf_counter()
                 return end_time - start_time, result
         except Exception as e:
             print(f"Async sorgu hatasi (ID: {user_id}): {e}")
             return 0, None
     
-    async def parallel_asyncio_test(self, user_ids, pool_size=5):
-        print(f"\n{self.server_name} - Paralel Test (Asyncio)")
+    async def parallel_asyncio_test(self, user_ids, pool_size=5, statement_mode='implicit', concurrency=None):
+        test_type = ASYNC_STATEMENT_MODES[statement_mode]
+        print(f"\n{self.server_name} - Paralel Test (Asyncio{'' if statement_mode == 'implicit' else ', ' + statement_mode})")
         print("-" * 40)
         
         try:
-            pool = await asyncpg.create_pool(
-                host=self.connection_params['host'],
-                database=self.connection_params['database'],
-                user=self.connection_params['user'],
-                password=self.connection_params['password'],
-                min_size=1,
-                max_size=pool_size
-            )
-            
-            start_time = time.perf_counter()
-            
-            tasks = [self.async_query(pool, user_id) for user_id in user_ids]
-            results = await asyncio.gather(*tasks)
-            
-            total_time = time.perf_counter() - start_time
+            # statement_cache_size=0 iken asyncpg conn.prepare() isimsiz ifade kullanir; bu yuzden yalnizca no_cache'te kapatilir
+            pool_options = {'statement_cache_size': 0} if statement_mode == 'no_cache' else {}
+            pool = await self.create_async_pool(min_size=1, max_size=pool_size, **pool_options)
+            prepared_lookup = AsyncPreparedLookup(self.lookup_sql) if statement_mode == 'prepared' else None
+            if concurrency is not None or prepared_lookup is not None:
+                # Worker modeli: her worker bir baglantiyi test boyunca tutar ve ID'leri ortak kuyruktan ceker.
+                # asyncpg PreparedStatement'i baglantiya bagli oldugu icin acik hazir ifade bu modeli gerektirir.
+                results = [(0, None)] * len(user_ids)
+                pending = iter(enumerate(user_ids))
+                workers = min(pool_size, concurrency or pool_size, len(user_ids))
+                connections = [await pool.acquire() for _ in range(workers)]
+                statements = [await prepared_lookup.prepare(conn) if prepared_lookup else None for conn in connections]
+                
+                async def connection_worker(conn, statement):
+                    for index, user_id in pending:
+                        try:
+                            if statement is not None:
+                                results[index] = await prepared_lookup.fetchrow(statement, user_id)
+                            else:
+                                query_start = time.perf_counter()
+                                row = await conn.fetchrow(self.async_lookup_sql, user_id)
+                                results[index] = (time.perf_counter() - query_start, row)
+                        except Exception as e:
+                            print(f"Async sorgu hatasi (ID: {user_id}): {e}")
+                
+                start_time = time.perf_counter()
+                await asyncio.gather(*(connection_worker(conn, statement) for conn, statement in zip(connections, statements)))
+                total_time = time.perf_counter() - start_time
+                for conn in connections:
+                    await pool.release(conn)
+            else:
+                start_time = time.perf_counter()
+                tasks = [self.async_query(pool, user_id) for user_id in user_ids]
+                results = await asyncio.gather(*tasks)
+                total_time = time.perf_counter() - start_time
             
             await pool.close()
             
-            individual_times = [r[0] for r in results if r[0] > 0]
-            avg_time = sum(individual_times) / len(individual_times) if individual_times else 0
+            histogram = LatencyHistogram()
+            for exec_time, _ in results:
+                if exec_time > 0:
+                    histogram.record(exec_time)
             
-            for i, (exec_time, _) in enumerate(results):
-                print(f"Async {i+1:2d}/10: {exec_time:.3f}s (ID: {user_ids[i]})")
+            for i, (exec_time, _) in enumerate(results if self.verbose else []):
+                print(f"Async {i+1:2d}/{len(user_ids)}: {exec_time:.3f}s (ID: {user_ids[i]})")
             
             result_data = {
                 'server': self.server_name,
-                'test_type': 'Paralel_Asyncio',
+                'test_type': test_type,
                 'total_time': total_time,
-                'avg_query_time': avg_time,
+                'avg_query_time': histogram.mean,
                 'query_count': len(user_ids),
                 'pool_size': pool_size,
-                'individual_times': individual_times
+                'concurrency': concurrency,
+                'latency': histogram.summary(),
+                'latency_histogram': histogram.to_dict()
             }
+            if prepared_lookup is not None:
+                result_data['prepare_stats'] = prepared_lookup.prepare_stats()
             
             self.results.append(result_data)
             print(f"Paralel test toplam suresi: {total_time:.3f}s")
@@ -160,24 +289,276 @@ class ParallelTester:
         except Exception as e:
             print(f"Asyncio test hatasi: {e}")
     
-    def run_all_tests(self, user_ids):
+    def parallel_multiprocessing_test(self, user_ids, max_workers=5):
+        print(f"\n{self.server_name} - Paralel Test (Multiprocessing)")
+        print("-" * 40)
+        
+        try:
+            startup_start = time.perf_counter()
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=init_process_worker,
+                initargs=(self.connection_params, self.lookup_sql, multiprocessing.Barrier(max_workers))
+            ) as executor:
+                # Process baslatma ve baglanti kurma suresi olcumun disinda tutulur
+                ready_pids = set(executor.map(process_worker_ready, [60.0] * max_workers))
+                startup_time = time.perf_counter() - startup_start
+                if len(ready_pids) != max_workers:
+                    raise RuntimeError(f"{max_workers} process bekleniyordu, {len(ready_pids)} hazir")
+                
+                start_time = time.perf_counter()
+                results = list(executor.map(process_query, user_ids))
+                total_time = time.perf_counter() - start_time
+            
+            histogram = LatencyHistogram()
+            for exec_time, _, _ in results:
+                if exec_time > 0:
+                    histogram.record(exec_time)
+            
+            for i, (exec_time, _, pid) in enumerate(results if self.verbose else []):
+                print(f"Process {i+1:2d}/{len(user_ids)}: {exec_time:.3f}s (ID: {user_ids[i]}, PID: {pid})")
+            
+            result_data = {
+                'server': self.server_name,
+                'test_type': 'Paralel_Multiprocessing',
+                'total_time': total_time,
+                'avg_query_time': histogram.mean,
+                'query_count': len(user_ids),
+                'max_workers': max_workers,
+                'startup_time': startup_time,
+                'connection_stats': {
+                    'mode': 'per_process',
+                    'connects': max_workers,
+                    'processes_used': len({pid for _, _, pid in results})
+                },
+                'latency': histogram.summary(),
+                'latency_histogram': histogram.to_dict()
+            }
+            
+            self.results.append(result_data)
+            print(f"Process baslatma suresi: {startup_time:.3f}s (olcume dahil degil)")
+            print(f"Paralel test toplam suresi: {total_time:.3f}s")
+            return result_data
+            
+        except Exception as e:
+            print(f"Multiprocessing test hatasi: {e}")
+    
+    def any_query_test(self, user_ids, max_batch_size=100):
+        print(f"\n{self.server_name} - Toplu Sorgu (ANY, sirali, batch {max_batch_size})")
+        print("-" * 40)
+        
+        batch_sql, _ = to_batch_sql(self.lookup_sql)
+        stats = new_batch_stats()
+        histogram = LatencyHistogram()
+        start_time = time.perf_counter()
+        
+        with self.connections.connection() as conn:
+            cur = conn.cursor()
+            for offset in range(0, len(user_ids), max_batch_size):
+                batch = user_ids[offset:offset + max_batch_size]
+                query_start = time.perf_counter()
+                cur.execute(batch_sql, (batch,))
+                rows = cur.fetchall()
+                exec_time = time.perf_counter() - query_start
+                # Batch'teki her istek, batch sorgusunun tamamlanmasini bekler
+                histogram.record(exec_time, len(batch))
+                stats['requests'] += len(batch)
+                stats['batches'] += 1
+                stats['rows'] += len(rows)
+                stats['max_batch'] = max(stats['max_batch'], len(batch))
+                stats['query_time'] += exec_time
+            cur.close()
+            conn.rollback()
+        
+        total_time = time.perf_counter() - start_time
+        return self.batch_result('Toplu_ANY_Sirali', user_ids, total_time, histogram,
+                                 summarize_batch_stats(stats), max_batch_size, 0.0)
+    
+    def batched_threading_test(self, user_ids, max_workers=5, max_batch_size=100, max_wait=0.002):
+        print(f"\n{self.server_name} - Toplu Yukleyici (Threading, batch {max_batch_size}, bekleme {max_wait * 1000:.1f}ms)")
+        print("-" * 40)
+        
+        loader = ThreadedBatchLoader(self.connections, self.lookup_sql, max_batch_size=max_batch_size,
+                                     max_wait=max_wait, max_in_flight=max(1, self.connections.max_size // 2))
+        thread_histograms = ThreadLocalHistograms()
+        
+        def timed_load(user_id):
+            start_time = time.perf_counter()
+            loader.load(user_id)
+            thread_histograms.record(time.perf_counter() - start_time)
+        
+        start_time = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for future in [executor.submit(timed_load, user_id) for user_id in user_ids]:
+                try:
+                    future.result()
+                except Exception as exc:
+                    print(f"Toplu yukleme hatasi: {exc}")
+        total_time = time.perf_counter() - start_time
+        loader.close()
+        
+        result = self.batch_result('Toplu_Threading', user_ids, total_time, thread_histograms.merged(),
+                                   loader.batch_stats(), max_batch_size, max_wait)
+        result['max_workers'] = max_workers
+        return result
+    
+    async def batched_asyncio_test(self, user_ids, pool_size=5, max_batch_size=100, max_wait=0.002, concurrency=None):
+        print(f"\n{self.server_name} - Toplu Yukleyici (Asyncio, batch {max_batch_size}, bekleme {max_wait * 1000:.1f}ms)")
+        print("-" * 40)
+        
+        pool = await self.create_async_pool(min_size=1, max_size=pool_size)
+        loader = AsyncBatchLoader(pool, self.lookup_sql, max_batch_size=max_batch_size, max_wait=max_wait)
+        histogram = LatencyHistogram()
+        # concurrency verilirse ayni anda bekleyen istek sayisi threading testindeki worker sayisiyla sinirlanir
+        limiter = asyncio.Semaphore(concurrency or len(user_ids))
+        
+        async def timed_load(user_id):
+            async with limiter:
+                start_time = time.perf_counter()
+                try:
+                    await loader.load(user_id)
+                    histogram.record(time.perf_counter() - start_time)
+                except Exception as exc:
+                    print(f"Toplu yukleme hatasi (ID: {user_id}): {exc}")
+        
+        start_time = time.perf_counter()
+        await asyncio.gather(*(timed_load(user_id) for user_id in user_ids))
+        total_time = time.perf_counter() - start_time
+        await loader.close()
+        await pool.close()
+        
+        result = self.batch_result('Toplu_Asyncio', user_ids, total_time, histogram,
+                                   loader.batch_stats(), max_batch_size, max_wait)
+        result['pool_size'] = pool_size
+        result['concurrency'] = concurrency or len(user_ids)
+        return result
+    
+    def batch_result(self, test_type, user_ids, total_time, histogram, batch_stats, max_batch_size, max_wait):
+        result_data = {
+            'server': self.server_name,
+            'test_type': test_type,
+            'total_time': total_time,
+            'avg_query_time': histogram.mean,
+            'query_count': len(user_ids),
+            'max_batch_size': max_batch_size,
+            'max_wait': max_wait,
+            'batch_stats': batch_stats,
+            'latency': histogram.summary(),
+            'latency_histogram': histogram.to_dict()
+        }
+        self.results.append(result_data)
+        print(f"{batch_stats['batches']} sorgu, ortalama batch {batch_stats['mean_batch']:.1f}, "
+              f"toplam sure: {total_time:.3f}s")
+        return result_data
+    
+    def cached_result(self, test_type, user_ids, total_time, histogram, cache, workers):
+        cache_stats = cache.summary()
+        result_data = {
+            'server': self.server_name,
+            'test_type': test_type,
+            'total_time': total_time,
+            'avg_query_time': histogram.mean,
+            'query_count': len(user_ids),
+            'workers': workers,
+            'cache_capacity': cache.capacity,
+            'cache_stats': cache_stats,
+            'latency': histogram.summary(),
+            'latency_histogram': histogram.to_dict()
+        }
+        self.results.append(result_data)
+        print(f"Isabet orani: %{cache_stats['hit_ratio'] * 100:.1f}, veritabani sorgusu: {cache_stats['loads']}, "
+              f"birlestirilen: {cache_stats['coalesced']}, bellek: {cache_stats['memory_bytes'] / 1024:.0f}KB, "
+              f"toplam sure: {total_time:.3f}s")
+        return result_data
+    
+    def cached_threading_test(self, user_ids, max_workers=5, capacity=10000, ttl=None):
+        print(f"\n{self.server_name} - Onbellekli Test (Threading, kapasite {capacity})")
+        print("-" * 40)
+        
+        cache = LookupCache(capacity=capacity, ttl=ttl)
+        thread_histograms = ThreadLocalHistograms()
+        
+        def load(user_id):
+            # single_query hatayi yutup None dondurur; yukleyici hatayi yukseltmeli ki
+            # basarisiz sorgu onbellege gecerli bir bos satir olarak yazilmasin
+            with self.connections.connection() as conn:
+                cur = conn.cursor()
+                cur.execute(self.lookup_sql, (user_id,))
+                row = cur.fetchone()
+                cur.close()
+            return row
+        
+        def timed_lookup(user_id):
+            # Uctan uca gecikme: isabette onbellek, kayipta veritabani ya da bekleyen yukleme
+            start_time = time.perf_counter()
+            cache.get_or_load(user_id, load)
+            thread_histograms.record(time.perf_counter() - start_time)
+        
+        start_time = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for future in [executor.submit(timed_lookup, user_id) for user_id in user_ids]:
+                try:
+                    future.result()
+                except Exception as exc:
+                    print(f"Onbellekli sorgu hatasi: {exc}")
+        total_time = time.perf_counter() - start_time
+        
+        return self.cached_result('Onbellekli_Threading', user_ids, total_time, thread_histograms.merged(),
+                                  cache, max_workers)
+    
+    async def cached_asyncio_test(self, user_ids, pool_size=5, capacity=10000, ttl=None):
+        print(f"\n{self.server_name} - Onbellekli Test (Asyncio, kapasite {capacity})")
+        print("-" * 40)
+        
+        cache = LookupCache(capacity=capacity, ttl=ttl)
+        histogram = LatencyHistogram()
+        pending = iter(user_ids)
+        pool = await self.create_async_pool(min_size=1, max_size=pool_size)
+        
+        async def worker():
+            # Onbelleksiz asyncio testiyle ayni model: her worker baglantisini test boyunca tutar
+            async with pool.acquire() as conn:
+                async def load(user_id):
+                    return await conn.fetchrow(self.async_lookup_sql, user_id)
+                
+                for user_id in pending:
+                    start_time = time.perf_counter()
+                    try:
+                        await cache.get_or_load_async(user_id, load)
+                        histogram.record(time.perf_counter() - start_time)
+                    except Exception as e:
+                        print(f"Onbellekli async sorgu hatasi (ID: {user_id}): {e}")
+        
+        try:
+            start_time = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(pool_size)))
+            total_time = time.perf_counter() - start_time
+        finally:
+            await pool.close()
+        
+        return self.cached_result('Onbellekli_Asyncio', user_ids, total_time, histogram, cache, pool_size)
+    
+    def run_all_tests(self, user_ids, workers=5):
         print(f"\n=== {self.server_name} Paralel Programlama Testleri ===")
-        print(f"Test: 10 ID'ye ait kullanicilari sorgulama")
+        print(f"Test: {len(user_ids)} ID'ye ait kullanicilari sorgulama ({workers} worker)")
         print(f"Test ID'leri: {user_ids}")
         
         sequential_result = self.sequential_test(user_ids)
         time.sleep(1)
         
-        threading_result = self.parallel_threading_test(user_ids, max_workers=5)
+        threading_result = self.parallel_threading_test(user_ids, max_workers=workers)
+        time.sleep(1)
+        
+        asyncio_result = asyncio.run(self.parallel_asyncio_test(user_ids, pool_size=workers))
         time.sleep(1)
         
-        asyncio_result = asyncio.run(self.parallel_asyncio_test(user_ids, pool_size=5))
+        multiprocessing_result = self.parallel_multiprocessing_test(user_ids, max_workers=workers)
         
         print(f"\n{self.server_name} paralel testleri tamamlandi")
         
         print(f"\n{self.server_name} Test Sonuclari:")
-        print("Test Turu          | Toplam Sure | Hizlanma")
-        print("-" * 45)
+        print("Test Turu               | Toplam Sure | Hizlanma")
+        print("-" * 51)
         
         baseline_time = sequential_result['total_time']
         
@@ -186,57 +567,626 @@ class ParallelTester:
             total_time = result['total_time']
             speedup = baseline_time / total_time if total_time > 0 else 0
             
-            print(f"{test_type:<17} | {total_time:>9.3f}s | {speedup:>6.2f}x")
+            print(f"{test_type:<23} | {total_time:>9.3f}s | {speedup:>6.2f}x")
+    
+    def load_worker(self, connections, sampler, deadline, budget, budget_lock, start_at):
+        histogram = LatencyHistogram()
+        errors = 0
+        pending_ids = []
+        # Zaman serisi icin her sorgunun bitis ani (test basindan itibaren) ve gecikmesi tutulur
+        events = (array('d'), array('d'))
+        try:
+            with connections.connection() as conn:
+                cur = conn.cursor()
+                while True:
+                    if deadline is not None and time.perf_counter() >= deadline:
+                        break
+                    if budget is not None:
+                        with budget_lock:
+                            if budget[0] <= 0:
+                                break
+                            budget[0] -= 1
+                    if not pending_ids:
+                        pending_ids = sampler.sample(1024).tolist()
+                    user_id = pending_ids.pop()
+                    start_time = time.perf_counter()
+                    try:
+                        cur.execute(self.lookup_sql, (user_id,))
+                        cur.fetchone()
+                        end_time = time.perf_counter()
+                        histogram.record(end_time - start_time)
+                        events[0].append(end_time - start_at)
+                        events[1].append(end_time - start_time)
+                    except Exception:
+                        conn.rollback()
+                        errors += 1
+                cur.close()
+        except Exception:
+            return histogram, errors, 1, events
+        return histogram, errors, 0, events
+    
+    def build_timeline(self, outcomes, total_time, interval):
+        offsets = np.concatenate([np.asarray(events[0], dtype=np.float64) for _, _, _, events in outcomes])
+        latencies = np.concatenate([np.asarray(events[1], dtype=np.float64) for _, _, _, events in outcomes])
+        bins = np.floor(offsets / interval).astype(np.int64)
+        points = []
+        for index in range(int(np.ceil(total_time / interval))):
+            window = latencies[bins == index]
+            # Son pencere kisa kalabilir; throughput gercek pencere suresine bolunur
+            width = min(interval, total_time - index * interval)
+            point = {'t': index * interval, 'count': int(window.size),
+                     'throughput': window.size / width if width > 0 else 0.0}
+            if window.size:
+                point.update(zip(('p50', 'p90', 'p99'), (float(v) for v in np.percentile(window, [50, 90, 99]))))
+            points.append(point)
+        return {'interval': interval, 'points': points}
+    
+    def load_level(self, concurrency, sampler, duration=10.0, request_count=None, timeline_interval=1.0):
+        connections = ConnectionManager(self.connection_params, mode='pool', max_size=concurrency)
+        samplers = sampler.spawn(concurrency)
+        budget = [request_count] if request_count is not None else None
+        budget_lock = threading.Lock()
+        
+        start_time = time.perf_counter()
+        deadline = start_time + duration if request_count is None else None
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [
+                executor.submit(self.load_worker, connections, samplers[i], deadline, budget, budget_lock, start_time)
+                for i in range(concurrency)
+            ]
+            outcomes = [future.result() for future in futures]
+        
+        total_time = time.perf_counter() - start_time
+        connections.close_all()
+        
+        histogram = LatencyHistogram.merged(worker_histogram for worker_histogram, _, _, _ in outcomes)
+        query_errors = sum(errors for _, errors, _, _ in outcomes)
+        connection_errors = sum(failed for _, _, failed, _ in outcomes)
+        throughput = histogram.count / total_time if total_time > 0 else 0
+        
+        result_data = {
+            'server': self.server_name,
+            'test_type': 'Yuk_Testi',
+            'concurrency': concurrency,
+            'distribution': sampler.describe(),
+            'total_time': total_time,
+            'query_count': histogram.count,
+            'query_errors': query_errors,
+            'connection_errors': connection_errors,
+            'throughput': throughput,
+            'avg_query_time': histogram.mean,
+            'latency': histogram.summary(),
+            'latency_histogram': histogram.to_dict(),
+            'timeline': self.build_timeline(outcomes, total_time, timeline_interval)
+        }
+        
+        self.results.append(result_data)
+        return result_data
+    
+    def load_test(self, concurrency_levels=None, duration=10.0, request_count=None,
+                  distribution='uniform', max_id=10000000, seed=None, timeline_interval=1.0):
+        concurrency_levels = concurrency_levels or DEFAULT_CONCURRENCY_LEVELS
+        sampler = IdSampler(distribution, max_id=max_id, seed=seed)
+        limit = f"{request_count} istek" if request_count is not None else f"{duration:.0f}s"
+        
+        print(f"\n=== {self.server_name} Yuk Testi ===")
+        print(f"Eszamanlilik seviyeleri: {concurrency_levels}")
+        print(f"Her seviye: {limit}, ID dagilimi: {sampler.describe()}, max ID: {max_id:,}")
+        print("Eszamanlilik | Sorgu/sn   | p50 (ms) | p90 (ms) | p99 (ms) | p99.9 (ms) | max (ms) | Hata")
+        print("-" * 92)
+        
+        level_results = []
+        for concurrency in concurrency_levels:
+            result = self.load_level(concurrency, sampler, duration=duration, request_count=request_count,
+                                     timeline_interval=timeline_interval)
+            latency = result['latency']
+            errors = result['query_errors'] + result['connection_errors']
+            print(f"{concurrency:>12} | {result['throughput']:>10.1f} | {latency['p50'] * 1000:>8.2f} | "
+                  f"{latency['p90'] * 1000:>8.2f} | {latency['p99'] * 1000:>8.2f} | {latency['p99_9'] * 1000:>10.2f} | "
+                  f"{latency['max'] * 1000:>8.2f} | {errors:>4}")
+            level_results.append(result)
+        
+        peak = max(level_results, key=lambda r: r['throughput'])
+        print(f"{self.server_name} en yuksek verim: {peak['throughput']:.1f} sorgu/sn "
+              f"({peak['concurrency']} eszamanli istemci)")
+        return level_results
+    
+    async def open_loop_request(self, pool, user_id, intended_time, histogram, service_histogram, state):
+        state['in_flight'] += 1
+        state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+        try:
+            async with pool.acquire() as conn:
+                send_time = time.perf_counter()
+                await conn.fetchrow(self.async_lookup_sql, user_id)
+            end_time = time.perf_counter()
+            # Gecikme, istegin gonderilmesi gereken andan olculur (coordinated omission duzeltmesi)
+            histogram.record(end_time - intended_time)
+            service_histogram.record(end_time - send_time)
+            state['completed'] += 1
+        except Exception:
+            state['errors'] += 1
+        finally:
+            state['in_flight'] -= 1
+    
+    async def open_loop_test(self, rate, duration=10.0, arrival='constant', pool_size=20,
+                             distribution='uniform', max_id=10000000, seed=None):
+        if arrival not in ARRIVAL_PROCESSES:
+            raise ValueError(f"Bilinmeyen gelis sureci: {arrival} (secenekler: {', '.join(ARRIVAL_PROCESSES)})")
+        
+        print(f"\n{self.server_name} - Acik Dongu Test (Asyncio)")
+        print(f"Hedef hiz: {rate:.1f} sorgu/sn, Gelis: {arrival}, Sure: {duration:.0f}s, Havuz: {pool_size}")
+        print("-" * 40)
+        
+        sampler = IdSampler(distribution, max_id=max_id, seed=seed)
+        arrival_rng = np.random.default_rng(sampler.seed_sequence.spawn(1)[0])
+        histogram = LatencyHistogram()
+        service_histogram = LatencyHistogram()
+        state = {'in_flight': 0, 'max_in_flight': 0, 'completed': 0, 'errors': 0, 'late_dispatches': 0}
+        
+        pool = await self.create_async_pool(min_size=pool_size, max_size=pool_size)
+        
+        tasks = set()
+        issued = 0
+        pending_ids = []
+        start_time = time.perf_counter()
+        intended_time = start_time
+        end_of_schedule = start_time + duration
+        
+        try:
+            while True:
+                if arrival == 'poisson':
+                    intended_time += arrival_rng.exponential(1.0 / rate)
+                else:
+                    intended_time = start_time + issued / rate
+                if intended_time >= end_of_schedule:
+                    break
+                
+                delay = intended_time - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif delay < -0.001:
+                    state['late_dispatches'] += 1
+                
+                if not pending_ids:
+                    pending_ids = sampler.sample(1024).tolist()
+                task = asyncio.create_task(self.open_loop_request(
+                    pool, pending_ids.pop(), intended_time, histogram, service_histogram, state))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                issued += 1
+            
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            await pool.close()
+        
+        total_time = time.perf_counter() - start_time
+        latency = histogram.summary()
+        service_latency = service_histogram.summary()
+        
+        result_data = {
+            'server': self.server_name,
+            'test_type': 'Acik_Dongu_Asyncio',
+            'arrival': arrival,
+            'target_rate': rate,
+            'achieved_rate': state['completed'] / total_time if total_time > 0 else 0,
+            'total_time': total_time,
+            'query_count': state['completed'],
+            'query_errors': state['errors'],
+            'issued': issued,
+            'late_dispatches': state['late_dispatches'],
+            'max_in_flight': state['max_in_flight'],
+            'pool_size': pool_size,
+            'distribution': sampler.describe(),
+            'avg_query_time': histogram.mean,
+            'latency': latency,
+            'service_latency': service_latency,
+            'latency_histogram': histogram.to_dict(),
+            'service_latency_histogram': service_histogram.to_dict()
+        }
+        
+        self.results.append(result_data)
+        print(f"Gonderilen: {issued}, Tamamlanan: {state['completed']}, Hata: {state['errors']}, "
+              f"En fazla eszamanli: {state['max_in_flight']}")
+        print(f"Gerceklesen hiz: {result_data['achieved_rate']:.1f} sorgu/sn")
+        print("Olcum           | p50 (ms) | p90 (ms) | p99 (ms) | p99.9 (ms) | max (ms)")
+        print("-" * 72)
+        for label, values in [('Planlanan andan', latency), ('Gonderimden', service_latency)]:
+            print(f"{label:<15} | {values['p50'] * 1000:>8.2f} | {values['p90'] * 1000:>8.2f} | "
+                  f"{values['p99'] * 1000:>8.2f} | {values['p99_9'] * 1000:>10.2f} | {values['max'] * 1000:>8.2f}")
+        return result_data
     
-    def save_results(self):
-        filename = f'parallel_results_{self.server_name.lower().replace(" ", "_")}.json'
+    def save_results(self, store=None, workload=None):
+        filename = results_filename('parallel_results', self.server_name)
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(self.results, f, indent=2, ensure_ascii=False)
         print(f"Paralel test sonuclari kaydedildi: {filename}")
+        self.record_run(store, 'parallel', workload)
+    
+    def record_run(self, store, kind, workload=None):
+        if store is not None:
+            store.record_run(kind, self.server_name, self.results, self.connection_params,
+                             workload=workload, connection_mode=self.connections.mode)
+
+def create_tester(catalog, server, connection_mode, pool_size=10):
+    lookup = catalog.point_lookup
+    return ParallelTester(
+        server_name=server['name'],
+        connection_mode=connection_mode,
+        pool_size=pool_size,
+        lookup_sql=lookup.sql if lookup else DEFAULT_LOOKUP_SQL,
+        **server_connection_kwargs(server)
+    )
+
+def run_load_tests(args, catalog, servers):
+    print("PostgreSQL Yuk Testleri")
+    print("=" * 50)
+    
+    with optional_store(args.store, not args.no_store) as store:
+        for server in servers:
+            server_name = server['name']
+            tester = create_tester(catalog, server, args.connection_mode)
+            with sample_metrics(args.metrics, server_connection_kwargs(server), server_name,
+                                args.metrics_interval, 'server_metrics_load'):
+                tester.load_test(
+                    concurrency_levels=args.levels,
+                    duration=args.duration,
+                    request_count=args.requests,
+                    distribution=args.distribution,
+                    max_id=args.max_id,
+                    seed=args.seed,
+                    timeline_interval=args.timeline_interval
+                )
+            filename = results_filename('load_results', server_name)
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(tester.results, f, indent=2, ensure_ascii=False)
+            print(f"Yuk testi sonuclari kaydedildi: {filename}")
+            tester.record_run(store, 'load', catalog.name)
+
+def run_open_loop_tests(args, catalog, servers):
+    print("PostgreSQL Acik Dongu Testleri")
+    print("=" * 50)
+    
+    with optional_store(args.store, not args.no_store) as store:
+        for server in servers:
+            server_name = server['name']
+            tester = create_tester(catalog, server, args.connection_mode)
+            with sample_metrics(args.metrics, server_connection_kwargs(server), server_name,
+                                args.metrics_interval, 'server_metrics_open_loop'):
+                for rate in args.rates:
+                    try:
+                        asyncio.run(tester.open_loop_test(
+                            rate,
+                            duration=args.duration,
+                            arrival=args.arrival,
+                            pool_size=args.pool_size,
+                            distribution=args.distribution,
+                            max_id=args.max_id,
+                            seed=args.seed
+                        ))
+                    except Exception as e:
+                        print(f"Acik dongu test hatasi ({server_name}, {rate} sorgu/sn): {e}")
+            filename = results_filename('open_loop_results', server_name)
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(tester.results, f, indent=2, ensure_ascii=False)
+            print(f"Acik dongu sonuclari kaydedildi: {filename}")
+            tester.record_run(store, 'open_loop', catalog.name)
+
+def run_batch_tests(args, catalog, servers):
+    print("PostgreSQL Toplu Sorgu (ANY) Testleri")
+    print("=" * 50)
+    
+    sampler = IdSampler(args.distribution, max_id=args.max_id, seed=args.seed)
+    user_ids = sampler.sample(args.id_count).tolist()
+    print(f"{len(user_ids)} ID, dagilim: {args.distribution}, worker: {args.workers}, "
+          f"batch boyutlari: {args.batch_sizes}, en fazla bekleme: {args.max_wait}ms")
+    
+    with optional_store(args.store, not args.no_store) as store:
+        for server in servers:
+            tester = create_tester(catalog, server, args.connection_mode)
+            tester.verbose = False
+            max_wait = args.max_wait / 1000
+        
+            tester.sequential_test(user_ids)
+            tester.parallel_threading_test(user_ids, max_workers=args.workers)
+            asyncio.run(tester.parallel_asyncio_test(user_ids, pool_size=args.workers))
+            for batch_size in args.batch_sizes:
+                tester.any_query_test(user_ids, max_batch_size=batch_size)
+                tester.batched_threading_test(user_ids, max_workers=args.workers, max_batch_size=batch_size, max_wait=max_wait)
+                asyncio.run(tester.batched_asyncio_test(user_ids, pool_size=args.workers, max_batch_size=batch_size,
+                                                        max_wait=max_wait, concurrency=args.workers))
+        
+            print(f"\n{server['name']} Tekil vs Toplu Sorgu:")
+            print("Test Turu               | Batch | Sorgu  | Toplam (s) | ID/sn      | p50 (ms) | p99 (ms)")
+            print("-" * 90)
+            for result in tester.results:
+                batch = result.get('max_batch_size', 1)
+                queries = result.get('batch_stats', {}).get('batches', result['query_count'])
+                throughput = result['query_count'] / result['total_time'] if result['total_time'] > 0 else 0
+                print(f"{result['test_type']:<23} | {batch:>5} | {queries:>6} | {result['total_time']:>10.3f} | "
+                      f"{throughput:>10.1f} | {result['latency']['p50'] * 1000:>8.2f} | {result['latency']['p99'] * 1000:>8.2f}")
+        
+            filename = results_filename('batch_results', server['name'])
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(tester.results, f, indent=2, ensure_ascii=False)
+            print(f"Toplu sorgu sonuclari kaydedildi: {filename}")
+            tester.record_run(store, 'batch', catalog.name)
+
+def run_scaling_tests(args, catalog, servers):
+    print("PostgreSQL Olcekleme Testleri (throughput vs worker)")
+    print("=" * 50)
+    
+    sampler = IdSampler(args.distribution, max_id=args.max_id, seed=args.seed)
+    user_ids = sampler.sample(args.id_count).tolist()
+    print(f"{len(user_ids)} ID, worker seviyeleri: {args.worker_levels}")
+    
+    with optional_store(args.store, not args.no_store) as store:
+        for server in servers:
+            # Threading egrisi asyncio ile ayni baglanti sinirinda olculsun; varsayilan 10'luk limit egriyi keserdi
+            tester = create_tester(catalog, server, args.connection_mode, pool_size=max(args.worker_levels))
+            tester.verbose = False
+            # Sirali test worker sayisindan bagimsizdir; egrilerde yatay referans cizgisi olarak kullanilir
+            tester.sequential_test(user_ids)['workers'] = 1
+            for workers in args.worker_levels:
+                tester.parallel_threading_test(user_ids, max_workers=workers)['workers'] = workers
+                result = asyncio.run(tester.parallel_asyncio_test(user_ids, pool_size=workers, concurrency=workers))
+                if result:
+                    result['workers'] = workers
+        
+            print(f"\n{server['name']} Olcekleme:")
+            print("Test Turu               | Worker | ID/sn      | p50 (ms) | p99 (ms)")
+            print("-" * 68)
+            for result in tester.results:
+                throughput = result['query_count'] / result['total_time'] if result['total_time'] > 0 else 0
+                print(f"{result['test_type']:<23} | {result['workers']:>6} | {throughput:>10.1f} | "
+                      f"{result['latency']['p50'] * 1000:>8.2f} | {result['latency']['p99'] * 1000:>8.2f}")
+        
+            filename = results_filename('scaling_results', server['name'])
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(tester.results, f, indent=2, ensure_ascii=False)
+            print(f"Olcekleme sonuclari kaydedildi: {filename}")
+            tester.record_run(store, 'scaling', catalog.name)
+
+def run_cache_tests(args, catalog, servers):
+    print("PostgreSQL Istemci Onbellegi Testleri")
+    print("=" * 50)
+    
+    sampler = IdSampler(args.distribution, max_id=args.max_id, seed=args.seed)
+    user_ids = sampler.sample(args.id_count).tolist()
+    ttl = args.cache_ttl
+    print(f"{len(user_ids)} istek, {len(set(user_ids))} farkli ID, dagilim: {sampler.describe()}, "
+          f"worker: {args.workers}, kapasiteler: {args.cache_sizes}, TTL: {ttl if ttl else 'yok'}")
+    
+    with optional_store(args.store, not args.no_store) as store:
+        for server in servers:
+            tester = create_tester(catalog, server, args.connection_mode)
+            tester.verbose = False
+        
+            tester.parallel_threading_test(user_ids, max_workers=args.workers)
+            asyncio.run(tester.parallel_asyncio_test(user_ids, pool_size=args.workers, concurrency=args.workers))
+            for capacity in args.cache_sizes:
+                tester.cached_threading_test(user_ids, max_workers=args.workers, capacity=capacity, ttl=ttl)
+                asyncio.run(tester.cached_asyncio_test(user_ids, pool_size=args.workers, capacity=capacity, ttl=ttl))
+        
+            print(f"\n{server['name']} Onbelleksiz vs Onbellekli:")
+            print("Test Turu               | Kapasite | Isabet  | DB sorgusu | Bellek (KB) | ID/sn      | p50 (ms) | p99 (ms)")
+            print("-" * 110)
+            for result in tester.results:
+                cache_stats = result.get('cache_stats', {})
+                hit_ratio = f"%{cache_stats['hit_ratio'] * 100:5.1f}" if cache_stats else f"{'-':>7}"
+                throughput = result['query_count'] / result['total_time'] if result['total_time'] > 0 else 0
+                print(f"{result['test_type']:<23} | {result.get('cache_capacity', '-'):>8} | {hit_ratio} | "
+                      f"{cache_stats.get('loads', result['query_count']):>10} | "
+                      f"{cache_stats.get('memory_bytes', 0) / 1024:>11.0f} | {throughput:>10.1f} | "
+                      f"{result['latency']['p50'] * 1000:>8.3f} | {result['latency']['p99'] * 1000:>8.3f}")
+        
+            filename = results_filename('cache_results', server['name'])
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(tester.results, f, indent=2, ensure_ascii=False)
+            print(f"Onbellek sonuclari kaydedildi: {filename}")
+            tester.record_run(store, 'cache', catalog.name)
+
+def server_side_lookup_cost(tester, user_id, repetitions=20):
+    # EXPLAIN ANALYZE sunucudaki planlama ve calisma suresini ayri ayri verir
+    planning = []
+    execution = []
+    with tester.connections.connection() as conn:
+        for _ in range(repetitions):
+            plan = capture_plan(conn, tester.lookup_sql, (user_id,))
+            planning.append(plan.get('Planning Time', 0.0))
+            execution.append(plan.get('Execution Time', 0.0))
+        conn.rollback()
+        plan_counts = tester.prepared_lookup.plan_counts(conn)
+    return {
+        'planning_time_ms': sorted(planning)[len(planning) // 2],
+        'execution_time_ms': sorted(execution)[len(execution) // 2],
+        'prepared_plan_counts': plan_counts
+    }
+
+def run_prepared_tests(args, catalog, servers):
+    print("PostgreSQL Hazir Ifade (PREPARE) Testleri")
+    print("=" * 50)
+    
+    sampler = IdSampler(args.distribution, max_id=args.max_id, seed=args.seed)
+    user_ids = sampler.sample(args.id_count).tolist()
+    comparisons = [
+        ('Sirali', 'Sirali_Hazir'),
+        ('Paralel_Threading', 'Paralel_Threading_Hazir'),
+        ('Paralel_Asyncio_Onbelleksiz', 'Paralel_Asyncio_Hazir'),
+        ('Paralel_Asyncio', 'Paralel_Asyncio_Hazir')
+    ]
+    
+    with optional_store(args.store, not args.no_store) as store:
+        for server in servers:
+            tester = create_tester(catalog, server, args.connection_mode)
+            tester.verbose = False
+        
+            tester.sequential_test(user_ids)
+            tester.sequential_test(user_ids, prepared=True)
+            tester.parallel_threading_test(user_ids, max_workers=args.workers)
+            tester.parallel_threading_test(user_ids, max_workers=args.workers, prepared=True)
+            for statement_mode in ASYNC_STATEMENT_MODES:
+                asyncio.run(tester.parallel_asyncio_test(user_ids, pool_size=args.workers, statement_mode=statement_mode,
+                                                         concurrency=args.workers))
+        
+            server_cost = server_side_lookup_cost(tester, user_ids[0])
+            by_type = {result['test_type']: result for result in tester.results}
+        
+            print(f"\n{server['name']} Metin SQL vs Hazir Ifade (sorgu basina, mikrosaniye):")
+            print("Karsilastirma                                          | Once p50 | Sonra p50 | Once ort | Sonra ort | Kazanc/sorgu | ID/sn once -> sonra")
+            print("-" * 138)
+            for baseline_type, prepared_type in comparisons:
+                baseline = by_type.get(baseline_type)
+                prepared = by_type.get(prepared_type)
+                if not baseline or not prepared:
+                    continue
+                saving = (baseline['latency']['mean'] - prepared['latency']['mean']) * 1e6
+                label = f"{baseline_type} -> {prepared_type}"
+                throughput = f"{baseline['query_count'] / baseline['total_time']:.0f} -> {prepared['query_count'] / prepared['total_time']:.0f}"
+                print(f"{label:<54} | {baseline['latency']['p50'] * 1e6:>8.1f} | {prepared['latency']['p50'] * 1e6:>9.1f} | "
+                      f"{baseline['latency']['mean'] * 1e6:>8.1f} | {prepared['latency']['mean'] * 1e6:>9.1f} | {saving:>+12.1f} | {throughput}")
+        
+            for prepared_type in ('Sirali_Hazir', 'Paralel_Threading_Hazir', 'Paralel_Asyncio_Hazir'):
+                stats = by_type.get(prepared_type, {}).get('prepare_stats')
+                if stats:
+                    print(f"{prepared_type}: PREPARE maliyeti (tek seferlik) {stats['avg_prepare_time'] * 1e6:.1f} us x "
+                          f"{stats['connections_prepared']} baglanti")
+            print(f"Sunucu tarafi (EXPLAIN ANALYZE, medyan): planlama {server_cost['planning_time_ms'] * 1000:.1f} us, "
+                  f"calisma {server_cost['execution_time_ms'] * 1000:.1f} us")
+            if server_cost['prepared_plan_counts']:
+                counts = server_cost['prepared_plan_counts']
+                print(f"Hazir ifade planlari: {counts['generic_plans']} generic, {counts['custom_plans']} custom "
+                      f"(generic plan kullanildiginda planlama tamamen atlanir)")
+        
+            filename = results_filename('prepared_results', server['name'])
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump({'results': tester.results, 'server_side': server_cost}, f, indent=2, ensure_ascii=False)
+            print(f"Hazir ifade sonuclari kaydedildi: {filename}")
+            tester.record_run(store, 'prepared', catalog.name)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="PostgreSQL paralel programlama testleri")
+    parser.add_argument('--catalog', default=None, help="Is yuku katalog dosyasi (JSON/TOML/YAML)")
+    parser.add_argument('--connection-mode', choices=['pool', 'per_call'], default='pool')
+    parser.add_argument('--servers', nargs=2, metavar=('A', 'B'), default=None,
+                        help="Calistirilip karsilastirilacak sunucu adlari (varsayilan: katalogdaki ikinci ve ilk sunucu)")
+    parser.add_argument('--load', action='store_true', help="Eszamanlilik taramali yuk testi calistir")
+    parser.add_argument('--open-loop', action='store_true', help="Hiz kontrollu acik dongu asyncio testi calistir")
+    parser.add_argument('--rates', type=float, nargs='+', default=[100.0, 500.0, 1000.0, 2000.0])
+    parser.add_argument('--arrival', choices=ARRIVAL_PROCESSES, default='poisson')
+    parser.add_argument('--pool-size', type=int, default=20)
+    parser.add_argument('--levels', type=int, nargs='+', default=DEFAULT_CONCURRENCY_LEVELS)
+    parser.add_argument('--duration', type=float, default=10.0, help="Seviye basina sure (saniye)")
+    parser.add_argument('--requests', type=int, default=None, help="Seviye basina sabit istek sayisi")
+    parser.add_argument('--distribution', choices=ID_DISTRIBUTIONS, default='uniform')
+    parser.add_argument('--max-id', type=int, default=10000000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--batch', action='store_true', help="Tekil ID sorgularini ANY(...) toplu yukleyiciyle karsilastir")
+    parser.add_argument('--prepared', action='store_true', help="Metin SQL ile PREPARE/conn.prepare nokta sorgularini karsilastir")
+    parser.add_argument('--cache', action='store_true', help="Nokta sorgularini LRU/TTL istemci onbellegiyle karsilastir")
+    parser.add_argument('--cache-sizes', type=int, nargs='+', default=[1000, 10000], help="Onbellek kapasiteleri (satir)")
+    parser.add_argument('--cache-ttl', type=float, default=None, help="Onbellek girdisi yasam suresi (saniye)")
+    parser.add_argument('--scaling', action='store_true', help="Sirali/threading/asyncio throughput'unu worker sayisina gore olc")
+    parser.add_argument('--worker-levels', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument('--timeline-interval', type=float, default=1.0, help="Yuk testi zaman serisi pencere boyu (saniye)")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[10, 100])
+    parser.add_argument('--max-wait', type=float, default=2.0, help="Toplu yukleyicide en fazla bekleme (ms)")
+    parser.add_argument('--workers', type=int, default=5, help="Threading/asyncio/multiprocessing worker sayisi")
+    parser.add_argument('--id-count', type=int, default=10, help="Paralel testlerde sorgulanacak ID sayisi")
+    parser.add_argument('--metrics', action='store_true', help="Testler sirasinda pg_stat_* metriklerini ornekle")
+    parser.add_argument('--metrics-interval', type=float, default=1.0)
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help="Kosularin eklendigi SQLite sonuc gecmisi")
+    parser.add_argument('--no-store', action='store_true', help="Sonuclari gecmise ekleme")
+    args = parser.parse_args()
+    if args.prepared and args.connection_mode == 'per_call':
+        # per_call'da her sorgu yeni backend acar; PREPARE her cagrida olcum disinda tekrarlanir ve kazanc sisik gorunur
+        parser.error("--prepared, --connection-mode per_call ile kullanilamaz")
+    return args
 
 def main():
+    args = parse_args()
+    catalog = WorkloadCatalog.load(args.catalog)
+    if args.servers:
+        try:
+            server_a, server_b = (catalog.server(name) for name in args.servers)
+        except KeyError as e:
+            print(f"HATA - {e}")
+            return
+        servers = [server_b, server_a]
+    else:
+        servers = catalog.servers
+    if args.load:
+        run_load_tests(args, catalog, servers)
+        return
+    if args.open_loop:
+        run_open_loop_tests(args, catalog, servers)
+        return
+    if args.batch:
+        run_batch_tests(args, catalog, servers)
+        return
+    if args.prepared:
+        run_prepared_tests(args, catalog, servers)
+        return
+    if args.scaling:
+        run_scaling_tests(args, catalog, servers)
+        return
+    if args.cache:
+        run_cache_tests(args, catalog, servers)
+        return
+    
     print("PostgreSQL Paralel Programlama Testleri")
     print("=" * 50)
-    print("Test: 10 adet ID'ye ait kullanicilari tek tek sorgulama")
-    print("Yontemler: Sirali, Paralel (Threading), Paralel (Asyncio)")
+    print(f"Test: {args.id_count} adet ID'ye ait kullanicilari tek tek sorgulama")
+    print("Yontemler: Sirali, Paralel (Threading), Paralel (Asyncio), Paralel (Multiprocessing)")
     print("=" * 50)
     
+    connection_mode = args.connection_mode
+    print(f"Baglanti modu: {connection_mode}")
+    
     test_user_ids = [100000, 200000, 300000, 400000, 500000, 
                      600000, 700000, 800000, 900000, 150000]
+    if args.id_count != len(test_user_ids):
+        sampler = IdSampler('uniform', max_id=args.max_id, seed=args.seed if args.seed is not None else 0)
+        test_user_ids = sampler.sample(args.id_count).tolist()
     
-    print("\nServer B (Hatali Konfigürasyon) Paralel Testleri")
-    tester_b = ParallelTester('10.0.2.15', 'Server_B')
-    tester_b.run_all_tests(test_user_ids)
-    tester_b.save_results()
-    
-    print("\n" + "="*50)
-    print("Sunucular arasi gecis bekleme suresi...")
-    time.sleep(5)
-    
-    print("\nServer A (Optimum Konfigürasyon) Paralel Testleri")
-    tester_a = ParallelTester('localhost', 'Server_A')
-    tester_a.run_all_tests(test_user_ids)
-    tester_a.save_results()
+    with optional_store(args.store, not args.no_store) as store:
+        for index, server in enumerate(servers):
+            if index > 0:
+                print("\n" + "="*50)
+                print("Sunucular arasi gecis bekleme suresi...")
+                time.sleep(5)
+        
+            print(f"\n{server.get('label', server['name'])} Paralel Testleri")
+            tester = create_tester(catalog, server, connection_mode)
+            with sample_metrics(args.metrics, server_connection_kwargs(server), server['name'],
+                                args.metrics_interval, 'server_metrics_parallel'):
+                tester.run_all_tests(test_user_ids, workers=args.workers)
+            tester.save_results(store, workload=catalog.name)
     
     print("\nTum paralel testler tamamlandi")
     print("Olusturulan dosyalar:")
-    print("- parallel_results_server_b.json")
-    print("- parallel_results_server_a.json")
+    for server in servers:
+        print(f"- {results_filename('parallel_results', server['name'])}")
+    
+    if len(servers) < 2:
+        return
+    server_b, server_a = servers[0], servers[1]
     
     print("\n" + "="*50)
     print("Paralel Programlama Karsilastirmasi")
     print("="*50)
     
     try:
-        with open('parallel_results_server_a.json', 'r') as f:
+        with open(results_filename('parallel_results', server_a['name']), 'r') as f:
             results_a = json.load(f)
-        with open('parallel_results_server_b.json', 'r') as f:
+        with open(results_filename('parallel_results', server_b['name']), 'r') as f:
             results_b = json.load(f)
         
-        print("Test Turu          | Server A (s) | Server B (s) | A Hizlanma | B Hizlanma")
-        print("-" * 75)
+        print("Test Turu               | Server A (s) | Server B (s) | A Hizlanma | B Hizlanma")
+        print("-" * 81)
         
-        for test_type in ['Sirali', 'Paralel_Threading', 'Paralel_Asyncio']:
+        for test_type in ['Sirali', 'Paralel_Threading', 'Paralel_Asyncio', 'Paralel_Multiprocessing']:
             result_a = next((r for r in results_a if r['test_type'] == test_type), None)
             result_b = next((r for r in results_b if r['test_type'] == test_type), None)
             
@@ -250,7 +1200,7 @@ def main():
                 speedup_a = baseline_a / time_a if time_a > 0 else 0
                 speedup_b = baseline_b / time_b if time_b > 0 else 0
                 
-                print(f"{test_type:<17} | {time_a:>8.3f}    | {time_b:>8.3f}    | {speedup_a:>7.2f}x | {speedup_b:>7.2f}x")
+                print(f"{test_type:<23} | {time_a:>8.3f}    | {time_b:>8.3f}    | {speedup_a:>7.2f}x | {speedup_b:>7.2f}x")
         
         print("\nSonuc Analizi:")
         print("- Sirali: Baseline test (1.0x hizlanma)")
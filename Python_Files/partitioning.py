@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import re
+import statistics
+import time
+from datetime import datetime
+import psycopg2
+from psycopg2 import sql
+from bulk_loader import TABLE_NAME
+from performance_tester import PerformanceTester
+from plan_inspector import capture_plan, walk_nodes
+from workload_catalog import WorkloadCatalog, server_connection_kwargs, results_filename
+
+LAYOUTS = ('single', 'range_dogum_tarihi', 'range_id', 'hash_id')
+COLUMNS_SQL = "id INTEGER NOT NULL, name VARCHAR(100), surname VARCHAR(100), eposta VARCHAR(255), dogum_tarihi DATE, created_at TIMESTAMP"
+TABLE_PATTERN = re.compile(rf"\b{TABLE_NAME}\b")
+
+def layout_table(layout):
+    return f"{TABLE_NAME}_{layout}"
+
+def substitute_table(query, table):
+    return TABLE_PATTERN.sub(table, query)
+
+def partition_usage(plan, table):
+    # Yurutulen (loops > 0) bolumler taranmis sayilir; "never executed" bolumler ve
+    # Subplans Removed calisma zamaninda budanmis bolumlerdir
+    scanned = set()
+    planned = set()
+    removed = 0
+    for node, _, _ in walk_nodes(plan['Plan']):
+        removed += node.get('Subplans Removed', 0)
+        relation = node.get('Relation Name')
+        if relation and relation.startswith(table):
+            planned.add(relation)
+            if node.get('Actual Loops', 0) > 0:
+                scanned.add(relation)
+    return {'planned': len(planned), 'scanned': len(scanned), 'runtime_removed': removed}
+
+class PartitionBenchmark:
+    def __init__(self, catalog, server, layouts=LAYOUTS, partitions=8, rows=None, copies=1,
+                 warmup=None, repetitions=None, keep=False, seed=None):
+        self.catalog = catalog
+        self.server_name = server['name']
+        self.connection_params = server_connection_kwargs(server)
+        self.layouts = layouts
+        self.partitions = partitions
+        self.rows = rows
+        self.copies = copies
+        self.warmup = warmup if warmup is not None else catalog.benchmark['warmup']
+        self.repetitions = repetitions if repetitions is not None else catalog.benchmark['repetitions']
+        self.keep = keep
+        self.seed = seed
+        self.source_bounds = None
+        self.results = []
+
+    def admin_query(self, query, params=None):
+        conn = psycopg2.connect(**self.connection_params)
+        conn.autocommit = True
+        cur = conn.cursor()
+        cur.execute(query, params)
+        rows = cur.fetchall() if cur.description else []
+        cur.close()
+        conn.close()
+        return rows
+
+    def load_source_bounds(self):
+        min_id, max_id, min_date, max_date = self.admin_query(
+            sql.SQL("SELECT min(id), max(id), min(dogum_tarihi), max(dogum_tarihi) FROM {}").format(sql.Identifier(TABLE_NAME)))[0]
+        if max_id is None:
+            raise RuntimeError(f"{TABLE_NAME} bos; once veri yukleyin")
+        if self.rows:
+            max_id = min(max_id, min_id + self.rows - 1)
+        self.source_bounds = {'min_id': min_id, 'max_id': max_id, 'min_date': min_date, 'max_date': max_date}
+        return self.source_bounds
+
+    def partition_ddl(self, layout, table):
+        bounds = self.source_bounds
+        identifier = sql.Identifier(table)
+        if layout == 'single':
+            return [sql.SQL(f"CREATE TABLE {{}} ({COLUMNS_SQL}, PRIMARY KEY (id))").format(identifier)]
+        if layout == 'hash_id':
+            statements = [sql.SQL(f"CREATE TABLE {{}} ({COLUMNS_SQL}, PRIMARY KEY (id)) PARTITION BY HASH (id)").format(identifier)]
+            for remainder in range(self.partitions):
+                statements.append(sql.SQL("CREATE TABLE {} PARTITION OF {} FOR VALUES WITH (MODULUS {}, REMAINDER {})").format(
+                    sql.Identifier(f"{table}_p{remainder}"), identifier, sql.Literal(self.partitions), sql.Literal(remainder)))
+            return statements
+        if layout == 'range_id':
+            # Kopyalar id'yi kaydirdigi icin aralik toplam id uzayina gore bolunur
+            span = (bounds['max_id'] - bounds['min_id'] + 1) * self.copies
+            step = -(-span // self.partitions)
+            statements = [sql.SQL(f"CREATE TABLE {{}} ({COLUMNS_SQL}, PRIMARY KEY (id)) PARTITION BY RANGE (id)").format(identifier)]
+            for index in range(self.partitions):
+                low = bounds['min_id'] + index * step
+                statements.append(sql.SQL("CREATE TABLE {} PARTITION OF {} FOR VALUES FROM ({}) TO ({})").format(
+                    sql.Identifier(f"{table}_p{index}"), identifier, sql.Literal(low), sql.Literal(low + step)))
+            return statements
+        # Bolum anahtari birincil anahtarda bulunmak zorunda: (id, dogum_tarihi)
+        statements = [sql.SQL(f"CREATE TABLE {{}} ({COLUMNS_SQL}, PRIMARY KEY (id, dogum_tarihi)) "
+                              f"PARTITION BY RANGE (dogum_tarihi)").format(identifier)]
+        for year in range(bounds['min_date'].year, bounds['max_date'].year + 1):
+            statements.append(sql.SQL("CREATE TABLE {} PARTITION OF {} FOR VALUES FROM ({}) TO ({})").format(
+                sql.Identifier(f"{table}_p{year}"), identifier, sql.Literal(f"{year}-01-01"), sql.Literal(f"{year + 1}-01-01")))
+        statements.append(sql.SQL("CREATE TABLE {} PARTITION OF {} DEFAULT").format(sql.Identifier(f"{table}_default"), identifier))
+        return statements
+
+    def create_layout(self, layout):
+        table = layout_table(layout)
+        self.drop_layout(layout)
+        for statement in self.partition_ddl(layout, table):
+            self.admin_query(statement)
+        # Tum duzenler ayni INSERT ... SELECT ile yuklenir; kopyalar id'yi kaydirarak veri boyutunu katlar
+        span = self.source_bounds['max_id'] - self.source_bounds['min_id'] + 1
+        start_time = time.perf_counter()
+        self.admin_query(sql.SQL(
+            "INSERT INTO {} SELECT s.id + c.n * %s, s.name, s.surname, s.eposta, s.dogum_tarihi, s.created_at "
+            "FROM {} s CROSS JOIN generate_series(0, %s) AS c(n) WHERE s.id <= %s"
+        ).format(sql.Identifier(table), sql.Identifier(TABLE_NAME)), (span, self.copies - 1, self.source_bounds['max_id']))
+        self.admin_query(sql.SQL("VACUUM (ANALYZE) {}").format(sql.Identifier(table)))
+        load_time = time.perf_counter() - start_time
+        row_count, partitions, size = self.admin_query(sql.SQL(
+            "SELECT (SELECT count(*) FROM {}), "
+            "(SELECT count(*) FROM pg_inherits WHERE inhparent = %s::regclass), "
+            "(SELECT coalesce(sum(pg_total_relation_size(relid)), 0) FROM pg_partition_tree(%s::regclass))"
+        ).format(sql.Identifier(table)), (table, table))[0]
+        return {'table': table, 'rows': row_count, 'partitions': partitions, 'size_bytes': int(size), 'load_time': load_time}
+
+    def drop_layout(self, layout):
+        self.admin_query(sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(layout_table(layout))))
+
+    def layout_queries(self, table):
+        return [(substitute_table(query, table), description, params)
+                for query, description, params in self.catalog.benchmark_queries(self.seed)]
+
+    def plan_statistics(self, table, queries, repetitions=5):
+        conn = psycopg2.connect(**self.connection_params)
+        stats = {}
+        try:
+            for query, description, params in queries:
+                planning = []
+                plan = None
+                for _ in range(repetitions):
+                    plan = capture_plan(conn, query, params() if callable(params) else params)
+                    planning.append(plan.get('Planning Time', 0.0))
+                conn.rollback()
+                stats[description] = dict(partition_usage(plan, table), planning_time_ms=statistics.median(planning))
+        finally:
+            conn.close()
+        return stats
+
+    def benchmark_layout(self, layout):
+        print(f"\n--- {layout} ---")
+        info = self.create_layout(layout)
+        print(f"{info['table']}: {info['rows']:,} satir, {info['partitions']} bolum, "
+              f"{info['size_bytes'] / 1024 / 1024:.0f}MB, yukleme {info['load_time']:.1f}s")
+        queries = self.layout_queries(info['table'])
+        tester = PerformanceTester(server_name=self.server_name, queries=queries, **self.connection_params)
+        tester.run_benchmark_suite(warmup=self.warmup, repetitions=self.repetitions)
+        tester.connections.close_all()
+        plans = self.plan_statistics(info['table'], queries)
+        record = dict(info, layout=layout, queries={
+            result['query']: dict(plans.get(result['query'], {}), median=result['execution_time'], samples=result['samples'])
+            for result in tester.results
+        })
+        if not self.keep:
+            self.drop_layout(layout)
+        return record
+
+    def run(self):
+        self.load_source_bounds()
+        print(f"\n=== {self.server_name} Bolumleme Karsilastirmasi ===")
+        print(f"Kaynak: {TABLE_NAME} id {self.source_bounds['min_id']}-{self.source_bounds['max_id']} x {self.copies} kopya, "
+              f"duzenler: {', '.join(self.layouts)}")
+        for layout in self.layouts:
+            try:
+                self.results.append(self.benchmark_layout(layout))
+            except Exception as e:
+                print(f"HATA - {self.server_name} - {layout}: {e}")
+                # Temizlik hatasi asil hatayi gizlememeli ve diger duzenleri durdurmamali
+                try:
+                    self.drop_layout(layout)
+                except Exception as drop_error:
+                    print(f"HATA - {self.server_name} - {layout} silinemedi: {drop_error}")
+        return self.results
+
+    def report(self):
+        baseline = next((record for record in self.results if record['layout'] == 'single'), None)
+        print(f"\n=== {self.server_name} Bolumleme Sonuclari ===")
+        print(f"{'Duzen':<20} | {'Sorgu':<36} | Medyan (ms) | Tek tabloya gore | Planlama (ms) | Bolum (taranan/planda/toplam)")
+        print("-" * 128)
+        for record in self.results:
+            for description, query in record['queries'].items():
+                base = baseline['queries'].get(description) if baseline else None
+                ratio = f"{base['median'] / query['median']:>15.2f}x" if base and query['median'] > 0 else f"{'-':>16}"
+                partitions = (f"{query.get('scanned', 0)}/{query.get('planned', 0)}/{record['partitions']}"
+                              if record['partitions'] else "-")
+                if query.get('runtime_removed'):
+                    partitions += f" (+{query['runtime_removed']} calisma aninda budandi)"
+                print(f"{record['layout']:<20} | {description[:36]:<36} | {query['median'] * 1000:>11.3f} | {ratio} | "
+                      f"{query.get('planning_time_ms', 0):>13.3f} | {partitions}")
+        return {
+            'catalog': self.catalog.name,
+            'server': self.server_name,
+            'source_rows': self.source_bounds['max_id'] - self.source_bounds['min_id'] + 1,
+            'copies': self.copies,
+            'partitions': self.partitions,
+            'layouts': self.results,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def save_results(self, report):
+        rows = self.results[0]['rows'] if self.results else 0
+        filename = results_filename(f'partitioning_{rows}', self.server_name)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+        print(f"Bolumleme sonuclari kaydedildi: {filename}")
+        return filename
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="kullanicilar tablosunun bolumlenmis kopyalarinda katalog benchmark'i")
+    parser.add_argument('--catalog', default=None, help="Is yuku katalog dosyasi (JSON/TOML/YAML)")
+    parser.add_argument('--server', default=None, help="Sunucu adi (varsayilan: katalogdaki ilk sunucu)")
+    parser.add_argument('--layouts', nargs='+', choices=LAYOUTS, default=list(LAYOUTS))
+    parser.add_argument('--partitions', type=int, default=8, help="range_id ve hash_id icin bolum sayisi")
+    parser.add_argument('--rows', type=int, default=None, help="Kaynaktan alinacak en fazla satir (id sirasiyla)")
+    parser.add_argument('--copies', type=int, default=1, help="Veriyi id kaydirarak katla (ornek: 10M x 10 = 100M)")
+    parser.add_argument('--warmup', type=int, default=None)
+    parser.add_argument('--repetitions', type=int, default=None)
+    parser.add_argument('--keep', action='store_true', help="Olusturulan tablolari silme")
+    parser.add_argument('--seed', type=int, default=None)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    catalog = WorkloadCatalog.load(args.catalog)
+    server = catalog.server(args.server) if args.server else catalog.servers[0]
+    benchmark = PartitionBenchmark(
+        catalog, server,
+        layouts=args.layouts,
+        partitions=args.partitions,
+        rows=args.rows,
+        copies=args.copies,
+        warmup=args.warmup,
+        repetitions=args.repetitions,
+        keep=args.keep,
+        seed=args.seed
+    )
+    benchmark.run()
+    benchmark.save_results(benchmark.report())
+
+if __name__ == "__main__":
+    main()
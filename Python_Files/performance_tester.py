@@ -1,24 +1,60 @@
 #!/usr/bin/env python3
-import psycopg2
+import os
 import time
 import json
+import argparse
+import resource
+import tracemalloc
 from datetime import datetime
+from connection_pool import ConnectionManager
+from latency_histogram import LatencyHistogram
+from benchmark_stats import summarize, compare_samples
+from pg_config import fetch_settings
+from plan_inspector import capture_plan, summarize_plan
+from results_store import DEFAULT_STORE_PATH, optional_store
+from server_metrics import sample_metrics
+from workload_catalog import WorkloadCatalog, server_connection_kwargs, results_filename
+
+DEFAULT_FETCH_SIZE = 1000
+
+def current_rss():
+    # Linux'ta anlik RSS /proc'tan okunur; diger sistemlerde surec boyunca gorulen en yuksek deger kullanilir
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
 
 class PerformanceTester:
-    def __init__(self, host, server_name):
+    def __init__(self, host, server_name, connection_mode='pool', pool_size=4, port=5432,
+                 database='testdb', user='pgtest', password='pgtest123', queries=None, explain=False,
+                 streaming=False, fetch_size=DEFAULT_FETCH_SIZE):
         self.connection_params = {
             'host': host,
-            'database': 'testdb',
-            'user': 'pgtest',
-            'password': 'pgtest123'
+            'port': port,
+            'database': database,
+            'user': user,
+            'password': password
         }
         self.server_name = server_name
+        self.queries = queries if queries is not None else WorkloadCatalog.load().benchmark_queries()
+        self.connections = ConnectionManager(self.connection_params, mode=connection_mode, max_size=pool_size)
         self.results = []
+        self.explain = explain
+        self.streaming = streaming
+        self.fetch_size = fetch_size
+        self.settings = {}
+        self.stream_counter = 0
     
-    def execute_query(self, query, description, params=None):
-        try:
-            conn = psycopg2.connect(**self.connection_params)
+    def run_query(self, query, params=None):
+        if callable(params):
+            params = params()
+        if self.streaming:
+            return self.stream_query(query, params)
+        with self.connections.connection() as conn:
+            connection_setup_time = self.connections.last_setup_time
             cur = conn.cursor()
+            rss_before = current_rss()
             
             start_time = time.perf_counter()
             
@@ -29,22 +65,182 @@ class PerformanceTester:
                 
             results = cur.fetchall()
             end_time = time.perf_counter()
+            peak_rss = current_rss()
+            cur.close()
+        
+        # fetchall'da ilk satir ancak tum sonuc istemciye geldiginde kullanilabilir
+        client = {
+            'time_to_first_row': end_time - start_time,
+            'peak_rss': peak_rss,
+            'rss_growth': max(peak_rss - rss_before, 0)
+        }
+        return end_time - start_time, len(results), connection_setup_time, client
+    
+    def stream_query(self, query, params=None):
+        # Isimli (sunucu tarafi) cursor ile sonuc fetch_size'lik parcalar halinde cekilir ve tutulmaz,
+        # boylece istemci bellegi sonuc boyutundan bagimsiz kalir
+        self.stream_counter += 1
+        with self.connections.connection() as conn:
+            connection_setup_time = self.connections.last_setup_time
+            cur = conn.cursor(name=f'perf_stream_{self.stream_counter}')
+            rss_before = current_rss()
+            peak_rss = rss_before
             
-            execution_time = end_time - start_time
+            start_time = time.perf_counter()
+            cur.execute(query, params or None)
+            # Ilk satir ayri bir fetchone ile alinir; ilk fetchmany parcasinin tamami beklenmez
+            first_row = cur.fetchone()
+            first_row_time = time.perf_counter() - start_time
+            row_count = 0 if first_row is None else 1
+            while first_row is not None:
+                rows = cur.fetchmany(self.fetch_size)
+                if not rows:
+                    break
+                row_count += len(rows)
+                peak_rss = max(peak_rss, current_rss())
+            end_time = time.perf_counter()
+            cur.close()
+        
+        client = {
+            'time_to_first_row': first_row_time,
+            'peak_rss': peak_rss,
+            'rss_growth': max(peak_rss - rss_before, 0),
+            'fetch_size': self.fetch_size
+        }
+        return end_time - start_time, row_count, connection_setup_time, client
+    
+    def allocation_peak(self, query, params=None):
+        # RSS, allocator'in onceki kosulardan tuttugu bellegi yeniden kullandiginda buyumeyi gostermez;
+        # tracemalloc sorgu sirasinda Python'un ayirdigi en yuksek bellegi dogrudan olcer. Ek yuku zamanlamayi
+        # bozacagi icin olcume dahil olmayan ayri bir calistirmada kullanilir
+        tracemalloc.start()
+        try:
+            self.run_query(query, params)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    
+    def print_client_metrics(self, client):
+        peak_alloc = f", tepe ayirma {client['peak_alloc'] / 1024 / 1024:.1f}MB" if 'peak_alloc' in client else ""
+        print(f"  {'Akis' if self.streaming else 'Tamponlu'}: ilk satir {client['time_to_first_row'] * 1000:.2f}ms, "
+              f"tepe RSS {client['peak_rss'] / 1024 / 1024:.1f}MB (+{client['rss_growth'] / 1024 / 1024:.1f}MB){peak_alloc}")
+    
+    def explain_query(self, query, params=None):
+        with self.connections.connection() as conn:
+            if not self.settings:
+                self.settings = fetch_settings(conn)
+            plan = capture_plan(conn, query, params)
+        return plan, summarize_plan(plan)
+    
+    def attach_plan(self, result, query, params):
+        try:
+            plan, plan_summary = self.explain_query(query, params)
+            result['plan'] = plan
+            result['plan_summary'] = plan_summary
+            print(f"  Plan: {plan_summary['nodes'][0].strip()}, "
+                  f"buffer hit/read {plan_summary['shared_hit_blocks']}/{plan_summary['shared_read_blocks']}, "
+                  f"planlama {plan_summary['planning_time_ms']:.2f}ms")
+        except Exception as e:
+            print(f"HATA - {self.server_name} - plan alinamadi: {e}")
+    
+    def execute_query(self, query, description, params=None):
+        try:
+            # Plan, zamanlanan sorguyla ayni parametrelerle alinir
+            params = params() if callable(params) else params
+            execution_time, row_count, connection_setup_time, client = self.run_query(query, params)
+            histogram = LatencyHistogram()
+            histogram.record(execution_time)
             
             result = {
                 'server': self.server_name,
                 'query': description,
                 'execution_time': execution_time,
-                'row_count': len(results),
+                'connection_setup_time': connection_setup_time,
+                'connection_mode': self.connections.mode,
+                'row_count': row_count,
+                'streaming': self.streaming,
+                'client': client,
+                'latency': histogram.summary(),
+                'latency_histogram': histogram.to_dict(),
                 'timestamp': datetime.now().isoformat()
             }
             
             self.results.append(result)
-            cur.close()
-            conn.close()
             
-            print(f"{self.server_name} - {description}: {execution_time:.3f}s ({len(results)} satir)")
+            print(f"{self.server_name} - {description}: {execution_time:.3f}s ({row_count} satir)")
+            self.print_client_metrics(client)
+            if self.explain:
+                self.attach_plan(result, query, params)
+            return result
+            
+        except Exception as e:
+            print(f"HATA - {self.server_name} - {description}: {e}")
+            return None
+    
+    def benchmark_query(self, query, description, params=None, warmup=2, repetitions=10):
+        if repetitions < 1 or warmup < 0:
+            print(f"HATA - {self.server_name} - {description}: tekrar en az 1, isinma en az 0 olmali "
+                  f"(tekrar: {repetitions}, isinma: {warmup})")
+            return None
+        try:
+            for _ in range(warmup):
+                self.run_query(query, params)
+            
+            samples = []
+            setup_times = []
+            first_row_samples = []
+            peak_rss = 0
+            rss_growth = 0
+            histogram = LatencyHistogram()
+            for _ in range(repetitions):
+                query_params = params() if callable(params) else params
+                execution_time, row_count, connection_setup_time, client = self.run_query(query, query_params)
+                samples.append(execution_time)
+                setup_times.append(connection_setup_time)
+                first_row_samples.append(client['time_to_first_row'])
+                peak_rss = max(peak_rss, client['peak_rss'])
+                rss_growth = max(rss_growth, client['rss_growth'])
+                histogram.record(execution_time)
+            
+            stats = summarize(samples)
+            client = {
+                'time_to_first_row': summarize(first_row_samples)['median'],
+                'time_to_first_row_samples': first_row_samples,
+                'peak_rss': peak_rss,
+                'rss_growth': rss_growth,
+                'peak_alloc': self.allocation_peak(query, query_params)
+            }
+            if self.streaming:
+                client['fetch_size'] = self.fetch_size
+            
+            result = {
+                'server': self.server_name,
+                'query': description,
+                'execution_time': stats['median'],
+                'connection_setup_time': sum(setup_times) / len(setup_times),
+                'connection_mode': self.connections.mode,
+                'row_count': row_count,
+                'warmup': warmup,
+                'repetitions': repetitions,
+                'stats': stats,
+                'samples': samples,
+                'streaming': self.streaming,
+                'client': client,
+                'latency': histogram.summary(),
+                'latency_histogram': histogram.to_dict(),
+                'timestamp': datetime.now().isoformat()
+            }
+            
+            self.results.append(result)
+            
+            print(f"{self.server_name} - {description}: medyan {stats['median']:.4f}s "
+                  f"(ort {stats['mean']:.4f}s, std {stats['stdev']:.4f}s, "
+                  f"%{stats['confidence'] * 100:.0f} GA [{stats['median_ci_low']:.4f}, {stats['median_ci_high']:.4f}], "
+                  f"n={repetitions})")
+            self.print_client_metrics(client)
+            if self.explain:
+                # Son tekrarin parametreleri kullanilir; EXPLAIN zamanlanan bir calistirmayla ayni degerleri gorur
+                self.attach_plan(result, query, query_params)
             return result
             
         except Exception as e:
@@ -54,63 +250,141 @@ class PerformanceTester:
     def run_tests(self):
         print(f"\n=== {self.server_name} Performans Testleri ===")
         
-        self.execute_query(
-            "SELECT * FROM kullanicilar WHERE id = %s;", 
-            "Belirli bir kullaniciyi id ile getirme", 
-            (500000,)
-        )
-        
-        self.execute_query(
-            "SELECT * FROM kullanicilar WHERE eposta LIKE %s LIMIT 1000;", 
-            "Belirli bir eposta ile arama", 
-            ('%gmail.com%',)
-        )
-        
-        self.execute_query(
-            "SELECT * FROM kullanicilar WHERE dogum_tarihi BETWEEN %s AND %s LIMIT 5000;", 
-            "dogum_tarihi araliginda filtreleme", 
-            ('1990-01-01', '2000-01-01')
-        )
-        
-        self.execute_query(
-            "SELECT surname, COUNT(*) as count FROM kullanicilar GROUP BY surname ORDER BY count DESC LIMIT 100;", 
-            "surname'e gore gruplama ve siralama", 
-            None
-        )
+        for query, description, params in self.queries:
+            self.execute_query(query, description, params)
         
         print(f"{self.server_name} testleri tamamlandi")
     
-    def save_results(self):
-        filename = f'performance_results_{self.server_name.lower().replace(" ", "_")}.json'
+    def run_benchmark_suite(self, warmup=2, repetitions=10):
+        print(f"\n=== {self.server_name} Benchmark Paketi (isinma: {warmup}, tekrar: {repetitions}) ===")
+        
+        for query, description, params in self.queries:
+            self.benchmark_query(query, description, params, warmup=warmup, repetitions=repetitions)
+        
+        print(f"{self.server_name} benchmark paketi tamamlandi")
+    
+    def save_results(self, store=None, workload=None):
+        filename = results_filename('performance_results', self.server_name)
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(self.results, f, indent=2, ensure_ascii=False)
         print(f"Sonuclar kaydedildi: {filename}")
+        if store is not None:
+            store.record_run('performance', self.server_name, self.results, self.connection_params,
+                             workload=workload, connection_mode=self.connections.mode)
+
+def compare_benchmarks(results_a, results_b, name_a='Server A', name_b='Server B'):
+    print(f"{'Test':<30} | {name_a + ' medyan':>15} | {name_b + ' medyan':>15} | Oran    | Fark %95 GA (ms)        | Anlamli")
+    print("-" * 110)
+    
+    comparisons = []
+    for test_a in results_a:
+        test_b = next((r for r in results_b if r['query'] == test_a['query']), None)
+        if test_b is None or 'samples' not in test_a or 'samples' not in test_b:
+            continue
+        
+        comparison = compare_samples(test_a['samples'], test_b['samples'])
+        comparison['query'] = test_a['query']
+        comparisons.append(comparison)
+        
+        if 'difference' not in comparison:
+            print(f"{test_a['query'][:30]:<30} | {comparison['reason']}")
+            continue
+        
+        interval = f"[{comparison['difference_ci_low'] * 1000:+.2f}, {comparison['difference_ci_high'] * 1000:+.2f}]"
+        verdict = "EVET" if comparison['significant'] else "HAYIR (gurultu)"
+        print(f"{test_a['query'][:30]:<30} | {comparison['baseline_median']:>13.4f}s | {comparison['candidate_median']:>13.4f}s | "
+              f"{comparison['ratio']:>6.2f}x | {interval:<23} | {verdict}")
+    
+    not_significant = [c['query'] for c in comparisons if not c['significant']]
+    if not_significant:
+        print(f"\nUyari: {len(not_significant)} testte fark istatistiksel olarak anlamli degil; "
+              f"bu testlere dayanarak konfigurasyon karari verilmemeli.")
+    return comparisons
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="PostgreSQL performans testleri")
+    parser.add_argument('--catalog', default=None, help="Is yuku katalog dosyasi (JSON/TOML/YAML)")
+    parser.add_argument('--connection-mode', choices=['pool', 'per_call'], default='pool')
+    parser.add_argument('--servers', nargs=2, metavar=('A', 'B'), default=None,
+                        help="Calistirilip karsilastirilacak sunucu adlari (varsayilan: katalogdaki ikinci ve ilk sunucu)")
+    parser.add_argument('--suite', action='store_true', help="Isinma ve tekrarli benchmark paketi calistir")
+    parser.add_argument('--warmup', type=int, default=None)
+    parser.add_argument('--repetitions', type=int, default=None)
+    parser.add_argument('--metrics', action='store_true', help="Testler sirasinda pg_stat_* metriklerini ornekle")
+    parser.add_argument('--metrics-interval', type=float, default=1.0)
+    parser.add_argument('--explain', action='store_true', help="Her sorgu icin EXPLAIN (ANALYZE, BUFFERS) planini kaydet")
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help="Kosularin eklendigi SQLite sonuc gecmisi")
+    parser.add_argument('--no-store', action='store_true', help="Sonuclari gecmise ekleme")
+    parser.add_argument('--stream', action='store_true',
+                        help="Sonuclari sunucu tarafi (isimli) cursor ve fetchmany ile parca parca cek")
+    parser.add_argument('--fetch-size', type=int, default=DEFAULT_FETCH_SIZE, help="Akis modunda fetchmany parca boyutu")
+    args = parser.parse_args()
+    if args.repetitions is not None and args.repetitions < 1:
+        parser.error("--repetitions en az 1 olmali")
+    if args.warmup is not None and args.warmup < 0:
+        parser.error("--warmup negatif olamaz")
+    return args
 
 def main():
+    args = parse_args()
+    catalog = WorkloadCatalog.load(args.catalog)
+    if args.servers:
+        try:
+            server_a, server_b = (catalog.server(name) for name in args.servers)
+        except KeyError as e:
+            print(f"HATA - {e}")
+            return
+        servers = [server_b, server_a]
+    else:
+        servers = catalog.servers
+    warmup = args.warmup if args.warmup is not None else catalog.benchmark['warmup']
+    repetitions = args.repetitions if args.repetitions is not None else catalog.benchmark['repetitions']
+    
     print("PostgreSQL Performans Testleri")
     print("=" * 50)
-    print("Test sirasi: Server B (Hatali) -> Server A (Optimum)")
+    print("Test sirasi: " + " -> ".join(server.get('label', server['name']) for server in servers))
     print("=" * 50)
     
-    print("\nServer B (Hatali Konfigürasyon) Testleri")
-    tester_b = PerformanceTester('10.0.2.15', 'Server_B')
-    tester_b.run_tests()
-    tester_b.save_results()
-    
-    time.sleep(3)
+    connection_mode = args.connection_mode
+    print(f"Baglanti modu: {connection_mode}")
+    if args.stream:
+        print(f"Sonuc modu: akis (sunucu tarafi cursor, fetch_size={args.fetch_size})")
     
-    print("\nServer A (Optimum Konfigürasyon) Testleri")
-    tester_a = PerformanceTester('localhost', 'Server_A')
-    tester_a.run_tests()
-    tester_a.save_results()
+    with optional_store(args.store, not args.no_store) as store:
+        for index, server in enumerate(servers):
+            if index > 0:
+                time.sleep(3)
+            print(f"\n{server.get('label', server['name'])} Testleri")
+            tester = PerformanceTester(
+                server_name=server['name'],
+                connection_mode=connection_mode,
+                queries=catalog.benchmark_queries(),
+                explain=args.explain,
+                streaming=args.stream,
+                fetch_size=args.fetch_size,
+                **server_connection_kwargs(server)
+            )
+            with sample_metrics(args.metrics, server_connection_kwargs(server), server['name'],
+                                args.metrics_interval, 'server_metrics_performance'):
+                if args.suite:
+                    tester.run_benchmark_suite(warmup=warmup, repetitions=repetitions)
+                else:
+                    tester.run_tests()
+            tester.save_results(store, workload=catalog.name)
     
     print("\nTum performans testleri tamamlandi")
     
+    if len(servers) < 2:
+        return
+    
+    # servers her zaman [referans (B), aday (A)] sirasindadir; --servers verilmezse katalog sirasi kullanilir
+    server_b, server_a = servers[0], servers[1]
+    
     print("\nPerformans Karsilastirmasi:")
     try:
-        with open('performance_results_server_a.json', 'r') as f:
+        with open(results_filename('performance_results', server_a['name']), 'r') as f:
             results_a = json.load(f)
-        with open('performance_results_server_b.json', 'r') as f:
+        with open(results_filename('performance_results', server_b['name']), 'r') as f:
             results_b = json.load(f)
         
         print("Test                               | Server A (s) | Server B (s) | Iyilestirme")
@@ -136,6 +410,10 @@ def main():
         else:
             print(f"\nSonuc: Server B, Server A'dan {1/overall:.1f} kat daha hizli")
         
+        if args.suite:
+            print("\nIstatistiksel Karsilastirma (medyan farki, bootstrap):")
+            compare_benchmarks(results_a, results_b)
+        
     except Exception as e:
         print(f"Karsilastirma hatasi: {e}")
 
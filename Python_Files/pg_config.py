@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+import os
+import re
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+TUNING_SETTINGS = (
+    'shared_buffers',
+    'work_mem',
+    'hash_mem_multiplier',
+    'maintenance_work_mem',
+    'effective_cache_size',
+    'wal_buffers',
+    'max_wal_size',
+    'max_connections',
+    'max_parallel_workers_per_gather',
+    'max_parallel_workers',
+    'random_page_cost',
+    'effective_io_concurrency',
+    'jit'
+)
+
+SIZE_UNITS = {
+    'B': 1,
+    'kB': 1024,
+    'MB': 1024 ** 2,
+    'GB': 1024 ** 3,
+    'TB': 1024 ** 4
+}
+
+_SETTING_LINE = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_.]*)\s*=?\s*('(?:[^']|'')*'|[^#\s]+)")
+
+def resolve_path(path):
+    return path if os.path.isabs(path) else os.path.join(REPO_ROOT, path)
+
+def read_conf(path):
+    settings = {}
+    with open(resolve_path(path), 'r', encoding='utf-8') as f:
+        for line in f:
+            match = _SETTING_LINE.match(line)
+            if not match:
+                continue
+            name, value = match.group(1), match.group(2)
+            if value.startswith("'") and value.endswith("'"):
+                value = value[1:-1].replace("''", "'")
+            settings[name] = value
+    return settings
+
+def parse_size(value, default_unit='kB'):
+    match = re.fullmatch(r"\s*(-?\d+(?:\.\d+)?)\s*([kMGT]?B)?\s*", str(value))
+    if not match:
+        return None
+    number = float(match.group(1))
+    unit = match.group(2) or default_unit
+    return int(number * SIZE_UNITS[unit])
+
+def fetch_settings(conn, names=TUNING_SETTINGS):
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT name, current_setting(name) FROM pg_settings WHERE name = ANY(%s)",
+        (list(names),)
+    )
+    settings = dict(cur.fetchall())
+    cur.close()
+    return settings
+
+def setting_differences(settings_a, settings_b, names=TUNING_SETTINGS):
+    differences = {}
+    for name in names:
+        value_a = settings_a.get(name)
+        value_b = settings_b.get(name)
+        if value_a != value_b:
+            differences[name] = (value_a, value_b)
+    return differences
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+import argparse
+import json
+from pg_config import read_conf, setting_differences
+from workload_catalog import WorkloadCatalog, server_connection_kwargs, results_filename
+
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+MISESTIMATE_FACTOR = 10
+
+def capture_plan(conn, query, params=None):
+    cur = conn.cursor()
+    cur.execute(EXPLAIN_PREFIX + query.rstrip().rstrip(';'), params)
+    plan = cur.fetchone()[0]
+    cur.close()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+def walk_nodes(node, depth=0, limited=False):
+    # Limit altindaki dugumler erken durdugu icin gercek satir sayilari tahminle karsilastirilamaz
+    yield node, depth, limited
+    limited = limited or node['Node Type'] == 'Limit'
+    for child in node.get('Plans', []):
+        yield from walk_nodes(child, depth + 1, limited)
+
+def node_label(node):
+    label = node['Node Type']
+    if node.get('Relation Name'):
+        label += f" on {node['Relation Name']}"
+    if node.get('Index Name'):
+        label += f" using {node['Index Name']}"
+    return label
+
+def summarize_plan(plan):
+    root = plan['Plan']
+    nodes = []
+    spills = []
+    misestimates = []
+    workers_planned = 0
+    workers_launched = 0
+
+    for node, depth, limited in walk_nodes(root):
+        label = node_label(node)
+        nodes.append(('  ' * depth) + label)
+
+        if node.get('Sort Space Type') == 'Disk':
+            spills.append(f"{label}: {node.get('Sort Method')} ({node.get('Sort Space Used')} kB disk)")
+        if node.get('Hash Batches', 1) > 1:
+            spills.append(f"{label}: {node['Hash Batches']} hash batch "
+                          f"(bellek {node.get('Peak Memory Usage')} kB)")
+        if node.get('Temp Written Blocks', 0) > 0 and node is root:
+            spills.append(f"Toplam gecici yazim: {node['Temp Written Blocks']} blok")
+
+        workers_planned += node.get('Workers Planned', 0)
+        workers_launched += node.get('Workers Launched', 0)
+
+        if limited or node['Node Type'] == 'Limit':
+            continue
+        loops = max(1, node.get('Actual Loops', 1))
+        plan_rows = node.get('Plan Rows', 0) * loops
+        actual_rows = node.get('Actual Rows', 0) * loops
+        low, high = sorted((max(plan_rows, 1), max(actual_rows, 1)))
+        if high / low >= MISESTIMATE_FACTOR:
+            misestimates.append({
+                'node': label,
+                'plan_rows': plan_rows,
+                'actual_rows': actual_rows,
+                'factor': high / low
+            })
+
+    shared_hit = root.get('Shared Hit Blocks', 0)
+    shared_read = root.get('Shared Read Blocks', 0)
+    total_blocks = shared_hit + shared_read
+
+    return {
+        'nodes': nodes,
+        'node_types': [node['Node Type'] for node, _, _ in walk_nodes(root)],
+        'planning_time_ms': plan.get('Planning Time', 0.0),
+        'execution_time_ms': plan.get('Execution Time', 0.0),
+        'shared_hit_blocks': shared_hit,
+        'shared_read_blocks': shared_read,
+        'cache_hit_ratio': shared_hit / total_blocks if total_blocks else 1.0,
+        'temp_read_blocks': root.get('Temp Read Blocks', 0),
+        'temp_written_blocks': root.get('Temp Written Blocks', 0),
+        'spills': spills,
+        'misestimates': misestimates,
+        'workers_planned': workers_planned,
+        'workers_launched': workers_launched
+    }
+
+def diff_plans(summary_a, summary_b, settings_a=None, settings_b=None):
+    settings_a = settings_a or {}
+    settings_b = settings_b or {}
+    differences = setting_differences(settings_a, settings_b)
+
+    def setting_note(*names):
+        notes = [f"{name} A={differences[name][0]} B={differences[name][1]}" for name in names if name in differences]
+        return f" -> {', '.join(notes)}" if notes else ""
+
+    hints = []
+    if summary_a['node_types'] != summary_b['node_types']:
+        hints.append("Plan yapisi farkli" +
+                     setting_note('effective_cache_size', 'random_page_cost', 'work_mem', 'max_parallel_workers_per_gather'))
+    if summary_b['shared_read_blocks'] > 2 * max(summary_a['shared_read_blocks'], 1):
+        hints.append(f"B diskten/OS onbellekten daha fazla blok okuyor "
+                     f"({summary_a['shared_read_blocks']} vs {summary_b['shared_read_blocks']})" +
+                     setting_note('shared_buffers'))
+    elif summary_a['shared_read_blocks'] > 2 * max(summary_b['shared_read_blocks'], 1):
+        hints.append(f"A diskten/OS onbellekten daha fazla blok okuyor "
+                     f"({summary_a['shared_read_blocks']} vs {summary_b['shared_read_blocks']})" +
+                     setting_note('shared_buffers'))
+    if bool(summary_a['spills']) != bool(summary_b['spills']):
+        spilling = 'B' if summary_b['spills'] else 'A'
+        hints.append(f"Yalnizca {spilling} diske tasiyor" + setting_note('work_mem', 'hash_mem_multiplier'))
+    if summary_a['workers_launched'] != summary_b['workers_launched']:
+        hints.append(f"Paralel worker sayisi farkli ({summary_a['workers_launched']} vs {summary_b['workers_launched']})" +
+                     setting_note('max_parallel_workers_per_gather', 'max_parallel_workers'))
+    if summary_a['misestimates'] or summary_b['misestimates']:
+        hints.append("Tahmini/gercek satir sayisi uyusmazligi var; istatistikler icin ANALYZE calistirilmali")
+
+    return {
+        'same_structure': summary_a['node_types'] == summary_b['node_types'],
+        'nodes_a': summary_a['nodes'],
+        'nodes_b': summary_b['nodes'],
+        'planning_time_ms': (summary_a['planning_time_ms'], summary_b['planning_time_ms']),
+        'execution_time_ms': (summary_a['execution_time_ms'], summary_b['execution_time_ms']),
+        'shared_hit_blocks': (summary_a['shared_hit_blocks'], summary_b['shared_hit_blocks']),
+        'shared_read_blocks': (summary_a['shared_read_blocks'], summary_b['shared_read_blocks']),
+        'cache_hit_ratio': (summary_a['cache_hit_ratio'], summary_b['cache_hit_ratio']),
+        'temp_written_blocks': (summary_a['temp_written_blocks'], summary_b['temp_written_blocks']),
+        'spills': (summary_a['spills'], summary_b['spills']),
+        'misestimates': (summary_a['misestimates'], summary_b['misestimates']),
+        'setting_differences': differences,
+        'hints': hints
+    }
+
+def print_plan_diff(description, diff):
+    print(f"\n--- {description} ---")
+    print(f"{'':<24} | {'A':>14} | {'B':>14}")
+    for key, label in [('execution_time_ms', 'Calisma (ms)'), ('planning_time_ms', 'Planlama (ms)'),
+                       ('shared_hit_blocks', 'Buffer hit'), ('shared_read_blocks', 'Buffer read'),
+                       ('cache_hit_ratio', 'Onbellek isabeti'), ('temp_written_blocks', 'Gecici yazim')]:
+        value_a, value_b = diff[key]
+        if isinstance(value_a, float):
+            print(f"{label:<24} | {value_a:>14.3f} | {value_b:>14.3f}")
+        else:
+            print(f"{label:<24} | {value_a:>14} | {value_b:>14}")
+    if not diff['same_structure']:
+        print("Plan A:")
+        for line in diff['nodes_a']:
+            print(f"  {line}")
+        print("Plan B:")
+        for line in diff['nodes_b']:
+            print(f"  {line}")
+    for spill in diff['spills'][0]:
+        print(f"  A tasma: {spill}")
+    for spill in diff['spills'][1]:
+        print(f"  B tasma: {spill}")
+    for hint in diff['hints']:
+        print(f"  * {hint}")
+
+def compare_plan_results(results_a, results_b, settings_a, settings_b):
+    diffs = []
+    for result_a in results_a:
+        result_b = next((r for r in results_b if r['query'] == result_a['query']), None)
+        if result_b is None or 'plan_summary' not in result_a or 'plan_summary' not in result_b:
+            continue
+        diff = diff_plans(result_a['plan_summary'], result_b['plan_summary'], settings_a, settings_b)
+        diff['query'] = result_a['query']
+        print_plan_diff(result_a['query'], diff)
+        diffs.append(diff)
+    return diffs
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="EXPLAIN (ANALYZE, BUFFERS) plan yakalama ve karsilastirma")
+    parser.add_argument('--catalog', default=None, help="Is yuku katalog dosyasi (JSON/TOML/YAML)")
+    parser.add_argument('--servers', nargs=2, metavar=('A', 'B'), default=None,
+                        help="Karsilastirilacak sunucu adlari (varsayilan: katalogdaki ikinci ve ilk sunucu)")
+    return parser.parse_args()
+
+def main():
+    from performance_tester import PerformanceTester
+    args = parse_args()
+    catalog = WorkloadCatalog.load(args.catalog)
+    if args.servers:
+        server_a, server_b = (catalog.server(name) for name in args.servers)
+    else:
+        server_b, server_a = catalog.servers[0], catalog.servers[1]
+
+    print("PostgreSQL Plan Karsilastirmasi (EXPLAIN ANALYZE, BUFFERS)")
+    print("=" * 50)
+
+    testers = []
+    for server in (server_a, server_b):
+        tester = PerformanceTester(
+            server_name=server['name'],
+            queries=catalog.benchmark_queries(),
+            explain=True,
+            **server_connection_kwargs(server)
+        )
+        tester.run_tests()
+        filename = results_filename('plan_results', server['name'])
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump({'settings': tester.settings, 'results': tester.results}, f, indent=2, ensure_ascii=False)
+        print(f"Planlar kaydedildi: {filename}")
+        testers.append(tester)
+
+    tester_a, tester_b = testers
+    print(f"\nA = {server_a['name']}, B = {server_b['name']}")
+    differences = setting_differences(tester_a.settings, tester_b.settings)
+    if differences:
+        print("Canli ayar farklari:")
+        for name, (value_a, value_b) in differences.items():
+            print(f"  {name:<32} A={str(value_a):<10} B={value_b}")
+
+    for server in (server_a, server_b):
+        if server.get('config_file'):
+            conf = read_conf(server['config_file'])
+            active = {name: conf[name] for name in ('shared_buffers', 'work_mem', 'effective_cache_size', 'wal_buffers')
+                      if name in conf}
+            print(f"{server['name']} ({server['config_file']}) dosyada etkin ayarlar: {active}")
+
+    compare_plan_results(tester_a.results, tester_b.results, tester_a.settings, tester_b.settings)
+
+if __name__ == "__main__":
+    main()
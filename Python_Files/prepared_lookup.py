@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+import threading
+import time
+import weakref
+from workload_catalog import to_asyncpg_sql
+
+PREPARED_NAME = 'kullanici_lookup'
+
+class PreparedLookup:
+    # psycopg2 yalnizca metin sonuc formatini destekler; burada kazanc sunucu tarafinda
+    # parse/plan adimlarinin atlanmasindan gelir, ikili cozumleme asyncpg tarafinda olculur
+    def __init__(self, sql, name=PREPARED_NAME):
+        self.sql = sql
+        self.name = name
+        self.param_count = sql.count('%s')
+        self.execute_sql = f"EXECUTE {name} ({', '.join(['%s'] * self.param_count)})" if self.param_count else f"EXECUTE {name}"
+        self.prepared = weakref.WeakSet()
+        self.prepare_times = []
+        self.lock = threading.Lock()
+
+    def ensure_prepared(self, conn):
+        # PREPARE oturum seviyesindedir ve rollback ile silinmez; baglanti nesnesi ile takip edilir.
+        # Backend pid'i yeniden kullanilabildigi icin anahtar olarak guvenilir degildir
+        with self.lock:
+            if conn in self.prepared:
+                return 0.0
+        start_time = time.perf_counter()
+        cur = conn.cursor()
+        cur.execute(f"PREPARE {self.name} AS {to_asyncpg_sql(self.sql)}")
+        cur.close()
+        prepare_time = time.perf_counter() - start_time
+        with self.lock:
+            self.prepared.add(conn)
+            self.prepare_times.append(prepare_time)
+        return prepare_time
+
+    def fetchone(self, conn, params):
+        self.ensure_prepared(conn)
+        cur = conn.cursor()
+        start_time = time.perf_counter()
+        cur.execute(self.execute_sql, params)
+        result = cur.fetchone()
+        exec_time = time.perf_counter() - start_time
+        cur.close()
+        return exec_time, result
+
+    def plan_counts(self, conn):
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT generic_plans, custom_plans FROM pg_prepared_statements WHERE name = %s", (self.name,))
+            row = cur.fetchone()
+        except Exception:
+            conn.rollback()
+            row = None
+        cur.close()
+        return {'generic_plans': row[0], 'custom_plans': row[1]} if row else {}
+
+    def prepare_stats(self):
+        with self.lock:
+            times = list(self.prepare_times)
+        return {
+            'connections_prepared': len(times),
+            'total_prepare_time': sum(times),
+            'avg_prepare_time': sum(times) / len(times) if times else 0.0
+        }
+
+class AsyncPreparedLookup:
+    # asyncpg PreparedStatement'i havuzdan alinan baglantiya baglidir; baglanti havuza donunce
+    # gecersiz olur, bu yuzden her worker baglantisini test boyunca tutar ve bir kez hazirlar
+    def __init__(self, sql):
+        self.sql = to_asyncpg_sql(sql)
+        self.prepare_times = []
+
+    async def prepare(self, conn):
+        start_time = time.perf_counter()
+        statement = await conn.prepare(self.sql)
+        self.prepare_times.append(time.perf_counter() - start_time)
+        return statement
+
+    async def fetchrow(self, statement, *params):
+        start_time = time.perf_counter()
+        result = await statement.fetchrow(*params)
+        return time.perf_counter() - start_time, result
+
+    def prepare_stats(self):
+        times = self.prepare_times
+        return {
+            'connections_prepared': len(times),
+            'total_prepare_time': sum(times),
+            'avg_prepare_time': sum(times) / len(times) if times else 0.0
+        }
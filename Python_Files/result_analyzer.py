@@ -1,7 +1,84 @@
 #!/usr/bin/env python3
+import argparse
 import json
+import os
 import matplotlib.pyplot as plt
 import numpy as np
+from latency_histogram import LatencyHistogram
+from results_store import result_key
+from workload_catalog import WorkloadCatalog, results_filename
+
+PERCENTILE_POINTS = np.array([50, 75, 90, 95, 99, 99.5, 99.9, 99.95, 99.99])
+SERVER_LINE_STYLES = ('-', '--', ':', '-.')
+
+def iter_json_records(path, chunk_size=1 << 20):
+    # Buyuk sonuc dosyalari bellege tamamen alinmadan, ust seviye dizinin elemanlari tek tek okunur
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size).lstrip()
+        if not buffer.startswith('['):
+            data = json.loads(buffer + f.read())
+            yield from (data.get('results', []) if isinstance(data, dict) else [data])
+            return
+        buffer = buffer[1:]
+        eof = False
+        while True:
+            buffer = buffer.lstrip()
+            if buffer.startswith(','):
+                buffer = buffer[1:].lstrip()
+            if buffer.startswith(']'):
+                return
+            try:
+                record, end = decoder.raw_decode(buffer)
+                rest = buffer[end:].lstrip()
+                # Parca sinirinda kesilen bir sayi ("23" + "456") gecerli gorunur; deger ancak
+                # ardindan ',' ya da ']' geliyorsa (veya dosya bittiyse) kabul edilir
+                if rest[:1] not in (',', ']') and (rest or not eof):
+                    raise json.JSONDecodeError("',' veya ']' bekleniyordu", buffer, end)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer += chunk
+                continue
+            yield record
+            buffer = buffer[end:]
+
+def histogram_arrays(data):
+    histogram = LatencyHistogram.from_dict(data)
+    if not histogram.count:
+        return np.array([]), np.array([])
+    values, counts = zip(*histogram.bucket_values())
+    return np.array(values), np.array(counts, dtype=np.float64)
+
+def latency_cdf(data):
+    values, counts = histogram_arrays(data)
+    if not counts.size:
+        return values, counts
+    return values * 1000, np.cumsum(counts) / counts.sum()
+
+def histogram_percentiles(data, percentiles=PERCENTILE_POINTS):
+    values, counts = histogram_arrays(data)
+    if not counts.size:
+        return np.zeros(len(percentiles))
+    cumulative = np.cumsum(counts)
+    indexes = np.searchsorted(cumulative, np.ceil(percentiles / 100 * cumulative[-1]))
+    return values[np.minimum(indexes, len(values) - 1)] * 1000
+
+def nines(percentiles):
+    # 90 -> 1, 99 -> 2, 99.9 -> 3: kuyruk yuzdelikleri esit aralikli gosterilir
+    return -np.log10(1 - np.asarray(percentiles) / 100)
+
+def server_files(servers, prefix):
+    files = []
+    for index, (name, label) in enumerate(servers):
+        filename = results_filename(prefix, name)
+        if os.path.exists(filename):
+            files.append((label, SERVER_LINE_STYLES[index % len(SERVER_LINE_STYLES)], filename))
+        else:
+            print(f"{filename} bulunamadi, atlandi")
+    return files
 
 def create_performance_chart():
     try:
@@ -56,7 +133,7 @@ def create_parallel_chart():
         with open('parallel_results_server_b.json', 'r') as f:
             results_b = json.load(f)
         
-        test_types = ['Sirali', 'Paralel_Threading', 'Paralel_Asyncio']
+        test_types = ['Sirali', 'Paralel_Threading', 'Paralel_Asyncio', 'Paralel_Multiprocessing']
         server_a_times = []
         server_b_times = []
         
@@ -104,10 +181,130 @@ def create_parallel_chart():
     except Exception as e:
         print(f"Paralel grafigi hatasi: {e}")
 
+def create_latency_distribution_chart(servers, prefix='parallel_results', output='latency_distribution.png'):
+    try:
+        files = server_files(servers, prefix)
+        if not files:
+            return
+        fig, (ax_cdf, ax_pct) = plt.subplots(1, 2, figsize=(16, 7))
+        for label, style, filename in files:
+            for result in iter_json_records(filename):
+                if not result.get('latency_histogram', {}).get('count'):
+                    continue
+                name = f"{label} - {result_key(result)}"
+                values, cdf = latency_cdf(result['latency_histogram'])
+                line, = ax_cdf.step(values, cdf, where='post', linestyle=style, label=name)
+                ax_pct.plot(nines(PERCENTILE_POINTS), histogram_percentiles(result['latency_histogram']),
+                            marker='o', markersize=3, linestyle=style, color=line.get_color(), label=name)
+        
+        ax_cdf.set_xscale('log')
+        ax_cdf.set_xlabel('Gecikme (ms, log)')
+        ax_cdf.set_ylabel('Kumulatif oran')
+        ax_cdf.set_title('Gecikme CDF')
+        ax_cdf.grid(True, alpha=0.3, which='both')
+        
+        ax_pct.set_yscale('log')
+        ax_pct.set_xticks(nines(PERCENTILE_POINTS))
+        ax_pct.set_xticklabels([f"p{p:g}" for p in PERCENTILE_POINTS], rotation=45)
+        ax_pct.set_ylabel('Gecikme (ms, log)')
+        ax_pct.set_title('Yuzdelik Gecikmeler (kuyruk)')
+        ax_pct.grid(True, alpha=0.3, which='both')
+        ax_pct.legend(fontsize=7, loc='upper left')
+        
+        plt.tight_layout()
+        plt.savefig(output, dpi=200, bbox_inches='tight')
+        plt.close(fig)
+        print(f"Gecikme dagilimi grafigi olusturuldu: {output}")
+        
+    except Exception as e:
+        print(f"Gecikme dagilimi grafigi hatasi: {e}")
+
+def create_timeline_chart(servers, output='load_timeline.png'):
+    try:
+        files = server_files(servers, 'load_results')
+        if not files:
+            return
+        fig, (ax_tp, ax_lat) = plt.subplots(2, 1, figsize=(14, 9), sharex=True)
+        for label, style, filename in files:
+            for result in iter_json_records(filename):
+                points = result.get('timeline', {}).get('points')
+                if not points:
+                    continue
+                name = f"{label} - {result['concurrency']} istemci"
+                times = np.array([point['t'] for point in points])
+                line, = ax_tp.plot(times, [point['throughput'] for point in points], linestyle=style, label=name)
+                p99 = np.array([point.get('p99', np.nan) for point in points]) * 1000
+                ax_lat.plot(times, p99, linestyle=style, color=line.get_color(), label=name)
+        
+        ax_tp.set_ylabel('Sorgu/sn')
+        ax_tp.set_title('Zamana Gore Throughput ve p99 Gecikme (eszamanlilik seviyesi basina)')
+        ax_tp.grid(True, alpha=0.3)
+        ax_tp.legend(fontsize=7, ncol=2)
+        ax_lat.set_yscale('log')
+        ax_lat.set_xlabel('Zaman (s)')
+        ax_lat.set_ylabel('p99 (ms, log)')
+        ax_lat.grid(True, alpha=0.3, which='both')
+        
+        plt.tight_layout()
+        plt.savefig(output, dpi=200, bbox_inches='tight')
+        plt.close(fig)
+        print(f"Zaman serisi grafigi olusturuldu: {output}")
+        
+    except Exception as e:
+        print(f"Zaman serisi grafigi hatasi: {e}")
+
+def create_scaling_chart(servers, output='scaling_curves.png'):
+    try:
+        files = server_files(servers, 'scaling_results')
+        if not files:
+            return
+        fig, ax = plt.subplots(figsize=(11, 7))
+        colors = {'Sirali': 'gray', 'Paralel_Threading': 'tab:blue', 'Paralel_Asyncio': 'tab:orange'}
+        for label, style, filename in files:
+            curves = {}
+            for result in iter_json_records(filename):
+                throughput = result['query_count'] / result['total_time'] if result['total_time'] > 0 else 0
+                curves.setdefault(result['test_type'], []).append((result.get('workers', 1), throughput))
+            for test_type, points in curves.items():
+                workers, throughput = zip(*sorted(points))
+                if test_type == 'Sirali':
+                    ax.axhline(throughput[0], linestyle=style, color=colors['Sirali'], label=f"{label} - Sirali")
+                    continue
+                ax.plot(workers, throughput, marker='o', linestyle=style, color=colors.get(test_type),
+                        label=f"{label} - {test_type}")
+        
+        ax.set_xscale('log', base=2)
+        ax.set_xlabel('Worker sayisi (log2)')
+        ax.set_ylabel('Throughput (ID/sn)')
+        ax.set_title('Olcekleme Egrileri: Throughput vs Worker')
+        ax.grid(True, alpha=0.3, which='both')
+        ax.legend(fontsize=8)
+        
+        plt.tight_layout()
+        plt.savefig(output, dpi=200, bbox_inches='tight')
+        plt.close(fig)
+        print(f"Olcekleme grafigi olusturuldu: {output}")
+        
+    except Exception as e:
+        print(f"Olcekleme grafigi hatasi: {e}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sonuc dosyalarindan grafik uret")
+    parser.add_argument('--catalog', default=None, help="Is yuku katalog dosyasi (JSON/TOML/YAML)")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    catalog = WorkloadCatalog.load(args.catalog)
+    servers = [(server['name'], server.get('label', server['name'])) for server in catalog.servers]
+    
     print("Grafikleri olusturuyor...")
     create_performance_chart()
     create_parallel_chart()
+    create_latency_distribution_chart(servers)
+    create_latency_distribution_chart(servers, prefix='load_results', output='load_latency_distribution.png')
+    create_timeline_chart(servers)
+    create_scaling_chart(servers)
     print("Tum grafikler tamamlandi!")
 
 if __name__ == "__main__":
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import json
+import sqlite3
+import subprocess
+import sys
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+import psycopg2
+from benchmark_stats import compare_samples
+from latency_histogram import LatencyHistogram
+from pg_config import REPO_ROOT, fetch_settings
+
+DEFAULT_STORE_PATH = 'benchmark_history.sqlite'
+HISTOGRAM_SAMPLE_LIMIT = 1000
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    server TEXT NOT NULL,
+    workload TEXT,
+    git_rev TEXT,
+    config_hash TEXT,
+    settings TEXT,
+    connection_mode TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    key TEXT NOT NULL,
+    median_latency REAL,
+    throughput REAL,
+    latency_samples TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (run_id, key)
+);
+CREATE INDEX IF NOT EXISTS runs_lookup ON runs (kind, server, created_at);
+"""
+
+def git_revision():
+    try:
+        rev = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return f"{rev}-dirty" if dirty else rev
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def server_settings(connection_params):
+    try:
+        conn = psycopg2.connect(**connection_params)
+        settings = fetch_settings(conn)
+        conn.close()
+        return settings
+    except Exception as e:
+        print(f"Uyari: sunucu ayarlari okunamadi, config hash bos birakildi: {e}")
+        return {}
+
+def config_hash(settings):
+    if not settings:
+        return None
+    return hashlib.sha1(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+def result_key(result):
+    if 'query' in result:
+        return result['query']
+    key = result.get('test_type', 'bilinmeyen')
+    for name in ('workload', 'concurrency_model', 'concurrency', 'workers', 'max_batch_size', 'target_rate',
+                 'cache_capacity'):
+        if result.get(name) is not None:
+            key += f"[{name}={result[name]}]"
+    return key
+
+def result_throughput(result):
+    if 'throughput' in result:
+        return result['throughput']
+    if result.get('query_count') and result.get('total_time'):
+        return result['query_count'] / result['total_time']
+    return None
+
+def histogram_samples(data, limit=HISTOGRAM_SAMPLE_LIMIT):
+    # Histogram kovalari en fazla limit kadar ornege olceklenir; gercek n daha buyukse
+    # bootstrap araligi genisler, yani regresyon karari temkinli tarafta kalir
+    histogram = LatencyHistogram.from_dict(data)
+    if not histogram.count:
+        return []
+    scale = min(1.0, limit / histogram.count)
+    samples = []
+    for value, count in histogram.bucket_values():
+        samples.extend([value] * max(1, round(count * scale)))
+    return samples
+
+def latency_samples(result):
+    if result.get('samples'):
+        return result['samples']
+    if result.get('latency_histogram'):
+        return histogram_samples(result['latency_histogram'])
+    return []
+
+class ResultsStore:
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA_SQL)
+
+    def record_run(self, kind, server_name, results, connection_params=None, workload=None, connection_mode=None):
+        settings = server_settings(connection_params) if connection_params else {}
+        run_id = f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, datetime.now().isoformat(), kind, server_name, workload, git_revision(),
+                 config_hash(settings), json.dumps(settings, sort_keys=True), connection_mode)
+            )
+            for result in results:
+                samples = latency_samples(result)
+                median = result.get('execution_time')
+                if median is None and result.get('latency'):
+                    median = result['latency'].get('p50')
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                    (run_id, result_key(result), median, result_throughput(result),
+                     json.dumps(samples), json.dumps(result, ensure_ascii=False))
+                )
+        print(f"Sonuclar gecmise eklendi: {run_id} ({self.path})")
+        return run_id
+
+    def runs(self, kind=None, server=None, limit=20):
+        query = "SELECT r.*, COUNT(s.key) AS result_count FROM runs r LEFT JOIN results s USING (run_id)"
+        conditions, params = [], []
+        if kind:
+            conditions.append("r.kind = ?")
+            params.append(kind)
+        if server:
+            conditions.append("r.server = ?")
+            params.append(server)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " GROUP BY r.run_id ORDER BY r.created_at DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self.conn.execute(query, params)]
+
+    def run(self, run_id):
+        row = self.conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Kosu bulunamadi: {run_id}")
+        return dict(row)
+
+    def latest_run(self, kind, server, exclude=(), after=None):
+        # Aday, referanstan sonra kaydedilmis olmali; daha eski bir kosu "regresyon" yonunu tersine cevirir
+        for run in self.runs(kind=kind, server=server, limit=len(exclude) + 1):
+            if run['run_id'] not in exclude and (after is None or run['created_at'] > after):
+                return run
+        return None
+
+    def results(self, run_ids):
+        grouped = {}
+        placeholders = ", ".join("?" * len(run_ids))
+        for row in self.conn.execute(f"SELECT * FROM results WHERE run_id IN ({placeholders})", list(run_ids)):
+            entry = grouped.setdefault(row['key'], {'samples': [], 'throughputs': []})
+            entry['samples'].extend(json.loads(row['latency_samples']))
+            if row['throughput'] is not None:
+                entry['throughputs'].append(row['throughput'])
+        return grouped
+
+    def compare(self, baseline_ids, candidate_ids):
+        baseline = self.results(baseline_ids)
+        candidate = self.results(candidate_ids)
+        comparisons = []
+        for key in baseline:
+            if key not in candidate:
+                continue
+            entry = {'key': key, 'latency': compare_samples(baseline[key]['samples'], candidate[key]['samples'])}
+            base_tp, cand_tp = baseline[key]['throughputs'], candidate[key]['throughputs']
+            if base_tp and cand_tp:
+                # Kosu basina tek throughput degeri var; anlamlilik icin her tarafta en az iki kosu gerekir
+                entry['throughput'] = compare_samples(base_tp, cand_tp)
+                entry['throughput'].setdefault('ratio', (sum(cand_tp) / len(cand_tp)) / (sum(base_tp) / len(base_tp)))
+            latency = entry['latency']
+            throughput = entry.get('throughput', {})
+            entry['latency_regression'] = latency.get('significant', False) and latency['difference'] > 0
+            entry['throughput_regression'] = throughput.get('significant', False) and throughput['difference'] < 0
+            entry['improvement'] = ((latency.get('significant', False) and latency['difference'] < 0) or
+                                    (throughput.get('significant', False) and throughput['difference'] > 0))
+            comparisons.append(entry)
+        return comparisons
+
+    def close(self):
+        self.conn.close()
+
+@contextmanager
+def optional_store(path=DEFAULT_STORE_PATH, enabled=True):
+    # Komut satiri calistirmasi basina tek depo acilir ve her durumda kapatilir; --no-store ile None verilir
+    store = ResultsStore(path) if enabled else None
+    try:
+        yield store
+    finally:
+        if store is not None:
+            store.close()
+
+def print_runs(runs):
+    print(f"{'Kosu':<23} | {'Tur':<12} | {'Sunucu':<12} | {'Is yuku':<24} | {'Git':<14} | {'Config':<12} | Sonuc")
+    print("-" * 118)
+    for run in runs:
+        print(f"{run['run_id']:<23} | {run['kind']:<12} | {run['server']:<12} | {(run['workload'] or '-')[:24]:<24} | "
+              f"{run['git_rev'] or '-':<14} | {run['config_hash'] or '-':<12} | {run['result_count']}")
+
+def print_comparison(comparisons):
+    print(f"{'Test':<40} | Gecikme oran | Gecikme fark %95 GA (ms) | Throughput oran | Durum")
+    print("-" * 118)
+    for entry in comparisons:
+        latency = entry['latency']
+        throughput = entry.get('throughput', {})
+        if 'difference' in latency:
+            latency_ratio = f"{latency['ratio']:>11.2f}x"
+            interval = f"[{latency['difference_ci_low'] * 1000:+.3f}, {latency['difference_ci_high'] * 1000:+.3f}]"
+        else:
+            latency_ratio, interval = f"{'-':>12}", latency.get('reason', '-')
+        throughput_ratio = f"{throughput['ratio']:>14.2f}x" if throughput.get('ratio') else f"{'-':>15}"
+        if entry['latency_regression'] or entry['throughput_regression']:
+            status = "REGRESYON"
+        elif entry['improvement']:
+            status = "iyilesme"
+        else:
+            status = "fark yok"
+        print(f"{entry['key'][:40]:<40} | {latency_ratio} | {interval:<24} | {throughput_ratio} | {status}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark sonuc gecmisi ve regresyon tespiti")
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help="SQLite sonuc deposu")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    list_parser = subparsers.add_parser('list', help="Kayitli kosulari listele")
+    list_parser.add_argument('--kind', default=None, help="performance, parallel, load ...")
+    list_parser.add_argument('--server', default=None)
+    list_parser.add_argument('--limit', type=int, default=20)
+    compare_parser = subparsers.add_parser('compare', help="Aday kosulari referans kosulara gore karsilastir")
+    compare_parser.add_argument('--baseline', nargs='+', required=True, help="Referans kosu ID'leri")
+    compare_parser.add_argument('--candidate', nargs='+', default=None,
+                                help="Aday kosu ID'leri (varsayilan: ayni tur ve sunucudaki en son kosu)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    store = ResultsStore(args.store)
+    try:
+        if args.command == 'list':
+            print_runs(store.runs(kind=args.kind, server=args.server, limit=args.limit))
+            return
+        # Gecersiz ID ve eksik aday 2 ile cikar; 1 yalnizca regresyon demektir
+        try:
+            baseline_runs = [store.run(run_id) for run_id in args.baseline]
+            candidate_runs = [store.run(run_id) for run_id in args.candidate or []]
+        except KeyError as e:
+            print(f"HATA - {e}")
+            sys.exit(2)
+        reference = baseline_runs[0]
+        candidate_ids = args.candidate
+        if candidate_ids is None:
+            latest = store.latest_run(reference['kind'], reference['server'], exclude=args.baseline,
+                                      after=max(run['created_at'] for run in baseline_runs))
+            if latest is None:
+                print("HATA - karsilastirilacak aday kosu yok")
+                sys.exit(2)
+            candidate_ids = [latest['run_id']]
+            candidate_runs = [latest]
+        candidate = candidate_runs[0]
+        print(f"Referans: {', '.join(args.baseline)} (git {reference['git_rev']}, config {reference['config_hash']})")
+        print(f"Aday    : {', '.join(candidate_ids)} (git {candidate['git_rev']}, config {candidate['config_hash']})")
+        comparisons = store.compare(args.baseline, candidate_ids)
+        print_comparison(comparisons)
+        regressions = [entry['key'] for entry in comparisons if entry['latency_regression'] or entry['throughput_regression']]
+        if regressions:
+            print(f"\n{len(regressions)} testte istatistiksel olarak anlamli regresyon: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nAnlamli regresyon yok")
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
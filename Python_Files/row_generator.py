@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+import time
+from datetime import date, timedelta
+import numpy as np
+from faker import Faker
+
+BIRTH_START_YEARS = 80
+BIRTH_END_YEARS = 18
+
+def birth_date_bounds(today=None):
+    today = today or date.today()
+    start = today - timedelta(days=int(BIRTH_START_YEARS * 365.25))
+    end = today - timedelta(days=int(BIRTH_END_YEARS * 365.25))
+    return start, end
+
+def faker_rows(fake, batch_size, batch_number):
+    data = []
+    for i in range(batch_size):
+        name = fake.first_name()
+        surname = fake.last_name()
+        eposta = f"{name.lower()}.{surname.lower()}.{batch_number}.{i}@{fake.domain_name()}"
+        dogum_tarihi = fake.date_between(start_date=f'-{BIRTH_START_YEARS}y', end_date=f'-{BIRTH_END_YEARS}y')
+        data.append((name, surname, eposta, dogum_tarihi))
+    return data
+
+class FakerRowGenerator:
+    def __init__(self, locale='tr_TR', seed=None):
+        self.fake = Faker(locale)
+        if seed is not None:
+            self.fake.seed_instance(seed)
+
+    def generate_rows(self, batch_size, batch_number):
+        return faker_rows(self.fake, batch_size, batch_number)
+
+class VectorizedRowGenerator:
+    def __init__(self, locale='tr_TR', seed=None, pool_size=20000):
+        fake = Faker(locale)
+        if seed is not None:
+            fake.seed_instance(seed)
+        self.rng = np.random.default_rng(seed)
+
+        # Havuzlar Faker'in kendi agirlikli secimiyle doldurulur; havuzdan
+        # duzgun ornekleme yapmak ayni isim/soyisim dagilimini korur.
+        self.name_pool = np.array([fake.first_name() for _ in range(pool_size)])
+        self.surname_pool = np.array([fake.last_name() for _ in range(pool_size)])
+        self.domain_pool = np.array([fake.domain_name() for _ in range(pool_size)])
+        self.name_lower_pool = np.char.lower(self.name_pool)
+        self.surname_lower_pool = np.char.lower(self.surname_pool)
+
+        start, end = birth_date_bounds()
+        self.birth_start = np.datetime64(start, 'D')
+        self.birth_span = (end - start).days
+
+    def generate_columns(self, batch_size, batch_number):
+        name_idx = self.rng.integers(0, len(self.name_pool), batch_size)
+        surname_idx = self.rng.integers(0, len(self.surname_pool), batch_size)
+        domain_idx = self.rng.integers(0, len(self.domain_pool), batch_size)
+        day_offsets = self.rng.integers(0, self.birth_span + 1, batch_size)
+
+        suffixes = np.char.add(f'.{batch_number}.', np.arange(batch_size).astype(str))
+        eposta = np.char.add(self.name_lower_pool[name_idx], '.')
+        eposta = np.char.add(eposta, self.surname_lower_pool[surname_idx])
+        eposta = np.char.add(eposta, suffixes)
+        eposta = np.char.add(eposta, '@')
+        eposta = np.char.add(eposta, self.domain_pool[domain_idx])
+
+        return {
+            'name': self.name_pool[name_idx],
+            'surname': self.surname_pool[surname_idx],
+            'eposta': eposta,
+            'dogum_tarihi': self.birth_start + day_offsets
+        }
+
+    def generate_rows(self, batch_size, batch_number):
+        columns = self.generate_columns(batch_size, batch_number)
+        return list(zip(
+            columns['name'].tolist(),
+            columns['surname'].tolist(),
+            columns['eposta'].tolist(),
+            columns['dogum_tarihi'].tolist()
+        ))
+
+ROW_MODES = {
+    'faker': FakerRowGenerator,
+    'vectorized': VectorizedRowGenerator
+}
+
+def create_row_generator(row_mode, seed=None):
+    try:
+        generator_class = ROW_MODES[row_mode]
+    except KeyError:
+        raise ValueError(f"Bilinmeyen uretim modu: {row_mode} (secenekler: {', '.join(ROW_MODES)})")
+    return generator_class(seed=seed)
+
+def main():
+    batch_size = 100000
+    for row_mode in ROW_MODES:
+        generator = create_row_generator(row_mode, seed=42)
+        start_time = time.perf_counter()
+        generator.generate_rows(batch_size, 0)
+        elapsed = time.perf_counter() - start_time
+        print(f"{row_mode:<10} | {batch_size:,} satir | {elapsed:.3f}s | {batch_size / elapsed:,.0f} satir/sn")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+import argparse
+import contextlib
+import json
+import threading
+import time
+from datetime import datetime
+import psycopg2
+from workload_catalog import WorkloadCatalog, server_connection_kwargs, results_filename
+
+# pg_stat_database sayaclari backend'ler tarafindan en fazla saniyede bir aktarilir;
+# 1 saniyeden kisa araliklarda ornekler arasinda dalgalanma beklenir
+DATABASE_SQL = """
+    SELECT blks_read, blks_hit, temp_files, temp_bytes, xact_commit, xact_rollback,
+           deadlocks, tup_returned, tup_fetched
+    FROM pg_stat_database WHERE datname = current_database()
+"""
+
+# PostgreSQL 17 checkpoint sayaclarini pg_stat_bgwriter'dan pg_stat_checkpointer'a tasidi
+CHECKPOINTER_SQL = """
+    SELECT c.num_timed, c.num_requested, c.buffers_written, b.buffers_clean, 0
+    FROM pg_stat_checkpointer c, pg_stat_bgwriter b
+"""
+
+BGWRITER_SQL = """
+    SELECT checkpoints_timed, checkpoints_req, buffers_checkpoint, buffers_clean, buffers_backend
+    FROM pg_stat_bgwriter
+"""
+
+ACTIVITY_SQL = """
+    SELECT count(*) FILTER (WHERE state = 'active'),
+           count(*) FILTER (WHERE wait_event_type = 'Lock'),
+           count(*)
+    FROM pg_stat_activity
+    WHERE datname = current_database() AND pid <> pg_backend_pid()
+"""
+
+STATEMENTS_SQL = """
+    SELECT queryid, left(query, 120), calls, total_exec_time, shared_blks_hit, shared_blks_read, temp_blks_written
+    FROM pg_stat_statements
+    WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+"""
+
+COUNTER_FIELDS = ('blks_read', 'blks_hit', 'temp_files', 'temp_bytes', 'xact_commit', 'xact_rollback',
+                  'deadlocks', 'tup_returned', 'tup_fetched', 'checkpoints_timed', 'checkpoints_req',
+                  'buffers_checkpoint', 'buffers_clean', 'buffers_backend')
+
+class ServerMetricsSampler:
+    def __init__(self, connection_params, server_name, interval=1.0):
+        self.connection_params = connection_params
+        self.server_name = server_name
+        self.interval = interval
+        self.samples = []
+        self.statements = []
+        self.error = None
+        self.conn = None
+        self.has_statements = False
+        self.checkpoint_sql = BGWRITER_SQL
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def connect(self):
+        self.conn = psycopg2.connect(**self.connection_params, application_name='server_metrics_sampler')
+        self.conn.autocommit = True
+        cur = self.conn.cursor()
+        cur.execute("SELECT current_setting('server_version_num')::int")
+        if cur.fetchone()[0] >= 170000:
+            self.checkpoint_sql = CHECKPOINTER_SQL
+        cur.execute("SELECT count(*) FROM pg_extension WHERE extname = 'pg_stat_statements'")
+        self.has_statements = cur.fetchone()[0] > 0
+        cur.close()
+
+    def snapshot(self):
+        cur = self.conn.cursor()
+        cur.execute(DATABASE_SQL)
+        values = list(cur.fetchone())
+        cur.execute(self.checkpoint_sql)
+        values.extend(cur.fetchone())
+        cur.execute(ACTIVITY_SQL)
+        active_backends, lock_waits, backends = cur.fetchone()
+        cur.close()
+        counters = dict(zip(COUNTER_FIELDS, (int(value or 0) for value in values)))
+        return time.perf_counter(), counters, {
+            'active_backends': active_backends,
+            'lock_waits': lock_waits,
+            'backends': backends
+        }
+
+    def statement_snapshot(self):
+        if not self.has_statements:
+            return {}
+        try:
+            cur = self.conn.cursor()
+            cur.execute(STATEMENTS_SQL)
+            rows = cur.fetchall()
+            cur.close()
+        except Exception as e:
+            print(f"HATA - {self.server_name} - pg_stat_statements okunamadi: {e}")
+            self.has_statements = False
+            return {}
+        return {row[0]: row[1:] for row in rows}
+
+    def interval_sample(self, start_time, previous, current):
+        previous_time, previous_counters, _ = previous
+        current_time, current_counters, gauges = current
+        elapsed = current_time - previous_time
+        delta = {name: current_counters[name] - previous_counters[name] for name in COUNTER_FIELDS}
+        blocks = delta['blks_hit'] + delta['blks_read']
+        transactions = delta['xact_commit'] + delta['xact_rollback']
+        return {
+            't': current_time - start_time,
+            'timestamp': datetime.now().isoformat(),
+            'interval': elapsed,
+            'cache_hit_ratio': delta['blks_hit'] / blocks if blocks else 1.0,
+            'blocks_read': delta['blks_read'],
+            'blocks_hit': delta['blks_hit'],
+            'temp_files': delta['temp_files'],
+            'temp_bytes': delta['temp_bytes'],
+            'checkpoints': delta['checkpoints_timed'] + delta['checkpoints_req'],
+            'checkpoints_requested': delta['checkpoints_req'],
+            'buffers_checkpoint': delta['buffers_checkpoint'],
+            'buffers_clean': delta['buffers_clean'],
+            'buffers_backend': delta['buffers_backend'],
+            'deadlocks': delta['deadlocks'],
+            'transactions_per_second': transactions / elapsed if elapsed > 0 else 0,
+            'tuples_returned': delta['tup_returned'],
+            'tuples_fetched': delta['tup_fetched'],
+            'active_backends': gauges['active_backends'],
+            'lock_waits': gauges['lock_waits'],
+            'backends': gauges['backends']
+        }
+
+    def statement_deltas(self, before, after, limit=10):
+        deltas = []
+        for queryid, (query, calls, exec_time, hit, read, temp) in after.items():
+            base = before.get(queryid, (query, 0, 0.0, 0, 0, 0))
+            calls_delta = calls - base[1]
+            if calls_delta <= 0:
+                continue
+            deltas.append({
+                'queryid': queryid,
+                'query': query,
+                'calls': calls_delta,
+                'total_exec_time_ms': exec_time - base[2],
+                'mean_exec_time_ms': (exec_time - base[2]) / calls_delta,
+                'shared_blks_hit': hit - base[3],
+                'shared_blks_read': read - base[4],
+                'temp_blks_written': temp - base[5]
+            })
+        deltas.sort(key=lambda item: item['total_exec_time_ms'], reverse=True)
+        return deltas[:limit]
+
+    def run(self):
+        try:
+            statements_before = self.statement_snapshot()
+            previous = self.snapshot()
+            start_time = previous[0]
+            while not self.stop_event.wait(self.interval):
+                current = self.snapshot()
+                self.samples.append(self.interval_sample(start_time, previous, current))
+                previous = current
+            current = self.snapshot()
+            if current[0] - previous[0] > 0.05:
+                self.samples.append(self.interval_sample(start_time, previous, current))
+            self.statements = self.statement_deltas(statements_before, self.statement_snapshot())
+        except Exception as e:
+            self.error = str(e)
+            print(f"HATA - {self.server_name} - metrik ornekleme: {e}")
+
+    def start(self):
+        self.connect()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name=f'metrics-{self.server_name}', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+        return self.samples
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def summary(self):
+        if not self.samples:
+            return {'samples': 0}
+        blocks_hit = sum(sample['blocks_hit'] for sample in self.samples)
+        blocks_read = sum(sample['blocks_read'] for sample in self.samples)
+        total = blocks_hit + blocks_read
+        return {
+            'samples': len(self.samples),
+            'duration': self.samples[-1]['t'],
+            'cache_hit_ratio': blocks_hit / total if total else 1.0,
+            'min_cache_hit_ratio': min(sample['cache_hit_ratio'] for sample in self.samples),
+            'blocks_read': blocks_read,
+            'temp_bytes': sum(sample['temp_bytes'] for sample in self.samples),
+            'checkpoints': sum(sample['checkpoints'] for sample in self.samples),
+            'deadlocks': sum(sample['deadlocks'] for sample in self.samples),
+            'max_active_backends': max(sample['active_backends'] for sample in self.samples),
+            'max_lock_waits': max(sample['lock_waits'] for sample in self.samples)
+        }
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary['samples']:
+            print(f"{self.server_name} - metrik ornegi yok")
+            return
+        print(f"\n{self.server_name} Sunucu Metrikleri ({summary['samples']} ornek, {summary['duration']:.1f}s)")
+        print(f"  Onbellek isabeti: %{summary['cache_hit_ratio'] * 100:.2f} (en dusuk %{summary['min_cache_hit_ratio'] * 100:.2f})")
+        print(f"  Diskten okunan blok: {summary['blocks_read']}, gecici veri: {summary['temp_bytes'] / 1024 ** 2:.1f} MB")
+        print(f"  Checkpoint: {summary['checkpoints']}, deadlock: {summary['deadlocks']}")
+        print(f"  En fazla aktif backend: {summary['max_active_backends']}, kilit bekleyen: {summary['max_lock_waits']}")
+        for statement in self.statements[:3]:
+            print(f"  {statement['total_exec_time_ms']:>10.1f} ms | {statement['calls']:>7} cagri | {statement['query'][:60]}")
+
+    def save(self, prefix='server_metrics'):
+        filename = results_filename(prefix, self.server_name)
+        data = {
+            'server': self.server_name,
+            'interval': self.interval,
+            'error': self.error,
+            'summary': self.summary(),
+            'samples': self.samples,
+            'statements': self.statements
+        }
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        print(f"Sunucu metrikleri kaydedildi: {filename}")
+        return filename
+
+@contextlib.contextmanager
+def sample_metrics(enabled, connection_params, server_name, interval=1.0, prefix='server_metrics'):
+    if not enabled:
+        yield None
+        return
+    sampler = ServerMetricsSampler(connection_params, server_name, interval)
+    try:
+        sampler.start()
+    except Exception as e:
+        print(f"HATA - {server_name} - metrik baglantisi kurulamadi: {e}")
+        yield None
+        return
+    try:
+        yield sampler
+    finally:
+        sampler.stop()
+        sampler.print_summary()
+        sampler.save(prefix)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="pg_stat_* gorunumlerinden sunucu metriklerini ornekle")
+    parser.add_argument('--catalog', default=None, help="Is yuku katalog dosyasi (JSON/TOML/YAML)")
+    parser.add_argument('--server', default=None, help="Sunucu adi (varsayilan: katalogdaki ilk sunucu)")
+    parser.add_argument('--interval', type=float, default=1.0)
+    parser.add_argument('--duration', type=float, default=60.0)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    catalog = WorkloadCatalog.load(args.catalog)
+    server = catalog.server(args.server) if args.server else catalog.servers[0]
+    print(f"{server['name']} metrikleri {args.duration:.0f}s boyunca {args.interval}s aralikla ornekleniyor...")
+    with sample_metrics(True, server_connection_kwargs(server), server['name'], args.interval):
+        time.sleep(args.duration)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import concurrent.futures
+import heapq
+import json
+import time
+from collections import Counter
+from datetime import datetime
+import asyncpg
+import psycopg2
+from benchmark_stats import summarize
+from bulk_loader import TABLE_NAME
+from connection_pool import ConnectionManager
+from plan_inspector import capture_plan, summarize_plan
+from workload_catalog import WorkloadCatalog, server_connection_kwargs, results_filename, to_asyncpg_sql
+
+SHARD_FILTER = "id >= %s AND id < %s"
+SERIAL_PLAN_OPTIONS = "-c max_parallel_workers_per_gather=0"
+
+# Her sorgu icin: tek ifade, shard ifadesi (id araligi filtresiyle) ve istemci tarafi birlestirme turu.
+# COUNT'lar shard'larda tam olarak toplanir, top-K ancak birlestirmeden sonra uygulanir;
+# satir top-K'sinda ise her shard kendi ilk K'sini dondurur ve sonuc yine kesindir.
+# 'catalog_query' verilen sorgularda tek ifade ve aciklama katalogdan alinir.
+SHARD_QUERIES = {
+    'soyisim_gruplama': {
+        'catalog_query': 'soyisim_gruplama',
+        'shard_sql': f"SELECT surname, COUNT(*) FROM {TABLE_NAME} WHERE {SHARD_FILTER} GROUP BY surname",
+        'merge': 'count',
+        'limit': 100
+    },
+    'en_genc_kullanicilar': {
+        'description': "en genc 100 kullanici (satir top-K)",
+        'single_sql': f"SELECT id, dogum_tarihi FROM {TABLE_NAME} WHERE dogum_tarihi IS NOT NULL "
+                      f"ORDER BY dogum_tarihi DESC, id DESC LIMIT 100",
+        'shard_sql': f"SELECT id, dogum_tarihi FROM {TABLE_NAME} WHERE {SHARD_FILTER} AND dogum_tarihi IS NOT NULL "
+                     f"ORDER BY dogum_tarihi DESC, id DESC LIMIT 100",
+        'merge': 'top_rows',
+        'limit': 100
+    }
+}
+
+def shard_ranges(min_id, max_id, shards):
+    step = -(-(max_id - min_id + 1) // shards)
+    return [(low, min(low + step, max_id + 1)) for low in range(min_id, max_id + 1, step)]
+
+def merge_partials(spec, partials):
+    if spec['merge'] == 'count':
+        counts = Counter()
+        for rows in partials:
+            for key, count in rows:
+                counts[key] += count
+        return counts.most_common(spec['limit'])
+    rows = (tuple(row) for partial in partials for row in partial)
+    return heapq.nlargest(spec['limit'], rows, key=lambda row: (row[1], row[0]))
+
+def result_signature(spec, rows):
+    # COUNT esitliklerinde siralama belirsizdir; dogrulama sayilarin dizisi uzerinden yapilir
+    if spec['merge'] == 'count':
+        return sorted((int(row[1]) for row in rows), reverse=True)
+    return [tuple(row) for row in rows]
+
+def shard_label(result):
+    if 'workers_source' in result:
+        return f"1+{result['workers_launched']}*"
+    return str(result['shards'])
+
+class ShardedScan:
+    def __init__(self, catalog, server, query_names=None, shard_counts=(2, 4, 8), warmup=1, repetitions=5):
+        self.catalog = catalog
+        self.server_name = server['name']
+        self.connection_params = server_connection_kwargs(server)
+        self.query_names = query_names or list(SHARD_QUERIES)
+        self.shard_counts = shard_counts
+        self.warmup = warmup
+        self.repetitions = repetitions
+        self.bounds = None
+        self.results = []
+
+    def query_spec(self, name):
+        spec = dict(SHARD_QUERIES[name])
+        if 'catalog_query' in spec:
+            query = self.catalog.query(spec['catalog_query'])
+            spec.update(single_sql=query.sql, description=query.description)
+        return spec
+
+    def load_bounds(self):
+        conn = psycopg2.connect(**self.connection_params)
+        cur = conn.cursor()
+        cur.execute(f"SELECT min(id), max(id) FROM {TABLE_NAME}")
+        self.bounds = cur.fetchone()
+        cur.execute("SHOW max_parallel_workers_per_gather")
+        self.default_workers = cur.fetchone()[0]
+        cur.close()
+        conn.close()
+        if self.bounds[1] is None:
+            raise RuntimeError(f"{TABLE_NAME} bos; once veri yukleyin")
+        return self.bounds
+
+    def single_statement(self, spec, parallel_workers=None):
+        conn = psycopg2.connect(**self.connection_params)
+        try:
+            cur = conn.cursor()
+            if parallel_workers is not None:
+                cur.execute(f"SET max_parallel_workers_per_gather = {int(parallel_workers)}")
+            for _ in range(self.warmup):
+                cur.execute(spec['single_sql'])
+                cur.fetchall()
+            samples = []
+            for _ in range(self.repetitions):
+                start_time = time.perf_counter()
+                cur.execute(spec['single_sql'])
+                rows = cur.fetchall()
+                samples.append(time.perf_counter() - start_time)
+            plan_summary = summarize_plan(capture_plan(conn, spec['single_sql']))
+            cur.close()
+        finally:
+            conn.close()
+        return samples, rows, {'workers_planned': plan_summary['workers_planned'],
+                               'workers_launched': plan_summary['workers_launched']}
+
+    def threaded_shards(self, spec, shards):
+        ranges = shard_ranges(self.bounds[0], self.bounds[1], shards)
+        # Istemci tarafi dagitimi PostgreSQL'in paralel planindan ayirmak icin shard'lar seri plan kullanir
+        connections = ConnectionManager(dict(self.connection_params, options=SERIAL_PLAN_OPTIONS),
+                                        mode='pool', max_size=shards)
+
+        def run_shard(id_range):
+            with connections.connection() as conn:
+                cur = conn.cursor()
+                cur.execute(spec['shard_sql'], id_range)
+                rows = cur.fetchall()
+                cur.close()
+                return rows
+
+        samples = []
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=shards) as executor:
+                # Baglantilar olcum disinda acilir ki sadece sorgu + birlestirme suresi olculsun
+                held = [connections.acquire() for _ in range(shards)]
+                for conn in held:
+                    connections.release(conn)
+                for iteration in range(self.warmup + self.repetitions):
+                    start_time = time.perf_counter()
+                    rows = merge_partials(spec, executor.map(run_shard, ranges))
+                    if iteration >= self.warmup:
+                        samples.append(time.perf_counter() - start_time)
+        finally:
+            connections.close_all()
+        return samples, rows
+
+    async def async_shards(self, spec, shards):
+        ranges = shard_ranges(self.bounds[0], self.bounds[1], shards)
+        shard_sql = to_asyncpg_sql(spec['shard_sql'])
+        pool = await asyncpg.create_pool(min_size=shards, max_size=shards,
+                                         server_settings={'max_parallel_workers_per_gather': '0'},
+                                         **self.connection_params)
+
+        async def run_shard(id_range):
+            async with pool.acquire() as conn:
+                return await conn.fetch(shard_sql, *id_range)
+
+        samples = []
+        try:
+            for iteration in range(self.warmup + self.repetitions):
+                start_time = time.perf_counter()
+                rows = merge_partials(spec, await asyncio.gather(*(run_shard(id_range) for id_range in ranges)))
+                if iteration >= self.warmup:
+                    samples.append(time.perf_counter() - start_time)
+        finally:
+            await pool.close()
+        return samples, rows
+
+    def record(self, name, method, shards, samples, rows, reference, spec, extra=None):
+        stats = summarize(samples)
+        result = {
+            'server': self.server_name,
+            'query': name,
+            'method': method,
+            'shards': shards,
+            'execution_time': stats['median'],
+            'stats': stats,
+            'samples': samples,
+            'row_count': len(rows),
+            'matches_single': result_signature(spec, rows) == reference,
+            'timestamp': datetime.now().isoformat()
+        }
+        result.update(extra or {})
+        self.results.append(result)
+        mismatch = "" if result['matches_single'] else "  UYARI: tek ifade sonucuyla eslesmiyor"
+        print(f"  {method:<22} | {shards:>6} | {stats['median'] * 1000:>10.2f}{mismatch}")
+        return result
+
+    def run(self):
+        self.load_bounds()
+        print(f"\n=== {self.server_name} Shard'li Tarama (id {self.bounds[0]}-{self.bounds[1]}, "
+              f"varsayilan max_parallel_workers_per_gather={self.default_workers}) ===")
+        for name in self.query_names:
+            print(f"\n{name}")
+            print(f"  {'Yontem':<22} | {'Shard':>6} | {'Medyan (ms)':>10}")
+            try:
+                spec = self.query_spec(name)
+                print(f"  ({spec['description']})")
+                samples, rows, workers = self.single_statement(spec, parallel_workers=0)
+                reference = result_signature(spec, rows)
+                self.record(name, 'tek_ifade_seri', 1, samples, rows, reference, spec, workers)
+                # Worker sayisi olculen calistirmalardan degil, ayri bir EXPLAIN ANALYZE calistirmasindan gelir
+                samples, rows, workers = self.single_statement(spec)
+                workers['workers_source'] = 'explain_analyze'
+                self.record(name, 'tek_ifade_paralel', 1, samples, rows, reference, spec, workers)
+                for shards in self.shard_counts:
+                    samples, rows = self.threaded_shards(spec, shards)
+                    self.record(name, 'shard_threading', shards, samples, rows, reference, spec)
+                    samples, rows = asyncio.run(self.async_shards(spec, shards))
+                    self.record(name, 'shard_asyncio', shards, samples, rows, reference, spec)
+            except Exception as e:
+                print(f"HATA - {self.server_name} - {name}: {e}")
+        return self.results
+
+    def report(self):
+        print(f"\n=== {self.server_name} Ozet (tek ifade, seri plana gore hizlanma) ===")
+        print(f"{'Sorgu':<22} | {'Yontem':<18} | Shard/Worker | Medyan (ms) | Hizlanma | Dogru")
+        print("-" * 90)
+        for name in self.query_names:
+            rows = [result for result in self.results if result['query'] == name]
+            serial = next((result for result in rows if result['method'] == 'tek_ifade_seri'), None)
+            for result in rows:
+                speedup = serial['execution_time'] / result['execution_time'] if serial and result['execution_time'] else 0
+                print(f"{name[:22]:<22} | {result['method']:<18} | {shard_label(result):>12} | "
+                      f"{result['execution_time'] * 1000:>11.2f} | {speedup:>7.2f}x | "
+                      f"{'EVET' if result['matches_single'] else 'HAYIR'}")
+            best = min(rows, key=lambda result: result['execution_time'], default=None)
+            if best:
+                print(f"{'':<22} | en hizli: {best['method']} ({shard_label(best)})")
+        print("* 1 ifade + worker sayisi; worker sayisi ayri bir EXPLAIN ANALYZE calistirmasindan alinmistir")
+        return {
+            'server': self.server_name,
+            'id_range': list(self.bounds),
+            'default_max_parallel_workers_per_gather': self.default_workers,
+            'warmup': self.warmup,
+            'repetitions': self.repetitions,
+            'results': self.results
+        }
+
+    def save_results(self, report):
+        filename = results_filename('sharded_scan', self.server_name)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+        print(f"Shard'li tarama sonuclari kaydedildi: {filename}")
+        return filename
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="id araligi shard'li istemci tarafi tarama vs PostgreSQL paralel sorgu")
+    parser.add_argument('--catalog', default=None, help="Is yuku katalog dosyasi (JSON/TOML/YAML)")
+    parser.add_argument('--server', default=None, help="Sunucu adi (varsayilan: tum sunucular)")
+    parser.add_argument('--queries', nargs='+', choices=list(SHARD_QUERIES), default=None)
+    parser.add_argument('--shards', type=int, nargs='+', default=[2, 4, 8])
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--repetitions', type=int, default=5)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    catalog = WorkloadCatalog.load(args.catalog)
+    servers = [catalog.server(args.server)] if args.server else catalog.servers
+    for server in servers:
+        scan = ShardedScan(catalog, server, query_names=args.queries, shard_counts=args.shards,
+                           warmup=args.warmup, repetitions=args.repetitions)
+        scan.run()
+        scan.save_results(scan.report())
+
+if __name__ == "__main__":
+    main()
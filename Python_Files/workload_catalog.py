@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+import json
+import os
+import random
+import re
+from datetime import date, timedelta
+from id_distributions import IdSampler
+
+DEFAULT_CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Workloads', 'default_workload.json')
+
+SERVER_DEFAULTS = {
+    'port': 5432,
+    'database': 'testdb',
+    'user': 'pgtest',
+    'password': 'pgtest123'
+}
+
+def to_asyncpg_sql(sql):
+    counter = iter(range(1, sql.count('%s') + 1))
+    return re.sub(r'%s', lambda _: f"${next(counter)}", sql)
+
+class ParamGenerator:
+    def __init__(self, spec, rng):
+        self.spec = spec
+        self.kind = spec['type']
+        self.rng = rng
+        if self.kind == 'random_id':
+            self.sampler = IdSampler(
+                spec.get('distribution', 'uniform'),
+                max_id=spec.get('max_id', 10000000),
+                seed=rng.getrandbits(32),
+                zipf_s=spec.get('zipf_s', 1.1),
+                hot_fraction=spec.get('hot_fraction', 0.01),
+                hot_probability=spec.get('hot_probability', 0.9)
+            )
+            self.pending = []
+        elif self.kind not in ('const', 'choice', 'date_range'):
+            raise ValueError(f"Bilinmeyen parametre uretici tipi: {self.kind}")
+
+    def values(self):
+        if self.kind == 'const':
+            return [self.spec['value']]
+        if self.kind == 'choice':
+            return [self.rng.choice(self.spec['values'])]
+        if self.kind == 'random_id':
+            if not self.pending:
+                self.pending = self.sampler.sample(1024).tolist()
+            return [self.pending.pop()]
+        start = date.fromisoformat(self.spec['start'])
+        end = date.fromisoformat(self.spec['end'])
+        span_days = self.spec.get('span_days')
+        if span_days is None:
+            return [start.isoformat(), end.isoformat()]
+        offset = self.rng.randint(0, max(0, (end - start).days - span_days))
+        range_start = start + timedelta(days=offset)
+        return [range_start.isoformat(), (range_start + timedelta(days=span_days)).isoformat()]
+
+class CatalogQuery:
+    def __init__(self, data):
+        self.name = data['name']
+        self.description = data.get('description', self.name)
+        self.sql = data['sql']
+        self.weight = data.get('weight', 1)
+        self.param_specs = data.get('params', [])
+
+    @property
+    def asyncpg_sql(self):
+        return to_asyncpg_sql(self.sql)
+
+    def param_factory(self, seed=None):
+        if not self.param_specs:
+            return None
+        rng = random.Random(seed)
+        generators = [ParamGenerator(spec, rng) for spec in self.param_specs]
+
+        def make_params():
+            params = []
+            for generator in generators:
+                params.extend(generator.values())
+            return tuple(params)
+
+        return make_params
+
+    def as_benchmark_query(self, seed=None):
+        return self.sql, self.description, self.param_factory(seed)
+
+class WorkloadCatalog:
+    def __init__(self, data, path=None):
+        self.data = data
+        self.path = path
+        self.name = data.get('name', os.path.splitext(os.path.basename(path or 'workload'))[0])
+        self.defaults = dict(SERVER_DEFAULTS, **data.get('defaults', {}))
+        self.queries = [CatalogQuery(query) for query in data.get('queries', [])]
+        self.benchmark = dict({'warmup': 2, 'repetitions': 10}, **data.get('benchmark', {}))
+        self.mix = dict({'concurrency': [1, 8, 32], 'duration': 10.0}, **data.get('mix', {}))
+        self.sweep = dict({'grid': {}, 'warmup': 1, 'repetitions': 5}, **data.get('sweep', {}))
+        self.index_candidates = data.get('index_candidates', [])
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or DEFAULT_CATALOG
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.toml':
+            import tomllib
+            with open(path, 'rb') as f:
+                data = tomllib.load(f)
+        elif extension in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("YAML katalog icin PyYAML gerekli: pip install pyyaml")
+            with open(path, 'r', encoding='utf-8') as f:
+                data = yaml.safe_load(f)
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        return cls(data, path)
+
+    @property
+    def servers(self):
+        return [dict(self.defaults, **server) for server in self.data.get('servers', [])]
+
+    def server(self, name):
+        for server in self.servers:
+            if server['name'] == name:
+                return server
+        raise KeyError(f"Katalogda sunucu yok: {name}")
+
+    def query(self, name):
+        for query in self.queries:
+            if query.name == name:
+                return query
+        raise KeyError(f"Katalogda sorgu yok: {name}")
+
+    @property
+    def point_lookup(self):
+        name = self.data.get('point_lookup')
+        return self.query(name) if name else None
+
+    def benchmark_queries(self, seed=None):
+        return [query.as_benchmark_query(None if seed is None else seed + i)
+                for i, query in enumerate(self.queries)]
+
+def server_connection_kwargs(server):
+    return {
+        'host': server['host'],
+        'port': server['port'],
+        'database': server['database'],
+        'user': server['user'],
+        'password': server['password']
+    }
+
+def results_filename(prefix, server_name):
+    return f'{prefix}_{server_name.lower().replace(" ", "_")}.json'
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+import argparse
+import concurrent.futures
+import json
+import random
+import time
+from connection_pool import ConnectionManager
+from latency_histogram import LatencyHistogram
+from performance_tester import PerformanceTester, compare_benchmarks
+from results_store import DEFAULT_STORE_PATH, optional_store
+from workload_catalog import WorkloadCatalog, server_connection_kwargs, results_filename
+
+class WorkloadRunner:
+    def __init__(self, catalog, server, connection_mode='pool', seed=None):
+        self.catalog = catalog
+        self.server = server
+        self.server_name = server['name']
+        self.connection_params = server_connection_kwargs(server)
+        self.connection_mode = connection_mode
+        self.seed = seed
+        self.results = {'catalog': catalog.name, 'server': self.server_name, 'benchmark': [], 'mix': []}
+
+    def run_benchmark(self):
+        tester = PerformanceTester(
+            server_name=self.server_name,
+            connection_mode=self.connection_mode,
+            queries=self.catalog.benchmark_queries(self.seed),
+            **self.connection_params
+        )
+        tester.run_benchmark_suite(
+            warmup=self.catalog.benchmark['warmup'],
+            repetitions=self.catalog.benchmark['repetitions']
+        )
+        self.results['benchmark'] = tester.results
+        return tester.results
+
+    def mix_worker(self, connections, worker_seed, deadline):
+        rng = random.Random(worker_seed)
+        queries = self.catalog.queries
+        weights = [query.weight for query in queries]
+        factories = [query.param_factory(rng.getrandbits(32)) for query in queries]
+        histograms = {query.name: LatencyHistogram() for query in queries}
+        errors = 0
+
+        with connections.connection() as conn:
+            cur = conn.cursor()
+            while time.perf_counter() < deadline:
+                index = rng.choices(range(len(queries)), weights=weights)[0]
+                query = queries[index]
+                params = factories[index]() if factories[index] else None
+                start_time = time.perf_counter()
+                try:
+                    cur.execute(query.sql, params)
+                    cur.fetchall()
+                    histograms[query.name].record(time.perf_counter() - start_time)
+                except Exception:
+                    conn.rollback()
+                    errors += 1
+            cur.close()
+        return histograms, errors
+
+    def run_mix_level(self, concurrency, duration):
+        connections = ConnectionManager(self.connection_params, mode='pool', max_size=concurrency)
+        base_seed = self.seed if self.seed is not None else random.getrandbits(32)
+
+        start_time = time.perf_counter()
+        deadline = start_time + duration
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(self.mix_worker, connections, base_seed + i, deadline)
+                       for i in range(concurrency)]
+            outcomes = []
+            connection_errors = 0
+            for future in futures:
+                try:
+                    outcomes.append(future.result())
+                except Exception:
+                    connection_errors += 1
+        total_time = time.perf_counter() - start_time
+        connections.close_all()
+
+        per_query = {}
+        overall = LatencyHistogram()
+        for query in self.catalog.queries:
+            histogram = LatencyHistogram.merged(histograms[query.name] for histograms, _ in outcomes)
+            overall.merge(histogram)
+            per_query[query.name] = {
+                'description': query.description,
+                'weight': query.weight,
+                'throughput': histogram.count / total_time if total_time > 0 else 0,
+                'latency': histogram.summary(),
+                'latency_histogram': histogram.to_dict()
+            }
+
+        result = {
+            'server': self.server_name,
+            'test_type': 'Is_Yuku_Karisimi',
+            'catalog': self.catalog.name,
+            'concurrency': concurrency,
+            'total_time': total_time,
+            'query_count': overall.count,
+            'query_errors': sum(errors for _, errors in outcomes),
+            'connection_errors': connection_errors,
+            'throughput': overall.count / total_time if total_time > 0 else 0,
+            'latency': overall.summary(),
+            'queries': per_query
+        }
+        self.results['mix'].append(result)
+        return result
+
+    def run_mix(self):
+        levels = self.catalog.mix['concurrency']
+        duration = self.catalog.mix['duration']
+        print(f"\n=== {self.server_name} Is Yuku Karisimi ({self.catalog.name}) ===")
+        print(f"Eszamanlilik seviyeleri: {levels}, seviye basina {duration:.0f}s")
+        print("Eszamanlilik | Sorgu/sn   | p50 (ms) | p99 (ms) | max (ms) | Hata")
+        print("-" * 68)
+        for concurrency in levels:
+            result = self.run_mix_level(concurrency, duration)
+            latency = result['latency']
+            errors = result['query_errors'] + result['connection_errors']
+            print(f"{concurrency:>12} | {result['throughput']:>10.1f} | {latency['p50'] * 1000:>8.2f} | "
+                  f"{latency['p99'] * 1000:>8.2f} | {latency['max'] * 1000:>8.2f} | {errors:>4}")
+        return self.results['mix']
+
+    def save_results(self, store=None):
+        filename = results_filename(f'workload_results_{self.catalog.name}', self.server_name)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.results, f, indent=2, ensure_ascii=False)
+        print(f"Is yuku sonuclari kaydedildi: {filename}")
+        results = self.results['benchmark'] + self.results['mix']
+        if store is not None and results:
+            store.record_run('workload', self.server_name, results, self.connection_params,
+                             workload=self.catalog.name, connection_mode=self.connection_mode)
+        return filename
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Katalog tabanli PostgreSQL is yuku calistirici")
+    parser.add_argument('catalog', nargs='?', default=None, help="Is yuku katalog dosyasi (JSON/TOML/YAML)")
+    parser.add_argument('--server', action='append', default=None, help="Yalnizca bu sunucu(lar)da calistir")
+    parser.add_argument('--connection-mode', choices=['pool', 'per_call'], default='pool')
+    parser.add_argument('--skip-benchmark', action='store_true')
+    parser.add_argument('--skip-mix', action='store_true')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help="Kosularin eklendigi SQLite sonuc gecmisi")
+    parser.add_argument('--no-store', action='store_true', help="Sonuclari gecmise ekleme")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    catalog = WorkloadCatalog.load(args.catalog)
+    servers = [catalog.server(name) for name in args.server] if args.server else catalog.servers
+
+    print(f"Is Yuku Katalogu: {catalog.name} ({len(catalog.queries)} sorgu, {len(servers)} sunucu)")
+    print("=" * 50)
+
+    runners = []
+    with optional_store(args.store, not args.no_store) as store:
+        for server in servers:
+            runner = WorkloadRunner(catalog, server, connection_mode=args.connection_mode, seed=args.seed)
+            try:
+                if not args.skip_benchmark:
+                    runner.run_benchmark()
+                if not args.skip_mix:
+                    runner.run_mix()
+            except Exception as e:
+                print(f"HATA - {runner.server_name}: {e}")
+            runner.save_results(store)
+            runners.append(runner)
+
+    if len(runners) >= 2 and not args.skip_benchmark:
+        baseline, candidate = runners[0], runners[1]
+        print(f"\nIstatistiksel Karsilastirma: {candidate.server_name} vs {baseline.server_name}")
+        compare_benchmarks(candidate.results['benchmark'], baseline.results['benchmark'],
+                           name_a=candidate.server_name, name_b=baseline.server_name)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import random
+import time
+from collections import deque
+from datetime import datetime
+import asyncpg
+import psycopg2
+from psycopg2.extras import execute_values
+from bulk_loader import TABLE_NAME, COLUMNS, INSERT_SQL
+from latency_histogram import LatencyHistogram
+from results_store import DEFAULT_STORE_PATH, optional_store
+from row_generator import VectorizedRowGenerator
+from workload_catalog import WorkloadCatalog, server_connection_kwargs, results_filename, to_asyncpg_sql
+
+WRITE_WORKLOADS = ('single_insert', 'batch_insert', 'hot_update', 'mixed')
+CONCURRENCY_MODELS = ('threading', 'asyncio', 'process')
+
+INSERT_RETURNING_SQL = INSERT_SQL + " RETURNING id"
+BATCH_INSERT_SQL = f"INSERT INTO {TABLE_NAME} ({', '.join(COLUMNS)}) VALUES %s"
+# Kolon kendisine yazilir: yeni tuple versiyonu ve WAL maliyeti ayni kalir, paylasilan veri degismez;
+# geride kalan olu tuple'lari cleanup() VACUUM ile temizler
+UPDATE_SQL = f"UPDATE {TABLE_NAME} SET surname = surname WHERE id = %s"
+DELETE_SQL = f"DELETE FROM {TABLE_NAME} WHERE id = %s"
+READ_SQL = f"SELECT * FROM {TABLE_NAME} WHERE id = %s"
+
+ASYNC_SQL = {
+    'insert': to_asyncpg_sql(INSERT_SQL),
+    'insert_returning': to_asyncpg_sql(INSERT_RETURNING_SQL),
+    'update': to_asyncpg_sql(UPDATE_SQL),
+    'delete': to_asyncpg_sql(DELETE_SQL),
+    'read': to_asyncpg_sql(READ_SQL)
+}
+
+# pg_stat_wal PostgreSQL 14 ile geldi; wal_buffers_full dogrudan wal_buffers yetersizligini gosterir
+WAL_STATS_SQL = "SELECT wal_records, wal_fpi, wal_bytes, wal_buffers_full FROM pg_stat_wal"
+
+def choose_operation(workload, rng, options, inserted):
+    if workload == 'single_insert':
+        return 'insert'
+    if workload == 'batch_insert':
+        return 'batch_insert'
+    if workload == 'hot_update':
+        return 'hot_update'
+    if rng.random() < options['read_ratio']:
+        return 'read'
+    # Karisik yukte tablo boyutu sabit kalsin diye silmeler yalnizca worker'in ekledigi satirlardan yapilir
+    operation = rng.choice(('insert', 'update', 'delete'))
+    if operation == 'delete' and not inserted:
+        return 'update'
+    return operation
+
+def sync_operation(cur, operation, rng, rows, options, inserted):
+    if operation == 'insert':
+        cur.execute(INSERT_RETURNING_SQL, rng.choice(rows))
+        inserted.append(cur.fetchone()[0])
+    elif operation == 'batch_insert':
+        execute_values(cur, BATCH_INSERT_SQL, rng.sample(rows, options['batch_size']), page_size=options['batch_size'])
+    elif operation == 'hot_update':
+        cur.execute(UPDATE_SQL, (rng.choice(options['hot_ids']),))
+    elif operation == 'update':
+        cur.execute(UPDATE_SQL, (rng.randint(1, options['max_id']),))
+    elif operation == 'delete':
+        cur.execute(DELETE_SQL, (inserted.popleft(),))
+    else:
+        cur.execute(READ_SQL, (rng.randint(1, options['max_id']),))
+        cur.fetchall()
+
+async def async_operation(conn, operation, rng, rows, options, inserted):
+    if operation == 'insert':
+        inserted.append(await conn.fetchval(ASYNC_SQL['insert_returning'], *rng.choice(rows)))
+    elif operation == 'batch_insert':
+        await conn.executemany(ASYNC_SQL['insert'], rng.sample(rows, options['batch_size']))
+    elif operation == 'hot_update':
+        await conn.execute(ASYNC_SQL['update'], rng.choice(options['hot_ids']))
+    elif operation == 'update':
+        await conn.execute(ASYNC_SQL['update'], rng.randint(1, options['max_id']))
+    elif operation == 'delete':
+        await conn.execute(ASYNC_SQL['delete'], inserted.popleft())
+    else:
+        await conn.fetch(ASYNC_SQL['read'], rng.randint(1, options['max_id']))
+
+def new_worker_state():
+    return {
+        'transactions': 0,
+        'write_transactions': 0,
+        'rows_written': 0,
+        'errors': 0,
+        'reconnects': 0,
+        'elapsed': 0.0,
+        'latency': LatencyHistogram(),
+        'commit_latency': LatencyHistogram()
+    }
+
+def record_transaction(state, operation, options, start_time, commit_start, end_time):
+    state['transactions'] += 1
+    state['latency'].record(end_time - start_time)
+    if operation != 'read':
+        state['write_transactions'] += 1
+        state['rows_written'] += options['batch_size'] if operation == 'batch_insert' else 1
+        state['commit_latency'].record(end_time - commit_start)
+
+def export_worker_state(state):
+    return dict(state, latency=state['latency'].to_dict(), commit_latency=state['commit_latency'].to_dict())
+
+def sync_write_worker(connection_params, workload, rows, options, seed, start_at, duration):
+    rng = random.Random(seed)
+    state = new_worker_state()
+    inserted = deque()
+    conn = psycopg2.connect(**connection_params)
+    cur = conn.cursor()
+    time.sleep(max(0.0, start_at - time.time()))
+    loop_start = time.perf_counter()
+    deadline = loop_start + duration
+    try:
+        while time.perf_counter() < deadline:
+            operation = choose_operation(workload, rng, options, inserted)
+            start_time = time.perf_counter()
+            try:
+                sync_operation(cur, operation, rng, rows, options, inserted)
+                commit_start = time.perf_counter()
+                conn.commit()
+                record_transaction(state, operation, options, start_time, commit_start, time.perf_counter())
+            except Exception:
+                state['errors'] += 1
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    pass
+                if not conn.closed:
+                    continue
+                # Baglanti koptu: bir kez yeniden baglanilir, olmazsa worker hata dongusune girmeden durur
+                try:
+                    conn = psycopg2.connect(**connection_params)
+                    cur = conn.cursor()
+                    state['reconnects'] += 1
+                except psycopg2.Error:
+                    break
+    finally:
+        state['elapsed'] = time.perf_counter() - loop_start
+        conn.close()
+    return export_worker_state(state)
+
+async def async_write_worker(pool, workload, rows, options, seed, start_at, duration):
+    rng = random.Random(seed)
+    state = new_worker_state()
+    inserted = deque()
+    async with pool.acquire() as conn:
+        await asyncio.sleep(max(0.0, start_at - time.time()))
+        loop_start = time.perf_counter()
+        deadline = loop_start + duration
+        while time.perf_counter() < deadline and not conn.is_closed():
+            operation = choose_operation(workload, rng, options, inserted)
+            start_time = time.perf_counter()
+            transaction = conn.transaction()
+            try:
+                await transaction.start()
+                await async_operation(conn, operation, rng, rows, options, inserted)
+                commit_start = time.perf_counter()
+                await transaction.commit()
+                record_transaction(state, operation, options, start_time, commit_start, time.perf_counter())
+            except Exception:
+                try:
+                    await transaction.rollback()
+                except Exception:
+                    pass
+                state['errors'] += 1
+        state['elapsed'] = time.perf_counter() - loop_start
+    return export_worker_state(state)
+
+class WriteBenchmark:
+    def __init__(self, host, server_name, port=5432, database='testdb', user='pgtest', password='pgtest123',
+                 batch_size=100, hot_rows=10, read_ratio=0.8, row_pool_size=20000, seed=None):
+        self.connection_params = {
+            'host': host,
+            'port': port,
+            'database': database,
+            'user': user,
+            'password': password
+        }
+        self.server_name = server_name
+        self.seed = seed
+        self.batch_size = batch_size
+        self.hot_rows = hot_rows
+        self.read_ratio = read_ratio
+        self.rows = VectorizedRowGenerator(seed=seed, pool_size=2000).generate_rows(row_pool_size, 0)
+        self.results = []
+        self.initial_max_id = None
+
+    def admin_query(self, query):
+        conn = psycopg2.connect(**self.connection_params)
+        conn.autocommit = True
+        cur = conn.cursor()
+        cur.execute(query)
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+        return rows
+
+    def prepare(self):
+        max_id = self.admin_query(f"SELECT coalesce(max(id), 0) FROM {TABLE_NAME}")[0][0]
+        hot_ids = [row[0] for row in self.admin_query(f"SELECT id FROM {TABLE_NAME} ORDER BY id LIMIT {self.hot_rows}")]
+        if self.initial_max_id is None:
+            self.initial_max_id = max_id
+        return {
+            'batch_size': self.batch_size,
+            'read_ratio': self.read_ratio,
+            'hot_ids': hot_ids,
+            'max_id': max(max_id, 1)
+        }
+
+    def wal_position(self):
+        return self.admin_query("SELECT pg_current_wal_lsn()")[0][0]
+
+    def wal_bytes_since(self, lsn):
+        return int(self.admin_query(f"SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), '{lsn}')")[0][0])
+
+    def wal_stats(self):
+        try:
+            return dict(zip(('wal_records', 'wal_fpi', 'wal_bytes', 'wal_buffers_full'),
+                            (int(value) for value in self.admin_query(WAL_STATS_SQL)[0])))
+        except Exception:
+            return {}
+
+    def run_threads(self, workload, options, concurrency, duration, start_at):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(sync_write_worker, self.connection_params, workload, self.rows, options,
+                                       self.worker_seed(i), start_at, duration) for i in range(concurrency)]
+            return [future.result() for future in futures]
+
+    def run_processes(self, workload, options, concurrency, duration, start_at):
+        with concurrent.futures.ProcessPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(sync_write_worker, self.connection_params, workload, self.rows, options,
+                                       self.worker_seed(i), start_at, duration) for i in range(concurrency)]
+            return [future.result() for future in futures]
+
+    async def run_tasks(self, workload, options, concurrency, duration, start_at):
+        pool = await asyncpg.create_pool(min_size=concurrency, max_size=concurrency, **self.connection_params)
+        try:
+            return await asyncio.gather(*(async_write_worker(pool, workload, self.rows, options,
+                                                             self.worker_seed(i), start_at, duration)
+                                          for i in range(concurrency)))
+        finally:
+            await pool.close()
+
+    def worker_seed(self, index):
+        return None if self.seed is None else self.seed + index
+
+    def run_level(self, workload, model, concurrency, duration=10.0):
+        options = self.prepare()
+        if workload == 'hot_update' and not options['hot_ids']:
+            raise RuntimeError(f"{TABLE_NAME} bos; hot_update icin once veri yukleyin")
+
+        # Process'lerin baslamasi icin pay birakilir; tum worker'lar ayni anda yuk uretmeye baslar
+        start_at = time.time() + (2.0 if model == 'process' else 0.5)
+        wal_before = self.wal_stats()
+        lsn_before = self.wal_position()
+        if model == 'threading':
+            outcomes = self.run_threads(workload, options, concurrency, duration, start_at)
+        elif model == 'process':
+            outcomes = self.run_processes(workload, options, concurrency, duration, start_at)
+        else:
+            outcomes = asyncio.run(self.run_tasks(workload, options, concurrency, duration, start_at))
+        wal_bytes = self.wal_bytes_since(lsn_before)
+        wal_after = self.wal_stats()
+
+        latency = LatencyHistogram.merged(LatencyHistogram.from_dict(o['latency']) for o in outcomes)
+        commit_latency = LatencyHistogram.merged(LatencyHistogram.from_dict(o['commit_latency']) for o in outcomes)
+        transactions = sum(o['transactions'] for o in outcomes)
+        write_transactions = sum(o['write_transactions'] for o in outcomes)
+        # Son islem deadline'i asabilir ya da worker erken durabilir; oranlar olculen sureden hesaplanir
+        elapsed = max((o['elapsed'] for o in outcomes), default=0.0) or duration
+
+        result = {
+            'server': self.server_name,
+            'test_type': 'Yazma_Testi',
+            'workload': workload,
+            'concurrency_model': model,
+            'concurrency': concurrency,
+            'duration': duration,
+            'elapsed': elapsed,
+            'batch_size': self.batch_size if workload == 'batch_insert' else 1,
+            'read_ratio': self.read_ratio if workload == 'mixed' else 0.0,
+            'transactions': transactions,
+            'write_transactions': write_transactions,
+            'rows_written': sum(o['rows_written'] for o in outcomes),
+            'errors': sum(o['errors'] for o in outcomes),
+            'reconnects': sum(o['reconnects'] for o in outcomes),
+            'tps': transactions / elapsed,
+            'write_tps': write_transactions / elapsed,
+            'latency': latency.summary(),
+            'latency_histogram': latency.to_dict(),
+            'commit_latency': commit_latency.summary(),
+            'commit_latency_histogram': commit_latency.to_dict(),
+            'wal_bytes': wal_bytes,
+            'wal_bytes_per_transaction': wal_bytes / write_transactions if write_transactions else 0.0,
+            'wal_stats': {name: wal_after[name] - wal_before[name] for name in wal_after if name in wal_before},
+            'timestamp': datetime.now().isoformat()
+        }
+        self.results.append(result)
+        return result
+
+    def run(self, workloads, models, concurrency_levels, duration=10.0):
+        print(f"\n=== {self.server_name} Yazma Testleri ===")
+        print(f"Is yukleri: {', '.join(workloads)} | Modeller: {', '.join(models)} | Seviye basina {duration:.0f}s")
+        print("Is yuku        | Model     | Eszaman. | TPS        | Commit p50 | Commit p99 | WAL/islem  | WAL buf dolu | Hata")
+        print("-" * 112)
+        for workload in workloads:
+            for model in models:
+                for concurrency in concurrency_levels:
+                    try:
+                        result = self.run_level(workload, model, concurrency, duration)
+                    except Exception as e:
+                        print(f"HATA - {self.server_name} - {workload}/{model}/{concurrency}: {e}")
+                        continue
+                    commit = result['commit_latency']
+                    buffers_full = result['wal_stats'].get('wal_buffers_full', '-')
+                    print(f"{workload:<14} | {model:<9} | {concurrency:>8} | {result['tps']:>10.1f} | "
+                          f"{commit['p50'] * 1000:>8.2f}ms | {commit['p99'] * 1000:>8.2f}ms | "
+                          f"{result['wal_bytes_per_transaction']:>8.0f} B | {buffers_full:>12} | {result['errors']:>4}")
+        return self.results
+
+    def cleanup(self, keep_rows=False):
+        if self.initial_max_id is None:
+            return
+        try:
+            if not keep_rows:
+                deleted = self.admin_query(f"WITH d AS (DELETE FROM {TABLE_NAME} WHERE id > {self.initial_max_id} RETURNING 1) "
+                                           f"SELECT count(*) FROM d")[0][0]
+                print(f"{self.server_name} - test sirasinda eklenen {deleted:,} satir silindi")
+            # UPDATE'lerin ve silmelerin biraktigi olu tuple'lar sonraki okuma testlerini etkilemesin
+            conn = psycopg2.connect(**self.connection_params)
+            conn.autocommit = True
+            cur = conn.cursor()
+            cur.execute(f"VACUUM (ANALYZE) {TABLE_NAME}")
+            cur.close()
+            conn.close()
+            print(f"{self.server_name} - {TABLE_NAME} VACUUM (ANALYZE) tamamlandi")
+        except Exception as e:
+            print(f"HATA - {self.server_name} - temizlik: {e}")
+
+    def save_results(self, store=None, workload=None):
+        filename = results_filename('write_results', self.server_name)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.results, f, indent=2, ensure_ascii=False)
+        print(f"Yazma testi sonuclari kaydedildi: {filename}")
+        if store is not None:
+            store.record_run('write', self.server_name, self.results, self.connection_params, workload=workload)
+        return filename
+
+def compare_write_results(results_a, results_b, name_a='Server A', name_b='Server B'):
+    print(f"\n{'Is yuku / model / eszaman.':<36} | {name_a + ' TPS':>14} | {name_b + ' TPS':>14} | Oran   | "
+          f"{'p99 commit (ms)':>17} | WAL buf dolu")
+    print("-" * 112)
+    for result_a in results_a:
+        result_b = next((r for r in results_b if (r['workload'], r['concurrency_model'], r['concurrency']) ==
+                         (result_a['workload'], result_a['concurrency_model'], result_a['concurrency'])), None)
+        if result_b is None:
+            continue
+        key = f"{result_a['workload']} / {result_a['concurrency_model']} / {result_a['concurrency']}"
+        ratio = result_a['tps'] / result_b['tps'] if result_b['tps'] > 0 else 0
+        commits = f"{result_a['commit_latency']['p99'] * 1000:.2f} / {result_b['commit_latency']['p99'] * 1000:.2f}"
+        buffers = f"{result_a['wal_stats'].get('wal_buffers_full', '-')} / {result_b['wal_stats'].get('wal_buffers_full', '-')}"
+        print(f"{key:<36} | {result_a['tps']:>14.1f} | {result_b['tps']:>14.1f} | {ratio:>5.2f}x | {commits:>17} | {buffers}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="PostgreSQL yazma yolu testleri (INSERT/UPDATE/DELETE, WAL baskisi)")
+    parser.add_argument('--catalog', default=None, help="Is yuku katalog dosyasi (JSON/TOML/YAML)")
+    parser.add_argument('--server', action='append', default=None, help="Yalnizca bu sunucu(lar)da calistir")
+    parser.add_argument('--workloads', nargs='+', choices=WRITE_WORKLOADS, default=list(WRITE_WORKLOADS))
+    parser.add_argument('--models', nargs='+', choices=CONCURRENCY_MODELS, default=list(CONCURRENCY_MODELS))
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--duration', type=float, default=10.0, help="Seviye basina sure (saniye)")
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--hot-rows', type=int, default=10, help="hot_update icin guncellenen satir sayisi")
+    parser.add_argument('--read-ratio', type=float, default=0.8, help="mixed is yukunde okuma orani")
+    parser.add_argument('--keep-rows', action='store_true', help="Test sirasinda eklenen satirlari silme")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help="Kosularin eklendigi SQLite sonuc gecmisi")
+    parser.add_argument('--no-store', action='store_true', help="Sonuclari gecmise ekleme")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    catalog = WorkloadCatalog.load(args.catalog)
+    servers = [catalog.server(name) for name in args.server] if args.server else catalog.servers
+
+    print("PostgreSQL Yazma Yolu Testleri")
+    print("=" * 50)
+
+    benchmarks = []
+    with optional_store(args.store, not args.no_store) as store:
+        for server in servers:
+            benchmark = WriteBenchmark(
+                server_name=server['name'],
+                batch_size=args.batch_size,
+                hot_rows=args.hot_rows,
+                read_ratio=args.read_ratio,
+                seed=args.seed,
+                **server_connection_kwargs(server)
+            )
+            try:
+                benchmark.run(args.workloads, args.models, args.levels, args.duration)
+            finally:
+                benchmark.cleanup(keep_rows=args.keep_rows)
+            benchmark.save_results(store, workload=catalog.name)
+            benchmarks.append(benchmark)
+
+    if len(benchmarks) >= 2:
+        # Katalogdaki ilk sunucu referans (B), ikincisi aday (A)
+        benchmark_b, benchmark_a = benchmarks[0], benchmarks[1]
+        compare_write_results(benchmark_a.results, benchmark_b.results, benchmark_a.server_name, benchmark_b.server_name)
+
+if __name__ == "__main__":
+    main()